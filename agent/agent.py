@@ -9,44 +9,67 @@ Usage:
     python agent.py
     python agent.py --headless
     python agent.py --once          (run one job and exit, don't poll)
+    python agent.py --jobs 4        (run up to 4 jobs concurrently)
+    python agent.py --workers 4     (supervise 4 worker processes)
 """
 
 import argparse
 import asyncio
+import gzip
+import json
 import logging
+import multiprocessing
 import os
 import sys
 import time
 import traceback
 
+import metrics  # stdlib only; LeadGenAPI calls are timed with its decorator
+
+_PROCESS_STARTED = time.perf_counter()  # for the startup timing report
+
 # Fix Windows console encoding for emoji/unicode output
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
-# Imports moved inside main/run_agent to handle errors gracefully
+# Imports moved inside load_modules to handle errors gracefully
+# (bound as module globals there)
 # import requests
 # from playwright._impl._errors import TargetClosedError
 # import agent_config as config
 # from scraper import GoogleMapsScraper
-# from validator import process_leads
+# from validator import LeadValidator
+# from pipeline import LeadPipeline, JobStopped
+# from scheduler import JobScheduler
+# from uploader import BatchSizer, LeadUploader, UploadSpool
+# from dedup_index import DedupIndex
+# from checkpoint import JobCheckpoint
+# import agent_logging
 
-# ─── Logging Setup ───────────────────────────────────────────────────────────
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler(config.ERROR_LOG, encoding="utf-8"),
-        logging.StreamHandler(sys.stdout),
-    ],
-)
 logger = logging.getLogger(__name__)
 
 
+# ─── Logging Setup ───────────────────────────────────────────────────────────
+
+def _setup_logging(args) -> str:
+    """
+    Log to error_log.txt and stdout through a background writer, as emoji
+    console output or JSON lines (see agent_logging). Returns the mode.
+    """
+    import agent_logging
+    return agent_logging.setup(getattr(args, "log_format", None))
+
+
 # ─── API Client ──────────────────────────────────────────────────────────────
 
 class LeadGenAPI:
-    """Client for the LeadGen SaaS API."""
+    """
+    Client for the LeadGen SaaS API.
+
+    All calls go through one requests.Session, so the TCP/TLS connection
+    to the backend is kept alive and reused between calls.
+    """
 
     def __init__(self, base_url: str, api_key: str):
         self.base_url = base_url.rstrip("/")
@@ -54,43 +77,101 @@ class LeadGenAPI:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=config.API_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
+        self.gzip_uploads = config.API_GZIP_UPLOADS
+        self._gzip_confirmed = False  # a gzipped upload has been accepted by the server
+
+    @metrics.timed("api.verify")
     def verify(self) -> dict:
         """Verify API key and return user info."""
-        resp = requests.get(f"{self.base_url}/api/agent/verify", headers=self.headers, timeout=15)
+        resp = self.session.get(f"{self.base_url}/api/agent/verify", timeout=15)
         resp.raise_for_status()
         return resp.json()
 
+    @metrics.timed("api.get_jobs")
     def get_jobs(self) -> list[dict]:
         """Get pending/running jobs."""
-        resp = requests.get(f"{self.base_url}/api/agent/jobs", headers=self.headers, timeout=15)
+        resp = self.session.get(f"{self.base_url}/api/agent/jobs", timeout=15)
         resp.raise_for_status()
         data = resp.json()
         return data.get("jobs", [])
 
-    def update_job(self, job_id: str, status: str, leads_found: int | None = None) -> dict:
-        """Update job status."""
+    @metrics.timed("api.update_job")
+    def update_job(
+        self, job_id: str, status: str, leads_found: int | None = None, checkpoint: dict | None = None
+    ) -> dict:
+        """Update job status (and optionally store its resume checkpoint)."""
         payload = {"job_id": job_id, "status": status}
         if leads_found is not None:
             payload["leads_found"] = leads_found
-        resp = requests.patch(f"{self.base_url}/api/agent/jobs", headers=self.headers, json=payload, timeout=15)
+        if checkpoint is not None:
+            payload["checkpoint"] = checkpoint
+        resp = self.session.patch(f"{self.base_url}/api/agent/jobs", json=payload, timeout=15)
         resp.raise_for_status()
         return resp.json()
 
+    @metrics.timed("api.upload_leads")
     def upload_leads(self, job_id: str, leads: list[dict]) -> dict:
-        """Upload a batch of leads."""
-        payload = {"job_id": job_id, "leads": leads}
-        resp = requests.post(f"{self.base_url}/api/agent/leads", headers=self.headers, json=payload, timeout=30)
+        """Upload a batch of leads (gzip-compressed when large enough)."""
+        body = json.dumps({"job_id": job_id, "leads": leads}).encode("utf-8")
+        headers = {}
+        if self.gzip_uploads and len(body) >= config.API_GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+
+        resp = self.session.post(f"{self.base_url}/api/agent/leads", data=body, headers=headers, timeout=30)
+
+        if headers and not self._gzip_confirmed:
+            if resp.status_code == 415:
+                # Server that can't read gzip bodies — send plain JSON from now on
+                # (other errors, e.g. a 500 from a failed insert, go through the uploader's retries)
+                logger.warning("Server rejected gzip upload (%s); disabling compression.", resp.status_code)
+                self.gzip_uploads = False
+                return self.upload_leads(job_id, leads)
+            self._gzip_confirmed = resp.ok
+
         if not resp.ok:
             print(f"   ❌ API Error: {resp.status_code} - {resp.text}")
         resp.raise_for_status()
         return resp.json()
 
+    @metrics.timed("api.claim_job")
+    def claim_job(self) -> dict | None:
+        """
+        Atomically claim the oldest pending job (marks it running).
+        Returns None when there is nothing to claim.
+        """
+        resp = self.session.post(f"{self.base_url}/api/agent/jobs/claim", timeout=15)
+        if resp.status_code == 404:
+            # Older server without the claim endpoint — fall back to the racy two-step
+            logger.warning("Server has no /api/agent/jobs/claim endpoint; claiming jobs non-atomically.")
+            pending = [j for j in self.get_jobs() if j["status"] == "pending"]
+            if not pending:
+                return None
+            self.update_job(pending[0]["id"], "running")
+            return pending[0]
+        resp.raise_for_status()
+        return resp.json().get("job")
+
+    @metrics.timed("api.get_job_status")
     def get_job_status(self, job_id: str) -> str | None:
-        """Check if a specific job has been stopped by the user."""
+        """Check if a specific job has been stopped by the user (None if unknown)."""
         try:
-            jobs = self.get_jobs()
-            for job in jobs:
+            resp = self.session.get(f"{self.base_url}/api/agent/jobs", params={"id": job_id}, timeout=15)
+            if resp.status_code == 404:
+                return "stopped"  # job was deleted
+            resp.raise_for_status()
+            data = resp.json()
+            if "job" in data:
+                return data["job"]["status"]
+
+            # Older server ignores ?id= and returns the pending/running list
+            for job in data.get("jobs", []):
                 if job["id"] == job_id:
                     return job["status"]
             # Job not in pending/running list — might be stopped/completed
@@ -99,10 +180,50 @@ class LeadGenAPI:
             return None
 
 
+class AsyncLeadGenAPI:
+    """
+    asyncio front-end for LeadGenAPI.
+
+    Every call runs on a worker thread over the same pooled session, so
+    API round-trips never block the event loop (and the browser) while a
+    job is running.
+    """
+
+    def __init__(self, api: LeadGenAPI):
+        self.sync = api
+
+    async def verify(self) -> dict:
+        return await asyncio.to_thread(self.sync.verify)
+
+    async def get_jobs(self) -> list[dict]:
+        return await asyncio.to_thread(self.sync.get_jobs)
+
+    async def update_job(
+        self, job_id: str, status: str, leads_found: int | None = None, checkpoint: dict | None = None
+    ) -> dict:
+        return await asyncio.to_thread(self.sync.update_job, job_id, status, leads_found, checkpoint)
+
+    async def upload_leads(self, job_id: str, leads: list[dict]) -> dict:
+        return await asyncio.to_thread(self.sync.upload_leads, job_id, leads)
+
+    async def claim_job(self) -> dict | None:
+        return await asyncio.to_thread(self.sync.claim_job)
+
+    async def get_job_status(self, job_id: str) -> str | None:
+        return await asyncio.to_thread(self.sync.get_job_status, job_id)
+
+
 # ─── Agent Runner ────────────────────────────────────────────────────────────
 
-async def execute_job(api, job: dict, scraper) -> None:
-    """Execute a single scraping job."""
+async def execute_job(api, job: dict, scraper, spool=None, sizer=None, dedup=None) -> dict:
+    """
+    Execute a single scraping job (api is an AsyncLeadGenAPI).
+    Leads that can't be uploaded are saved to `spool` (an UploadSpool);
+    `sizer` is the agent's shared BatchSizer and `dedup` its DedupIndex.
+    Progress is checkpointed, so a job requeued after a browser crash
+    resumes where it stopped. Phase timings and counts are tallied per job
+    (see metrics.JobMetrics). Returns a short summary of the outcome.
+    """
     job_id = job["id"]
     city = job["city"]
     category = job["category"]
@@ -115,72 +236,145 @@ async def execute_job(api, job: dict, scraper) -> None:
 
     # Mark job as running
     try:
-        api.update_job(job_id, "running")
+        await api.update_job(job_id, "running")
     except Exception as e:
         logger.error("Failed to update job status to running: %s", e)
 
-    total_uploaded = 0
-    current_batch = []
-    seen_keys = set()  # Track unique leads (name, address) to deduplicate across batches
-    last_status_check = time.time()
+    started_at = time.time()
+    outcome = "failed"
+    # Everything timed or counted from here on (including this job's tasks) is credited to the job
+    job_metrics, metrics_token = metrics.start_job(job_id)
+    metrics.JOBS_RUNNING.track(job_metrics, lambda: 1)
+    validator = LeadValidator(index=dedup, job_id=job_id)  # one dedup index across the whole job
+
+    checkpoint = JobCheckpoint.load(job)
+    keep_checkpoint = True
+    if checkpoint.resumed:
+        print(
+            f"   ⏩ Resuming from checkpoint: {len(checkpoint.processed)} listings done, "
+            f"{checkpoint.uploaded_before} leads already uploaded"
+        )
+
+    def record_delivered():
+        # Leads the uploader uploaded or spooled are done: in the checkpoint, the dedup and the place index
+        checkpoint.record_uploads(uploader.uploaded, uploader.delivered)
+        delivered = validator.record_delivered(uploader.delivered)
+        if scraper.place_index and delivered:
+            scraper.place_index.put_many(delivered)
+
+    def save_checkpoint(force: bool = False):
+        record_delivered()
+        checkpoint.save(force)
+
+    def validate(raw_lead: dict) -> dict | None:
+        rejected = dict(validator.rejected)
+        with metrics.timed("validate"):
+            clean_lead = validator.feed(raw_lead)
+        if clean_lead is not None:
+            metrics.count("leads")
+            agent_logging.lead(
+                f"   ✨ Found: {clean_lead['business_name']}", job_id=job_id, business=clean_lead["business_name"]
+            )
+        else:
+            if validator.rejected["no_name"] > rejected["no_name"]:
+                metrics.count("unnamed")
+            else:
+                scope = "job" if validator.rejected["duplicate"] > rejected["duplicate"] else "index"
+                metrics.count("duplicates", scope=scope)
+            checkpoint.mark_rejected(raw_lead)
+            if scraper.place_index:
+                scraper.place_index.put_many([raw_lead])
+        return clean_lead
+
+    last_progress = 0.0
+
+    async def on_uploaded(batch_len: int, total: int):
+        # Update job status with current count (throttled; the final count is sent on completion)
+        nonlocal last_progress
+        save_checkpoint()
+        if time.monotonic() - last_progress < config.JOB_PROGRESS_INTERVAL:
+            return
+        last_progress = time.monotonic()
+        try:
+            await api.update_job(job_id, "running", leads_found=checkpoint.uploaded)
+        except Exception:
+            pass
+
+    # Uploads run in the background; the pipeline never waits on the network
+    uploader = LeadUploader(api, job_id, spool=spool, on_uploaded=on_uploaded, sizer=sizer).start()
+
+    async def upload(lead: dict):
+        checkpoint.mark_queued(lead)
+        validator.mark_queued(lead)
+        await uploader.add(_format_lead(lead, city, category, platform))
+
+    pipeline = LeadPipeline(
+        scraper.scrape_category_city(category, city, enrich=False, skip=checkpoint.skip()),
+        scraper.enrich_lead,
+        validate,
+        upload,
+    )
+    pipeline_task = asyncio.create_task(pipeline.run())
+    stop_requested = False
+
+    async def watch_for_stop():
+        """Cancel the pipeline as soon as the user stops the job from the dashboard."""
+        nonlocal stop_requested
+        while not pipeline_task.done():
+            await asyncio.sleep(config.STOP_CHECK_INTERVAL)
+            if await api.get_job_status(job_id) == "stopped":
+                stop_requested = True
+                pipeline_task.cancel()
+                return
+
+    watcher = asyncio.create_task(watch_for_stop())
 
     try:
-        # Scrape and process in real-time
-        async for raw_lead in scraper.scrape_category_city(category, city):
-            # Check stop signal periodically (every 5 seconds)
-            if time.time() - last_status_check > 5:
-                current_status = api.get_job_status(job_id)
-                if current_status == "stopped":
-                    print(f"\n   ⏹ Job stopped by user! Aborting...")
-                    return
-                last_status_check = time.time()
-
-            # Validate lead
-            validation_list = process_leads([raw_lead]) 
-            if validation_list:
-                clean_lead = validation_list[0]
-                
-                # Manual deduplication check
-                name = clean_lead.get("business_name", "").lower().strip()
-                address = clean_lead.get("address", "").lower().strip()
-                key = (name, address)
-
-                if key not in seen_keys and name:
-                    seen_keys.add(key)
-                    current_batch.append(clean_lead)
-                    print(f"   ✨ Found: {clean_lead['business_name']}")
-                else:
-                    # Duplicate found
-                    continue
-
-            # Upload if batch is full
-            if len(current_batch) >= config.BATCH_SIZE:
-                await _upload_batch(api, job_id, current_batch, city, category, platform)
-                total_uploaded += len(current_batch)
-                print(f"   📤 Uploaded batch: {len(current_batch)} leads (Total: {total_uploaded})")
-                current_batch = []
-
-                # Update job status with current count
-                try:
-                    api.update_job(job_id, "running", leads_found=total_uploaded)
-                except Exception:
-                    pass
+        # Scrape, enrich, validate and upload concurrently
+        try:
+            await pipeline_task
+        except asyncio.CancelledError:
+            if not stop_requested:
+                raise  # the job itself is being cancelled (agent shutdown)
+            raise JobStopped(job_id)
 
-        # Upload remaining leads
-        if current_batch:
-            await _upload_batch(api, job_id, current_batch, city, category, platform)
-            total_uploaded += len(current_batch)
-            print(f"   📤 Uploaded final batch: {len(current_batch)} leads")
+        await uploader.close()
+        record_delivered()
 
         # Mark job as completed
-        api.update_job(job_id, "completed", leads_found=total_uploaded)
-        print(f"\n   ✅ Job completed! {total_uploaded} leads uploaded.")
+        await api.update_job(job_id, "completed", leads_found=checkpoint.uploaded)
+        outcome = "completed"
+        checkpoint.delete()
+        keep_checkpoint = False
+        print(f"\n   ✅ Job completed! {checkpoint.uploaded} leads uploaded.")
+
+    except JobStopped:
+        outcome = "stopped"
+        await uploader.close()  # keep what was already scraped
+        record_delivered()
+        checkpoint.delete()
+        keep_checkpoint = False
+        print(f"\n   ⏹ Job stopped by user! Aborting...")
 
     except TargetClosedError as e:
         logger.error("Browser crashed during job %s: %s", job_id, str(e))
         print(f"   ❌ Browser crashed: {e}")
+        await uploader.close()
+        checkpoint.attempts += 1
+        save_checkpoint(force=True)
+        if checkpoint.attempts < config.JOB_MAX_ATTEMPTS:
+            # Put the job back in the queue; the next agent to claim it resumes from the checkpoint
+            status = "pending"
+            print(f"   🔁 Job requeued — will resume after {checkpoint.state()['cursor']} listings")
+        else:
+            status = "failed"
+            checkpoint.delete()
+            keep_checkpoint = False
         try:
-            api.update_job(job_id, "failed", leads_found=total_uploaded)
+            await api.update_job(
+                job_id, status, leads_found=checkpoint.uploaded,
+                checkpoint=checkpoint.state() if config.CHECKPOINT_SYNC and keep_checkpoint else None,
+            )
         except Exception:
             pass
         raise  # Let the main loop handle restart
@@ -189,57 +383,137 @@ async def execute_job(api, job: dict, scraper) -> None:
         logger.error("Job %s failed: %s", job_id, str(e))
         logger.error(traceback.format_exc())
         print(f"   ❌ Job failed: {e}")
+        await uploader.close()
+        record_delivered()
+        checkpoint.delete()
+        keep_checkpoint = False
         try:
-            api.update_job(job_id, "failed", leads_found=total_uploaded)
+            await api.update_job(job_id, "failed", leads_found=checkpoint.uploaded)
         except Exception:
             pass
 
+    finally:
+        watcher.cancel()
+        if not pipeline_task.done():
+            pipeline_task.cancel()
+        uploader.abort()  # no-op after close(); spools leftovers on agent shutdown
+        record_delivered()
+        if keep_checkpoint:
+            checkpoint.save(force=True)
+        logger.info("Job %s pipeline: %s", job_id, pipeline.summary())
+        logger.info("Job %s uploads: %s", job_id, uploader.summary())
+        logger.info("Job %s validation: %s", job_id, validator.stats())
+        if scraper.resource_filter:
+            logger.info("Resource filter: %s", scraper.resource_filter.summary())
+        if scraper.place_index:
+            logger.info("Place index: %s", scraper.place_index.stats())
+        cache_stats = scraper.enricher.stats()
+        if cache_stats:
+            logger.info(
+                "Email cache: %d hits, %d misses (hit rate %.0f%%)",
+                cache_stats["hits"], cache_stats["misses"], cache_stats["hit_rate"] * 100,
+            )
+        crawl = scraper.enricher.crawl_stats()
+        if crawl["sites"]:
+            logger.info(
+                "Website crawls: %d sites, %.1f pages and %d KB per site (found %d, exhausted %d, "
+                "budget %d, unreachable %d, unresolvable %d, timeout %d, skipped dead %d); DNS cache %s",
+                crawl["sites"], crawl["pages_per_site"], crawl["bytes_per_site"] // 1024,
+                crawl["found"], crawl["exhausted"], crawl["budget"], crawl["unreachable"],
+                crawl["unresolvable"], crawl["timeout"], crawl["dead"], scraper.enricher.dns.stats(),
+            )
+        metrics.JOBS_RUNNING.untrack(job_metrics)
+        metrics.end_job(metrics_token)
+        # Phases overlap (the pipeline stages run concurrently), so they add up to more than the job took
+        print(f"   ⏱️  Time by phase: {job_metrics.summary()}")
+        logger.info("Job %s metrics: %s", job_id, job_metrics.summary())
+
+    return {
+        "job_id": job_id,
+        "status": outcome,
+        "leads_uploaded": uploader.uploaded,
+        "seconds": round(time.time() - started_at, 1),
+        "scroll_seconds": round(scraper.timings.get("scroll", 0.0), 1),
+        "phase_seconds": job_metrics.phase_seconds(),
+    }
+
+
+def _format_lead(lead: dict, city: str, category: str, platform: str) -> dict:
+    """Shape a validated lead for the /api/agent/leads endpoint."""
+    return {
+        "business_name": lead.get("business_name", ""),
+        "phone": lead.get("phone", ""),
+        "email": lead.get("email", ""),
+        "address": lead.get("address", ""),
+        "city": lead.get("city", city),
+        "rating": lead.get("rating", ""),
+        "reviews": lead.get("reviews", ""),
+        "website": lead.get("website", ""),
+        "category": lead.get("category", category),
+        "platform": platform,
+    }
+
+
+def load_modules():
+    """
+    Import the heavy modules (Playwright, scraper, ...). Deferred so that
+    initialization errors can be reported nicely; they are bound as module
+    globals because LeadGenAPI and execute_job use them too.
+    """
+    global requests, TargetClosedError, config, GoogleMapsScraper, LeadValidator
+    global LeadPipeline, JobStopped, JobScheduler, LeadUploader, UploadSpool, BatchSizer, DedupIndex
+    global JobCheckpoint, agent_logging
+    import requests
+    from playwright._impl._errors import TargetClosedError
+    import agent_config as config
+    from scraper import GoogleMapsScraper
+    from validator import LeadValidator
+    from pipeline import LeadPipeline, JobStopped
+    from scheduler import JobScheduler
+    from uploader import BatchSizer, LeadUploader, UploadSpool
+    from dedup_index import DedupIndex
+    from checkpoint import JobCheckpoint
+    import agent_logging
+
+
+async def run_agent(args, on_job_done=None):
+    """
+    Main agent loop.
+
+    on_job_done: optional fn(summary) called after every job (used by the
+    supervisor to aggregate stats across worker processes).
+    """
+    # First, so that in json mode even the banner comes out as log records
+    _setup_logging(args)
 
-async def _upload_batch(api, job_id: str, batch: list[dict], city: str, category: str, platform: str):
-    """Helper to format and upload a batch of leads."""
-    api_leads = []
-    for lead in batch:
-        api_leads.append({
-            "business_name": lead.get("business_name", ""),
-            "phone": lead.get("phone", ""),
-            "email": lead.get("email", ""),
-            "address": lead.get("address", ""),
-            "city": lead.get("city", city),
-            "rating": lead.get("rating", ""),
-            "reviews": lead.get("reviews", ""),
-            "website": lead.get("website", ""),
-            "category": lead.get("category", category),
-            "platform": platform,
-        })
-
-    try:
-        api.upload_leads(job_id, api_leads)
-    except Exception as e:
-        logger.error("Failed to upload batch: %s", e)
-        print(f"   ❌ Failed to upload batch: {e}")
-
-
-
-async def run_agent(args):
-    """Main agent loop."""
     print("\n" + "=" * 60)
     print("⚡ LEADGEN SAAS AGENT (v2.0)")
     print("=" * 60)
     print("   Initializing core modules...")
+    imports_started = time.perf_counter()
 
-    # Lazy imports to catch initialization errors
     try:
-        import requests
-        from playwright._impl._errors import TargetClosedError
-        import agent_config as config
-        from scraper import GoogleMapsScraper
-        from validator import process_leads
-        print("   ✅ Modules loaded successfully.")
+        load_modules()
+        import_seconds = time.perf_counter() - imports_started
+        print(f"   ✅ Modules loaded successfully ({import_seconds:.1f}s).")
     except Exception as e:
         print(f"\n❌ Error loading modules: {e}")
         print("   This might be due to missing dependencies in the executable.")
         raise e
 
+    if getattr(args, "fast", False):
+        config.FAST_MODE = True
+
+    metrics_server = None
+    metrics_port = getattr(args, "metrics_port", None)
+    metrics_port = config.METRICS_PORT if metrics_port is None else metrics_port
+    if metrics_port:
+        try:
+            metrics_server = metrics.MetricsServer(metrics_port).start()
+            print(f"   📈 Metrics at {metrics_server.url}")
+        except OSError as e:
+            logger.warning("Could not serve metrics on port %d: %s", metrics_port, e)
+
     # Validate config
     # Validate config & Interactive Setup
     if not config.API_KEY:
@@ -280,45 +554,96 @@ async def run_agent(args):
             print(f"   ❌ Failed to save .env file: {e}")
             sys.exit(1)
 
-    # Initialize API client
+    # Initialize API client (pooled session; async front-end for use inside jobs)
     api = LeadGenAPI(config.API_BASE_URL, config.API_KEY)
+    async_api = AsyncLeadGenAPI(api)
 
-    # Verify connection
-    print(f"\n🔌 Connecting to {config.API_BASE_URL}...")
-    try:
-        result = api.verify()
-        user = result.get("user", {})
-        print(f"   ✅ Connected! Welcome, {user.get('name', 'Agent')}!")
-        print(f"   📋 Plan: {user.get('plan', 'free')} | Leads: {user.get('leads_count', 0)}")
-    except requests.exceptions.ConnectionError:
-        print(f"   ❌ Cannot connect to {config.API_BASE_URL}")
-        print("   Make sure the web app is running (npm run dev)")
-        sys.exit(1)
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            print("   ❌ Invalid API key! Check your .env file.")
-        else:
-            print(f"   ❌ API error: {e}")
-        sys.exit(1)
+    spool = UploadSpool()
+    sizer = BatchSizer()
+    dedup = None
+    if config.DEDUP_INDEX_PATH:
+        try:
+            dedup = DedupIndex()
+        except Exception as e:
+            logger.warning("Dedup index unavailable, continuing without it: %s", e)
 
-    # Launch browser
+    # Launch browsers — one per concurrent job slot. They start up in the
+    # background while the connection is verified and the spool replayed.
     headless = args.headless
-    print(f"\n🌐 Launching browser (headless={headless})...")
-    scraper = GoogleMapsScraper(headless=headless)
-    await scraper.start()
+    max_jobs = 1 if args.once else (args.jobs or config.MAX_CONCURRENT_JOBS)
+    print(f"\n🌐 Launching browser (headless={headless}, job slots={max_jobs})...")
+
+    async def is_stopped(job_id: str) -> bool:
+        return await async_api.get_job_status(job_id) == "stopped"
+
+    scheduler = JobScheduler(
+        lambda job, scraper: execute_job(async_api, job, scraper, spool, sizer, dedup),
+        max_jobs=max_jobs,
+        headless=headless,
+        is_stopped=is_stopped,
+        on_done=on_job_done,
+    )
+    launch_started = time.perf_counter()
+    launching = asyncio.create_task(scheduler.start())
+
+    try:
+        # Verify connection
+        print(f"\n🔌 Connecting to {config.API_BASE_URL}...")
+        try:
+            result = await asyncio.to_thread(api.verify)
+            user = result.get("user", {})
+            print(f"   ✅ Connected! Welcome, {user.get('name', 'Agent')}!")
+            print(f"   📋 Plan: {user.get('plan', 'free')} | Leads: {user.get('leads_count', 0)}")
+        except requests.exceptions.ConnectionError:
+            print(f"   ❌ Cannot connect to {config.API_BASE_URL}")
+            print("   Make sure the web app is running (npm run dev)")
+            sys.exit(1)
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 401:
+                print("   ❌ Invalid API key! Check your .env file.")
+            else:
+                print(f"   ❌ API error: {e}")
+            sys.exit(1)
+
+        # Replay leads that a previous run could not upload
+        if spool.pending():
+            print(f"\n📦 Replaying {spool.pending()} spooled upload batches...")
+            uploaded, remaining = await spool.replay(async_api)
+            print(f"   ✅ {uploaded} leads uploaded" + (f", {remaining} still spooled" if remaining else ""))
+
+        await launching
+    except BaseException:
+        launching.cancel()
+        await asyncio.gather(launching, return_exceptions=True)
+        await scheduler.stop()
+        if dedup:
+            dedup.close()
+        if metrics_server:
+            metrics_server.stop()
+        raise
+
+    page_ready = launch_started + scheduler.start_seconds - _PROCESS_STARTED
+    print(
+        f"   ⏱️  Startup: imports {import_seconds:.1f}s, browser launch {scheduler.start_seconds:.1f}s, "
+        f"first page ready {page_ready:.1f}s after start"
+    )
+    logger.info(
+        "Startup timing: imports %.2fs, browser launch %.2fs, first page ready %.2fs",
+        import_seconds, scheduler.start_seconds, page_ready,
+    )
 
     try:
         if args.once:
             # Single run mode — process one job and exit
             print("\n🔍 Looking for pending jobs...")
-            jobs = api.get_jobs()
-            pending = [j for j in jobs if j["status"] == "pending"]
+            job = await async_api.claim_job()
 
-            if not pending:
+            if not job:
                 print("   ℹ️  No pending jobs found. Create a job from the dashboard first.")
                 return
 
-            await execute_job(api, pending[0], scraper)
+            scheduler.submit([job])
+            await scheduler.drain()
         else:
             # Polling mode — continuously check for jobs
             print(f"\n🔄 Polling for jobs every {config.POLL_INTERVAL}s... (Ctrl+C to stop)")
@@ -326,28 +651,23 @@ async def run_agent(args):
 
             while True:
                 try:
-                    jobs = api.get_jobs()
-                    pending = [j for j in jobs if j["status"] == "pending"]
-
-                    if pending:
+                    if not scheduler.alive:
+                        logger.error("Failed to restart browser, exiting.")
+                        print("   ❌ Could not restart browser. Exiting.")
+                        return
+
+                    # Claim only as many jobs as there are free slots, so other
+                    # agents (or supervisor workers) can pick up the rest
+                    claimed = []
+                    while scheduler.free_slots > len(claimed):
+                        job = await async_api.claim_job()
+                        if not job:
+                            break
+                        claimed.append(job)
+
+                    if claimed or scheduler.busy:
                         consecutive_empty = 0
-                        for job in pending:
-                            # Re-check job status before starting (might have been stopped)
-                            current_status = api.get_job_status(job["id"])
-                            if current_status == "stopped":
-                                print(f"   ⏩ Skipping stopped job: {job['category']} in {job['city']}")
-                                continue
-
-                            try:
-                                await execute_job(api, job, scraper)
-                            except TargetClosedError:
-                                # Browser crashed — restart and continue to next job
-                                try:
-                                    await scraper.restart()
-                                except Exception:
-                                    logger.error("Failed to restart browser, exiting.")
-                                    print("   ❌ Could not restart browser. Exiting.")
-                                    return
+                        scheduler.submit(claimed)
                     else:
                         consecutive_empty += 1
                         if consecutive_empty == 1 or consecutive_empty % 6 == 0:
@@ -366,7 +686,11 @@ async def run_agent(args):
         print("\n\n⚠️  Agent stopped by user.")
 
     finally:
-        await scraper.stop()
+        await scheduler.stop()
+        if dedup:
+            dedup.close()
+        if metrics_server:
+            metrics_server.stop()
         print("👋 Agent shut down. Goodbye!")
 
 
@@ -379,6 +703,8 @@ Examples:
   python agent.py                Run agent in polling mode (checks for jobs continuously)
   python agent.py --headless     Run with invisible browser
   python agent.py --once         Process one pending job and exit
+  python agent.py --jobs 4       Run up to 4 jobs at the same time
+  python agent.py --workers 4    Run 4 worker processes under a supervisor
         """,
     )
 
@@ -394,12 +720,56 @@ Examples:
         default=False,
         help="Process one pending job and exit (don't poll continuously)",
     )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        default=False,
+        help="Fast mode: read results from the list and open a listing only if phone/website/address is missing",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Run up to K jobs concurrently, each in its own browser (default: MAX_CONCURRENT_JOBS)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Supervisor mode: run N agent worker processes (default: AGENT_WORKERS)",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=["auto", "console", "json"],
+        default=None,
+        help="console: emoji progress output; json: JSON log lines for headless runs "
+        "(default: LOG_FORMAT, auto = console in a terminal)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics (default: METRICS_PORT; 0 = off)",
+    )
 
     args = parser.parse_args()
-    asyncio.run(run_agent(args))
+
+    if args.workers is None and not args.once:
+        import agent_config
+        args.workers = agent_config.AGENT_WORKERS
+
+    if args.workers and not args.once:
+        from supervisor import run_supervisor
+        run_supervisor(args)
+    else:
+        asyncio.run(run_agent(args))
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # supervisor workers in the frozen .exe
     try:
         main()
     except Exception as e:
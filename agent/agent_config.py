@@ -5,6 +5,7 @@ Scraping and API settings for the SaaS-connected agent.
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load .env file
@@ -14,26 +15,122 @@ load_dotenv()
 API_BASE_URL = os.getenv("LEADGEN_API_URL", "http://localhost:3000")
 API_KEY = os.getenv("LEADGEN_API_KEY", "")
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "10"))  # seconds between job polls
+STOP_CHECK_INTERVAL = 5       # seconds between stop-signal checks for a running job
+API_POOL_SIZE = 4             # keep-alive connections kept open to the API
+API_GZIP_UPLOADS = True       # gzip lead upload bodies (plain JSON from then on if the server answers 415)
+API_GZIP_MIN_BYTES = 1024     # smaller bodies are sent uncompressed
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "1"))  # jobs run at once, one browser each
+AGENT_WORKERS = int(os.getenv("AGENT_WORKERS", "0"))  # >0: supervise this many worker processes
 
 # ─── Paths ───────────────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ERROR_LOG = os.path.join(BASE_DIR, "error_log.txt")
+# Persistent agent state (caches, indexes) — next to the .exe when frozen
+DATA_DIR = os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else BASE_DIR
 
 # ─── Scraping Settings ──────────────────────────────────────────────────────
-SCROLL_PAUSE_MIN = 2.0       # seconds
-SCROLL_PAUSE_MAX = 5.0       # seconds
-MAX_SCROLL_RETRIES = 5       # stop scrolling after this many retries with no new results
+SCROLL_WAIT_TIMEOUT = 3.0    # seconds to wait for new results after each scroll
+SCROLL_JITTER_MIN = 0.2      # random pause between scrolls (seconds)
+SCROLL_JITTER_MAX = 0.8
+MAX_SCROLL_RETRIES = 2       # stop scrolling after this many waits with no new results
 ACTION_DELAY_MIN = 1.5       # seconds between clicks
 ACTION_DELAY_MAX = 3.5
+TAB_POOL_SIZE = 1            # >1: open place URLs in this many tabs in parallel instead of clicking
+FAST_MODE = False            # harvest result cards in one pass instead of opening every listing
+FAST_MODE_REQUIRED_FIELDS = ["phone", "website", "address"]  # fast mode opens a listing only if one is missing
 HEADLESS = False              # default; can be overridden via CLI --headless
+MAPS_BASE_URL = os.getenv("MAPS_BASE_URL", "https://www.google.com/maps")  # benchmarks point this at a fixture
+HUMAN_DELAY_SCALE = 1.0      # multiplies every random human-like pause (benchmarks use 0)
+
+# ─── Browser Pool ───────────────────────────────────────────────────────────
+BROWSER_STANDBY = 1          # pre-launched spare browsers swapped in when a job's browser crashes (0: none)
+
+# ─── Browser Resource Filtering ─────────────────────────────────────────────
+RESOURCE_FILTER_PRESET = "lean"   # "off", "lean" (no images/fonts/tiles/analytics) or "minimal"
+RESOURCE_FILTER_BLOCK_URLS = []   # extra URL regexes to block
+RESOURCE_FILTER_ALLOW_URLS = []   # URL regexes that are never blocked
 
 # ─── Email Extraction ───────────────────────────────────────────────────────
 REQUEST_TIMEOUT = 10          # seconds for HTTP requests to business websites
-EMAIL_PAGES = ["/", "/contact", "/contact-us", "/about", "/about-us"]
+EMAIL_PAGES = ["/", "/contact", "/contact-us", "/about", "/about-us"]  # guessed when a site has no contact links
+ENRICH_MAX_PAGES = 4          # pages fetched per website at most
+ENRICH_MAX_PAGE_BYTES = 256 * 1024      # bytes read per page; the rest is never downloaded
+ENRICH_SITE_BYTE_BUDGET = 768 * 1024    # bytes read per website across its pages
+ENRICH_SITE_TIME_BUDGET = 20.0          # seconds per website; the lookup is cut off after this
+ENRICH_CONNECT_TIMEOUT = 4              # seconds to connect to a website (REQUEST_TIMEOUT: to read)
+ENRICH_PER_IP_LIMIT = 6                 # max concurrent fetches against one server IP (shared hosting)
+ENRICH_DEAD_SITE_TTL = 1800             # seconds a website that timed out or failed is skipped entirely
+ENRICH_MAX_INFLIGHT = 16      # global cap on website fetches in flight at once
+ENRICH_PER_HOST_LIMIT = 3     # max concurrent fetches against one website host
+ENRICH_MAX_PENDING = 8        # listings awaiting email lookup before extraction waits
+
+# ─── DNS Cache ──────────────────────────────────────────────────────────────
+DNS_CACHE_TTL = 600           # seconds a resolved website host is trusted
+DNS_NEGATIVE_TTL = 600        # seconds a host that didn't resolve is treated as dead
+DNS_TIMEOUT = 3.0             # seconds before a lookup counts as failed
+DNS_CACHE_MAX_ENTRIES = 20000
+
+# ─── Email Cache ────────────────────────────────────────────────────────────
+EMAIL_CACHE_PATH = os.path.join(DATA_DIR, "email_cache.sqlite")  # "" disables the cache
+EMAIL_CACHE_TTL_DAYS = 30             # how long a found email is trusted
+EMAIL_CACHE_NEGATIVE_TTL_DAYS = 7     # how long "no email on this site" is trusted
+EMAIL_CACHE_MAX_ENTRIES = 50000       # least recently used domains are evicted beyond this
+
+# ─── Place Index ────────────────────────────────────────────────────────────
+PLACE_INDEX_PATH = os.path.join(DATA_DIR, "place_index.sqlite")  # "" disables skipping known listings
+PLACE_INDEX_MAX_AGE_DAYS = 14     # listings extracted more recently than this are not opened again
+PLACE_INDEX_EMIT_CACHED = False   # yield known listings from the index instead of skipping them (the
+                                  # dedup index rejects them anyway once uploaded; useful without it)
+
+# ─── Dedup Index ────────────────────────────────────────────────────────────
+DEDUP_INDEX_PATH = os.path.join(DATA_DIR, "dedup_index.sqlite")  # "" disables cross-job dedup
+DEDUP_MAX_AGE_DAYS = 30           # leads uploaded longer ago than this may be uploaded again
+DEDUP_SIMILARITY = 0.8            # MinHash similarity of name+address that counts as the same business
+DEDUP_MINHASH_PERMUTATIONS = 64
+DEDUP_LSH_BANDS = 8               # 8 bands x 8 rows: candidates are mostly >0.75 similar
+DEDUP_MAX_CANDIDATES = 32         # near-duplicate candidates verified per lookup
 
 # ─── High Value Thresholds ──────────────────────────────────────────────────
 HIGH_VALUE_MIN_RATING = 4.0
 HIGH_VALUE_MIN_REVIEWS = 50
 
 # ─── Lead Upload Settings ───────────────────────────────────────────────────
-BATCH_SIZE = 10  # upload leads in batches of this size
+BATCH_SIZE = 10  # initial upload batch size (adapted between the limits below)
+UPLOAD_BATCH_MIN = 5
+UPLOAD_BATCH_MAX = 200
+UPLOAD_MAX_BATCH_BYTES = 256 * 1024  # uncompressed JSON bytes per upload
+UPLOAD_FAST_SECONDS = 1.0       # uploads faster than this grow the batch size
+UPLOAD_SLOW_SECONDS = 4.0       # uploads slower than this (or 413/5xx) shrink it
+UPLOAD_MAX_WAIT = 5.0           # seconds a partial batch waits for more leads before it is sent
+UPLOAD_RETRIES = 4              # retries for a failed upload (network errors, 408/429, 5xx)
+UPLOAD_RETRY_DELAY = 2.0        # seconds before the first retry (doubles per retry)
+UPLOAD_MAX_RETRY_DELAY = 30.0
+UPLOAD_SPOOL_PATH = os.path.join(DATA_DIR, "upload_spool.jsonl")  # failed batches, replayed on start
+UPLOAD_SPOOL_STALE_SECONDS = 3600  # a half-finished replay older than this is picked up again
+JOB_PROGRESS_INTERVAL = 10.0    # min seconds between leads_found progress updates of a job
+
+# ─── Job Checkpoints ────────────────────────────────────────────────────────
+CHECKPOINT_DIR = os.path.join(DATA_DIR, "checkpoints")  # "" disables resuming interrupted jobs
+CHECKPOINT_INTERVAL = 15.0      # min seconds between checkpoint saves while a job runs
+CHECKPOINT_SYNC = True          # also store the checkpoint on the server, so any agent can resume
+JOB_MAX_ATTEMPTS = 3            # browser crashes before a job is marked failed instead of requeued
+
+# ─── Logging ────────────────────────────────────────────────────────────────
+LOG_FORMAT = os.getenv("LOG_FORMAT", "auto")  # "console" (emoji prints), "json" (JSON lines) or "auto"
+LOG_MAX_BYTES = 10 * 1024 * 1024  # error_log.txt is rotated at this size...
+LOG_BACKUPS = 3                   # ...keeping this many old files
+LOG_LEAD_SAMPLE_RATE = 0.1        # share of per-lead messages logged in json mode (1: all, 0: none)
+
+# ─── Metrics ────────────────────────────────────────────────────────────────
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # >0: serve Prometheus metrics on 127.0.0.1:<port>/metrics
+
+# ─── Supervisor Settings ────────────────────────────────────────────────────
+SUPERVISOR_RESTART_DELAY = 5        # seconds before restarting a crashed worker (doubles per crash)
+SUPERVISOR_MAX_RESTART_DELAY = 120
+SUPERVISOR_REPORT_INTERVAL = 60     # seconds between aggregated stats reports
+
+# ─── Pipeline Settings ──────────────────────────────────────────────────────
+PIPELINE_QUEUE_SIZE = 20        # max leads buffered between two stages
+PIPELINE_ENRICH_WORKERS = 8     # concurrent website/email lookups per job
+PIPELINE_VALIDATE_WORKERS = 1
+PIPELINE_UPLOAD_WORKERS = 1
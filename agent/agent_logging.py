@@ -0,0 +1,163 @@
+"""
+Agent Logging — console or JSON-lines output, written off the hot path.
+
+Two output modes (LOG_FORMAT, or --log-format):
+
+    console  the familiar emoji progress prints, plus a text error_log.txt
+    json     one JSON object per line on stdout and in error_log.txt; no
+             emoji prints (each print() becomes a log record instead)
+
+"auto" picks console when stdout is a terminal and json otherwise (e.g.
+headless runs under a service manager).
+
+Either way, log calls only put the record on a queue; a QueueListener
+thread formats it and does the file/console I/O, and the log file is
+rotated at LOG_MAX_BYTES. Per-lead messages go through lead() — printed
+as before in console mode, sampled at LOG_LEAD_SAMPLE_RATE in json mode.
+"""
+
+import atexit
+import io
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime
+
+import agent_config as config
+
+_lead_logger = logging.getLogger("agent.leads")
+_listener: logging.handlers.QueueListener | None = None
+_console = True  # emoji prints enabled
+
+# Standard LogRecord attributes; anything else was passed in `extra=` and goes into the JSON
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON line: time, level, logger, message and any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LeadSampler(logging.Filter):
+    """Keeps 1 in every round(1 / rate) records marked as samplable (extra={"sample": True})."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = round(1 / rate) if rate > 0 else 0
+        self._seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sample", False):
+            return True
+        if not self.every:
+            return False
+        self._seen += 1
+        return (self._seen - 1) % self.every == 0
+
+
+class _PrintsToLog(io.TextIOBase):
+    """
+    Stand-in for sys.stdout in json mode: every printed line becomes an
+    INFO record of the "agent.console" logger, so stdout stays parseable.
+    """
+
+    def __init__(self):
+        self._logger = logging.getLogger("agent.console")
+        self._partial = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            line = line.strip(" ═=─")
+            if line:
+                self._logger.info(line)
+        return len(text)
+
+
+def resolve_format(log_format: str | None = None) -> str:
+    """'console' or 'json' for a LOG_FORMAT / --log-format value ("auto" looks at stdout)."""
+    log_format = (log_format or config.LOG_FORMAT).lower()
+    if log_format in ("console", "json"):
+        return log_format
+    return "console" if sys.stdout.isatty() else "json"
+
+
+def setup(log_format: str | None = None) -> str:
+    """
+    Route all logging through a queue to a background writer (a rotating
+    log file plus stdout). Returns the mode in use ("console" or "json").
+    """
+    global _listener, _console
+    mode = resolve_format(log_format)
+    _console = mode == "console"
+
+    if mode == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    file_handler = logging.handlers.RotatingFileHandler(
+        config.ERROR_LOG, maxBytes=config.LOG_MAX_BYTES, backupCount=config.LOG_BACKUPS, encoding="utf-8",
+    )
+    stream_handler = logging.StreamHandler(sys.__stdout__ if mode == "json" else sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(LeadSampler(config.LOG_LEAD_SAMPLE_RATE))
+
+    shutdown()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(logging.INFO)
+
+    _listener = logging.handlers.QueueListener(records, file_handler, stream_handler)
+    _listener.start()
+    atexit.register(shutdown)
+
+    if mode == "json" and not isinstance(sys.stdout, _PrintsToLog):
+        sys.stdout = _PrintsToLog()
+    return mode
+
+
+def shutdown():
+    """Write out queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def lead(text: str, **fields):
+    """
+    Report progress on a single lead: printed as-is in console mode,
+    otherwise a sampled INFO record carrying `fields` (e.g. job_id=...,
+    business=...; names of LogRecord attributes such as "name" can't be used).
+    """
+    if _console:
+        print(text)
+    else:
+        _lead_logger.info(text.strip(), extra={"sample": True, **fields})
@@ -0,0 +1,265 @@
+"""
+End-to-end agent benchmark against offline fixtures (needs Playwright + Chromium).
+
+Starts the Maps fixture (results, place pages, business websites) and the
+mock LeadGen API, runs scripted jobs through agent.execute_job with a real
+browser, and reports listings/s, leads/s, per-listing latency (p50/p95),
+bytes transferred and upload counts. Every run is written as JSON
+(benchmarks/results/ by default) so results can be tracked over time;
+--compare prints the change against an earlier result file.
+
+All agent state (email cache, place and dedup indexes, spool, checkpoints)
+goes to a temporary directory, so each run starts cold and leaves the real
+files alone. Human-like random pauses are off unless --delays is given.
+
+Usage:
+    python benchmarks/bench_agent.py [--job "gyms:Pune"] [--listings 60] [--fast] [--tabs 4]
+    python benchmarks/bench_agent.py --compare benchmarks/results/bench_agent-<earlier>.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import agent_config as config  # noqa: E402
+from maps_fixture import MapsFixtureServer  # noqa: E402
+from mock_api import MockLeadGenServer  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Metrics compared by --compare (and whether higher is better)
+COMPARED = {
+    "listings_per_sec": True,
+    "leads_per_sec": True,
+    "listing_latency_p50_ms": False,
+    "listing_latency_p95_ms": False,
+    "browser_bytes": False,
+    "upload_requests": False,
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def configure(args, state_dir: str, fixture_url: str):
+    """Point the agent at the fixtures and keep its state out of the real data files."""
+    config.MAPS_BASE_URL = fixture_url + "/maps"
+    config.HUMAN_DELAY_SCALE = 1.0 if args.delays else 0.0
+    config.FAST_MODE = args.fast
+    config.TAB_POOL_SIZE = args.tabs
+    config.BROWSER_STANDBY = 0
+    config.EMAIL_CACHE_PATH = os.path.join(state_dir, "email_cache.sqlite")
+    config.PLACE_INDEX_PATH = os.path.join(state_dir, "place_index.sqlite")
+    config.DEDUP_INDEX_PATH = os.path.join(state_dir, "dedup_index.sqlite")
+    config.UPLOAD_SPOOL_PATH = os.path.join(state_dir, "upload_spool.jsonl")
+    config.CHECKPOINT_DIR = os.path.join(state_dir, "checkpoints")
+    # Business websites (http://<slug>.bench.test/) are served by the fixture acting as a proxy
+    os.environ["HTTP_PROXY"] = os.environ["http_proxy"] = fixture_url
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+
+
+def instrument(scraper, listings: list[float], latencies: list[float]):
+    """Record when each listing comes out of the scraper and how long opening each one took."""
+
+    def timed(extract):
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await extract(*args, **kwargs)
+            finally:
+                latencies.append((time.perf_counter() - started) * 1000)
+        return wrapper
+
+    scrape = scraper.scrape_category_city
+
+    async def counted(*args, **kwargs):
+        async for lead in scrape(*args, **kwargs):
+            listings.append(time.perf_counter())
+            yield lead
+
+    scraper._extract_listing_details = timed(scraper._extract_listing_details)
+    scraper._extract_place = timed(scraper._extract_place)
+    scraper.scrape_category_city = counted
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=AGENT_DIR, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+async def run(args) -> dict:
+    import agent
+
+    fixture = MapsFixtureServer(
+        listings=args.listings, latency=args.latency / 1000, site_latency=args.site_latency / 1000
+    ).start()
+    mock = MockLeadGenServer().start()
+    with tempfile.TemporaryDirectory() as state_dir:
+        configure(args, state_dir, fixture.url)
+        agent.load_modules()
+        from dedup_index import DedupIndex
+        from uploader import BatchSizer, UploadSpool
+
+        api = agent.AsyncLeadGenAPI(agent.LeadGenAPI(mock.url, "bench"))
+        scraper = agent.GoogleMapsScraper(headless=not args.headed)
+        launch_started = time.perf_counter()
+        await scraper.start()
+        launch_seconds = time.perf_counter() - launch_started
+
+        listings: list[float] = []
+        latencies: list[float] = []
+        instrument(scraper, listings, latencies)
+        spool, sizer, dedup = UploadSpool(), BatchSizer(), DedupIndex()
+
+        jobs = []
+        started = time.perf_counter()
+        try:
+            for spec in args.job:
+                category, _, city = spec.partition(":")
+                mock.store.add_job(category.strip(), city.strip())
+                job = await api.claim_job()
+                before = len(listings)
+                summary = await agent.execute_job(api, job, scraper, spool, sizer, dedup)
+                jobs.append({
+                    "category": job["category"],
+                    "city": job["city"],
+                    "status": summary["status"],
+                    "listings": len(listings) - before,
+                    "leads_uploaded": summary["leads_uploaded"],
+                    "seconds": summary["seconds"],
+                    "scroll_seconds": summary["scroll_seconds"],
+                    "phase_seconds": summary["phase_seconds"],
+                })
+            seconds = time.perf_counter() - started
+        finally:
+            resource_stats = scraper.resource_filter.stats() if scraper.resource_filter else {}
+            await scraper.stop()
+            scraper.enricher.close()
+            dedup.close()
+            fixture.stop()
+            mock.stop()
+
+    leads = len(mock.store.leads)
+    return {
+        "benchmark": "bench_agent",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "settings": {
+            "jobs": args.job,
+            "listings_per_search": args.listings,
+            "fast_mode": args.fast,
+            "tab_pool_size": args.tabs,
+            "human_delays": args.delays,
+            "maps_latency_ms": args.latency,
+            "site_latency_ms": args.site_latency,
+        },
+        "jobs": jobs,
+        "metrics": {
+            "seconds": round(seconds, 2),
+            "browser_launch_seconds": round(launch_seconds, 2),
+            "listings": len(listings),
+            "leads": leads,
+            "leads_with_email": sum(1 for lead in mock.store.leads if lead.get("email")),
+            "listings_per_sec": round(len(listings) / seconds, 2) if seconds else 0.0,
+            "leads_per_sec": round(leads / seconds, 2) if seconds else 0.0,
+            "listing_latency_p50_ms": round(percentile(latencies, 0.50), 1),
+            "listing_latency_p95_ms": round(percentile(latencies, 0.95), 1),
+            "listings_opened": len(latencies),
+            "browser_bytes": fixture.store.bytes_sent.get("maps", 0),
+            "browser_requests": fixture.store.requests.get("maps", 0),
+            "website_bytes": fixture.store.bytes_sent.get("sites", 0),
+            "website_requests": fixture.store.requests.get("sites", 0),
+            "upload_bytes": mock.store.bytes_received,
+            "upload_requests": mock.store.requests.get("POST /api/agent/leads", 0),
+            "api_requests": sum(mock.store.requests.values()),
+            "resource_filter": resource_stats,
+        },
+    }
+
+
+def compare(result: dict, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n📊 Compared with {os.path.basename(baseline_path)} ({baseline.get('commit') or 'unknown commit'}):")
+    for name, higher_is_better in COMPARED.items():
+        old, new = baseline["metrics"].get(name), result["metrics"].get(name)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        better = (change > 0) == higher_is_better
+        mark = "✅" if better or abs(change) < 2 else "⚠️ "
+        print(f"   {mark} {name:<24} {old:>12,} → {new:>12,}  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the agent end-to-end against offline fixtures")
+    parser.add_argument(
+        "--job", action="append", metavar="CATEGORY:CITY",
+        help='scripted job (repeatable; default: "gyms:Pune" and "dentists:Jaipur")',
+    )
+    parser.add_argument("--listings", type=int, default=60, help="results per search")
+    parser.add_argument("--fast", action="store_true", help="run with FAST_MODE")
+    parser.add_argument("--tabs", type=int, default=1, help="TAB_POOL_SIZE (1 = click listings)")
+    parser.add_argument("--delays", action="store_true", help="keep the human-like random pauses")
+    parser.add_argument("--latency", type=float, default=50, help="fixture Maps response latency (ms)")
+    parser.add_argument("--site-latency", type=float, default=50, help="fixture website response latency (ms)")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    parser.add_argument("--out", help="result file (default: benchmarks/results/bench_agent-<time>.json)")
+    parser.add_argument("--compare", metavar="RESULT_JSON", help="earlier result to compare against")
+    args = parser.parse_args()
+    args.job = args.job or ["gyms:Pune", "dentists:Jaipur"]
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    # Every website request goes through the one fixture proxy, overflowing the per-host pool
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+    result = asyncio.run(run(args))
+
+    m = result["metrics"]
+    print(
+        f"\n📏 {len(result['jobs'])} jobs, {m['listings']} listings, {m['leads']} leads "
+        f"({m['leads_with_email']} with email) in {m['seconds']}s"
+    )
+    print(f"   listings/s {m['listings_per_sec']}  leads/s {m['leads_per_sec']}")
+    print(
+        f"   per-listing latency p50 {m['listing_latency_p50_ms']} ms, p95 {m['listing_latency_p95_ms']} ms "
+        f"({m['listings_opened']} listings opened)"
+    )
+    print(
+        f"   browser {m['browser_bytes']:,} B in {m['browser_requests']} requests, "
+        f"websites {m['website_bytes']:,} B in {m['website_requests']} requests"
+    )
+    print(f"   uploads {m['upload_requests']} requests, {m['upload_bytes']:,} B")
+
+    out = args.out or os.path.join(
+        RESULTS_DIR, f"bench_agent-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"   💾 Saved {out}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
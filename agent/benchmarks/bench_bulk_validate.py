@@ -0,0 +1,128 @@
+"""
+Bulk validation parity check and benchmark (needs pandas).
+
+Generates messy lead columns — real-world phone/email/rating/review
+formats plus random fuzz — and checks that validator.bulk_clean and
+bulk_deduplicate give exactly the same results as the row-wise functions
+(validate_phone, validate_email, normalize_rating, normalize_reviews,
+deduplicate). Exits non-zero on the first mismatch, then prints
+rows/second for both paths.
+
+Usage:
+    python benchmarks/bench_bulk_validate.py [--rows 200000] [--fuzz 20000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from validator import (  # noqa: E402
+    bulk_clean, bulk_deduplicate, deduplicate, normalize_rating, normalize_reviews,
+    validate_email, validate_phone,
+)
+
+PHONES = [
+    "+91 98765 43210", "+919876543210", "919876543210", "09876543210", "098765-43210",
+    "080 2345 6789", "(022) 2345-678", "12345", "1234567", "+1 (415) 555-0100", "",
+    "  98765 43210  ", "91 80 2345 6789", "0 80 2345 6789", "५४३२१०९८७६", "+91",
+]
+PHONE_FORMATS = ["+91 {} {}", "0{}-{}", "91{}{}", "{} {}", "({}) {}"]
+EMAILS = [
+    "info@shop.in", " Sales@Example.co.in ", "not-an-email", "", "a@b", "a@b.c",
+    "first.last+tag@sub.domain.org", "UPPER@CASE.COM", "x@y.com\n", "bad@@x.com",
+]
+RATINGS = ["4.5", "4,5", "5", "5.0", "0", "3.95", "4.25", "6.1", "", "N/A", "Rated 4.2 of 5", "12"]
+REVIEWS = ["120", "(1,234)", "1,234 reviews", "0", "007", "", "none", ",", "12,", "3.4K"]
+FUZZ_CHARS = "0123456789+-() .,@abcXYZ_%\t\n\x1c\xa0٣"
+
+COLUMNS = {
+    "phone": validate_phone,
+    "email": validate_email,
+    "rating": normalize_rating,
+    "reviews": normalize_reviews,
+}
+
+
+def make_frame(rows: int, fuzz: int, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+
+    def fuzzed():
+        return "".join(rng.choice(FUZZ_CHARS) for _ in range(rng.randint(0, 16)))
+
+    data = {"business_name": [], "address": [], "phone": [], "email": [], "rating": [], "reviews": []}
+    for n in range(rows + fuzz):
+        i = rng.randrange(max(1, int(rows * 0.8)))
+        data["business_name"].append("" if i % 97 == 0 else f"Business {i}" + (" " if n % 5 == 0 else ""))
+        data["address"].append(f"{i} MG Road")
+        if n < rows:
+            if n % 2:
+                data["phone"].append(rng.choice(PHONES))
+            else:
+                number = str(rng.randint(6_000_000_000, 9_999_999_999))
+                data["phone"].append(rng.choice(PHONE_FORMATS).format(number[:5], number[5:]))
+            data["email"].append(rng.choice(EMAILS))
+            data["rating"].append(rng.choice(RATINGS))
+            data["reviews"].append(rng.choice(REVIEWS))
+        else:
+            for col in ("phone", "email", "rating", "reviews"):
+                data[col].append(fuzzed())
+    return pd.DataFrame(data)
+
+
+def row_wise(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    for col, fn in COLUMNS.items():
+        out[col] = [fn(v) for v in df[col].tolist()]
+    return out
+
+
+def check_parity(df: pd.DataFrame, expected: pd.DataFrame, actual: pd.DataFrame):
+    for col in COLUMNS:
+        for raw, want, got in zip(df[col].tolist(), expected[col].tolist(), actual[col].tolist()):
+            if want != got:
+                print(f"   ❌ {col}: {raw!r} → row-wise {want!r}, bulk {got!r}")
+                sys.exit(1)
+
+    leads = df.to_dict("records")
+    with contextlib.redirect_stdout(io.StringIO()):
+        want_rows = [(lead["business_name"], lead["address"]) for lead in deduplicate(leads)]
+    got_rows = list(bulk_deduplicate(df)[["business_name", "address"]].itertuples(index=False, name=None))
+    if want_rows != got_rows:
+        print(f"   ❌ dedupe: row-wise kept {len(want_rows)} rows, bulk kept {len(got_rows)}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check bulk_clean parity and benchmark it")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--fuzz", type=int, default=20_000, help="extra rows of random characters")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.fuzz)
+    total = len(df)
+    print(f"📏 {total} rows ({args.fuzz} fuzzed)")
+
+    start = time.perf_counter()
+    expected = row_wise(df)
+    row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = bulk_clean(df)
+    bulk_seconds = time.perf_counter() - start
+
+    check_parity(df, expected, actual)
+    print("   ✅ bulk results identical to the row-wise validators")
+    print(f"   row-wise {total / row_seconds:>12,.0f} rows/s  ({row_seconds:.2f}s)")
+    print(f"   bulk     {total / bulk_seconds:>12,.0f} rows/s  ({bulk_seconds:.2f}s, {row_seconds / bulk_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
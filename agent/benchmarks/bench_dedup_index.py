@@ -0,0 +1,95 @@
+"""
+Dedup index benchmark — lookup latency on a large persistent index.
+
+Fills a DedupIndex (in a temporary SQLite file) with synthetic leads, then
+times check() for unseen leads, exact duplicates and near-duplicates
+(reworded addresses), reporting p50/p99 latency and how many of the
+near-duplicates were caught.
+
+Usage:
+    python benchmarks/bench_dedup_index.py [--leads 200000] [--lookups 5000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_index import DedupIndex  # noqa: E402
+
+CITIES = ["Pune", "Mumbai", "Delhi", "Jaipur", "Bengaluru"]
+WORDS = ["Smile", "Dental", "Care", "Royal", "Fitness", "Gym", "Cafe", "Spice", "Green", "Star", "Salon", "Clinic"]
+AREAS = ["FC Road", "MG Road", "Camp", "Baner", "Andheri West", "Koregaon Park", "Civil Lines", "Indiranagar"]
+
+
+def make_lead(rng: random.Random, i: int) -> dict:
+    name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+    return {
+        "business_name": name,
+        "address": f"{rng.randint(1, 500)}, {rng.choice(AREAS)}, Near Bus Stop {i % 97}",
+        "city": rng.choice(CITIES),
+        "phone": f"+91{rng.randint(6_000_000_000, 9_999_999_999)}" if rng.random() < 0.7 else "",
+        "website": f"https://www.biz{i}.in" if rng.random() < 0.4 else "",
+        "google_maps_url": "",
+    }
+
+
+def reworded(lead: dict) -> dict:
+    """Same business, different scrape: no phone/website, address punctuation changed."""
+    address = lead["address"].replace(",", "").replace("Road", "Rd.")
+    return {**lead, "phone": "", "website": "", "address": address}
+
+
+def timed(index: DedupIndex, leads: list[dict]) -> tuple[list[float], int]:
+    latencies, hits = [], 0
+    for lead in leads:
+        start = time.perf_counter()
+        if index.check(lead):
+            hits += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, hits
+
+
+def report(label: str, latencies: list[float], hits: int):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"   {label:<16} p50 {statistics.median(latencies):.3f} ms  p99 {p99:.3f} ms  "
+        f"({hits}/{len(latencies)} flagged as duplicates)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DedupIndex lookups")
+    parser.add_argument("--leads", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = DedupIndex(os.path.join(tmp, "dedup.sqlite"))
+        stored = []
+        start = time.perf_counter()
+        for i in range(args.leads):
+            lead = make_lead(rng, i)
+            index.check_and_add(lead)
+            if i % max(1, args.leads // args.lookups) == 0:
+                stored.append(lead)
+        seconds = time.perf_counter() - start
+        print(f"📏 {args.leads} leads indexed in {seconds:.1f}s ({args.leads / seconds:,.0f}/s)")
+
+        stored = stored[:args.lookups]
+        fresh = [make_lead(rng, args.leads + i) for i in range(len(stored))]
+        report("unseen", *timed(index, fresh))
+        report("exact duplicate", *timed(index, stored))
+        report("near duplicate", *timed(index, [reworded(lead) for lead in stored]))
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
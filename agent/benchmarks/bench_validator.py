@@ -0,0 +1,113 @@
+"""
+Validator benchmark — per-lead process_leads([lead]) vs LeadValidator.
+
+Feeds the same synthetic leads (with duplicates, bad phones/emails and a
+few nameless entries) through:
+
+    legacy     process_leads([lead]) + a caller-side seen-set (old execute_job path)
+    feed       LeadValidator.feed(lead) per lead
+    feed_many  LeadValidator.feed_many(leads)
+
+and prints leads/second for each, checking that all three accept the
+same leads.
+
+Usage:
+    python benchmarks/bench_validator.py [--leads 100000] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validator import LeadValidator, process_leads  # noqa: E402
+
+PHONES = ["+91 98765 43210", "098765-43210", "080 2345 6789", "12345", "", "(022) 2345-678"]
+EMAILS = ["info@shop.in", "Sales@Example.co.in ", "not-an-email", "", "a@b"]
+
+
+def make_leads(count: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    unique = max(1, int(count * 0.8))  # ~20% duplicates
+    leads = []
+    for _ in range(count):
+        i = rng.randrange(unique)
+        leads.append({
+            "business_name": "" if i % 97 == 0 else f"Business {i}",
+            "address": f"{i} MG Road, Bengaluru",
+            "phone": rng.choice(PHONES),
+            "email": rng.choice(EMAILS),
+            "rating": "4.2",
+            "reviews": "120",
+        })
+    return leads
+
+
+def run_legacy(leads: list[dict]) -> list[dict]:
+    seen_keys = set()
+    accepted = []
+    for raw_lead in leads:
+        validation_list = process_leads([raw_lead])
+        if not validation_list:
+            continue
+        lead = validation_list[0]
+        key = (lead.get("business_name", "").lower().strip(), lead.get("address", "").lower().strip())
+        if key in seen_keys or not key[0]:
+            continue
+        seen_keys.add(key)
+        accepted.append(lead)
+    return accepted
+
+
+def run_feed(leads: list[dict]) -> list[dict]:
+    validator = LeadValidator()
+    return [lead for lead in (validator.feed(raw) for raw in leads) if lead is not None]
+
+
+def run_feed_many(leads: list[dict]) -> list[dict]:
+    return LeadValidator().feed_many(leads)
+
+
+def bench(fn, leads: list[dict], repeat: int) -> tuple[float, list[dict]]:
+    best = float("inf")
+    result = []
+    for _ in range(repeat):
+        batch = copy.deepcopy(leads)  # validators clean leads in place
+        with contextlib.redirect_stdout(io.StringIO()):  # legacy dedup prints
+            start = time.perf_counter()
+            result = fn(batch)
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lead validation throughput")
+    parser.add_argument("--leads", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    leads = make_leads(args.leads)
+    print(f"📏 {args.leads} leads, best of {args.repeat}")
+
+    baseline = None
+    reference = None
+    for name, fn in (("legacy", run_legacy), ("feed", run_feed), ("feed_many", run_feed_many)):
+        seconds, accepted = bench(fn, leads, args.repeat)
+        rate = args.leads / seconds
+        baseline = baseline or rate
+        print(f"   {name:<10} {rate:>12,.0f} leads/s  ({seconds:.3f}s, {len(accepted)} accepted, {rate / baseline:.2f}x)")
+        if reference is None:
+            reference = accepted
+        elif accepted != reference:
+            print(f"   ❌ {name} accepted different leads than legacy")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Maps fixture — an offline stand-in for Google Maps and business websites.
+
+Serves synthetic pages with the DOM structure the scraper reads (results
+feed with infinite scroll, place panels, data-item-id info rows). The
+listings are generated deterministically from the search query, so every
+run sees the same businesses:
+
+    /maps/search/<query>              results page (first `feed_page` cards)
+    /maps/api/more?q=<query>&offset=  more cards, fetched by the page on scroll
+    /maps/place/<name>/data=...       place page (tab pool and fast mode)
+    http://<slug>.bench.test/...      business websites, some with a contact email
+
+The server is also an HTTP proxy for *.bench.test hosts: set HTTP_PROXY to
+its URL and website lookups reach it without DNS, each business under its
+own hostname. Point config.MAPS_BASE_URL at <url>/maps for the rest.
+
+Usage (standalone, for poking at the pages in a browser):
+    python benchmarks/maps_fixture.py --port 8765 --listings 60
+"""
+
+import argparse
+import html
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, quote_plus, unquote_plus, urlsplit
+
+SITE_SUFFIX = ".bench.test"
+
+PREFIXES = ["Royal", "Green", "Star", "Prime", "Urban", "Golden", "Smile", "City", "Sunrise", "Elite"]
+NOUNS = ["Care", "Point", "Hub", "Studio", "House", "Centre", "Zone", "Works", "Corner", "Plaza"]
+AREAS = ["FC Road", "MG Road", "Camp", "Baner", "Andheri West", "Koregaon Park", "Civil Lines", "Indiranagar"]
+
+_FEATURE_ID = re.compile(r"!1s0x([0-9a-f]+):0x([0-9a-f]+)")
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+_CARD = """<div><div role="article" style="min-height:96px;border-bottom:1px solid #ddd">
+<a class="hfpxzc" aria-label="{name}" href="{url}" style="display:block">{name}</a>
+<span class="MW4etd">{rating}</span> <span class="UY7F9">({reviews})</span>
+<div class="W4Efsd"><div class="W4Efsd">{category} · {address}</div></div>
+{phone}{website}
+<template>{panel}</template>
+</div></div>"""
+
+_PANEL = """<div class="panel">
+<img src="/maps/photo/{index}.jpg" width="400" height="200" alt="">
+<h1 class="DUwDvf">{name}</h1>
+<div class="F7nice"><span aria-hidden="true">{rating}</span> <span aria-label="{reviews} reviews">({reviews})</span></div>
+<button class="DkEaL">{category}</button>
+<button data-item-id="address" aria-label="Address: {address}">{address}</button>
+{phone}{website}
+</div>"""
+
+_END = """<div><span class="HlvSq">You've reached the end of the list.</span></div>"""
+
+_SEARCH_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{query} - Google Maps</title>
+<link rel="stylesheet" href="/maps/static/app.css"></head>
+<body>
+<div role="main" style="display:flex">
+  <div role="feed" aria-label="Results for {query}" style="width:420px;height:640px;overflow-y:auto">{cards}</div>
+  <div id="panel" style="flex:1"></div>
+</div>
+<script>
+const feed = document.querySelector('div[role="feed"]');
+const QUERY = {query_json}, TOTAL = {total};
+let busy = false, done = {done};
+const loaded = () => feed.querySelectorAll('div[role="article"]').length;
+const end = () => {{ if (!done) {{ done = true; feed.insertAdjacentHTML("beforeend", {end_json}); }} }};
+feed.addEventListener("scroll", () => {{
+  if (busy || done || feed.scrollTop + feed.clientHeight < feed.scrollHeight - 200) return;
+  if (loaded() >= TOTAL) return end();
+  busy = true;
+  fetch("/maps/api/more?q=" + encodeURIComponent(QUERY) + "&offset=" + loaded())
+    .then(r => r.text())
+    .then(cards => {{ feed.insertAdjacentHTML("beforeend", cards); busy = false; if (loaded() >= TOTAL) end(); }});
+}});
+document.addEventListener("click", e => {{
+  const link = e.target.closest("a.hfpxzc");
+  if (!link) return;
+  e.preventDefault();
+  const card = link.closest('div[role="article"]');
+  document.getElementById("panel").replaceChildren(card.querySelector("template").content.cloneNode(true));
+  history.pushState(null, "", link.href);
+}});
+</script>
+</body></html>"""
+
+_PLACE_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{name} - Google Maps</title>
+<link rel="stylesheet" href="/maps/static/app.css"></head>
+<body><div role="main">{panel}</div></body></html>"""
+
+_SITE_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<nav><a href="/">Home</a> <a href="/contact">Contact</a> <a href="/about">About</a></nav>
+<h1>{title}</h1>
+<p>{body}</p>
+<p>{filler}</p>
+<footer>{footer}</footer>
+</body></html>"""
+
+
+def _category(query: str) -> tuple[str, str]:
+    category, _, city = query.partition(" in ")
+    return category.strip() or "business", city.strip() or "Pune"
+
+
+class Business:
+    """One synthetic listing (deterministic for a query and index)."""
+
+    def __init__(self, query: str, index: int):
+        rng = random.Random(f"{query}:{index}")
+        category, city = _category(query)
+        self.index = index
+        self.name = f"{rng.choice(PREFIXES)} {rng.choice(NOUNS)} {category.title()} {index + 1}"
+        self.category = category.rstrip("s").title()
+        self.city = city
+        self.address = f"{rng.randint(1, 400)}, {rng.choice(AREAS)}, {city}"
+        self.rating = f"{rng.uniform(3.0, 5.0):.1f}"
+        self.reviews = rng.randint(0, 2500)
+        self.phone = f"0{rng.randint(60000, 99999)} {rng.randint(10000, 99999)}" if rng.random() < 0.85 else ""
+        self.feature_id = f"0x{zlib.crc32(query.encode()):x}:0x{index + 1:x}"
+        self.slug = f"{_SLUG.sub('-', self.name.lower()).strip('-')}-{zlib.crc32(query.encode()) % 10000}"
+        self.website = f"http://{self.slug}{SITE_SUFFIX}/" if rng.random() < 0.6 else ""
+        # Where the site shows an email: contact page mailto, home page text, or nowhere
+        self.email_on = rng.choices(["contact", "home", ""], weights=[6, 2, 2])[0] if self.website else ""
+        self.email = f"info@{self.slug}.in"
+        # Cards don't always show the phone/website (fast mode then opens the place)
+        self.card_phone = self.phone if rng.random() < 0.7 else ""
+        self.card_website = self.website if rng.random() < 0.7 else ""
+
+    def place_path(self) -> str:
+        return f"/maps/place/{quote_plus(self.name)}/data=!4m7!3m6!1s{self.feature_id}!8m2!3d18.52!4d73.85!16s"
+
+    def panel(self) -> str:
+        e = html.escape
+        phone = (
+            f'<button data-item-id="phone:tel:{e(self.phone.replace(" ", ""))}" '
+            f'aria-label="Phone: {e(self.phone)}">{e(self.phone)}</button>'
+        ) if self.phone else ""
+        website = (
+            f'<a data-item-id="authority" aria-label="Website: {e(self.website)}" href="{e(self.website)}">'
+            f"{e(self.website)}</a>"
+        ) if self.website else ""
+        return _PANEL.format(
+            index=self.index, name=e(self.name), rating=self.rating, reviews=self.reviews,
+            category=e(self.category), address=e(self.address), phone=phone, website=website,
+        )
+
+    def card(self, base_url: str) -> str:
+        e = html.escape
+        phone = f'<span class="UsdlK">{e(self.card_phone)}</span>' if self.card_phone else ""
+        website = (
+            f'<div><a data-value="Website" href="{e(self.card_website)}">Website</a></div>'
+        ) if self.card_website else ""
+        return _CARD.format(
+            name=e(self.name), url=e(base_url + self.place_path()), rating=self.rating,
+            reviews=f"{self.reviews:,}", category=e(self.category), address=e(self.address),
+            phone=phone, website=website, panel=self.panel(),
+        )
+
+
+class FixtureStore:
+    """Generated listings per query, plus request/byte counters per kind ("maps", "sites")."""
+
+    def __init__(self, listings: int = 60, feed_page: int = 20, latency: float = 0.0, site_latency: float = 0.0):
+        self.listings = listings
+        self.feed_page = feed_page
+        self.latency = latency
+        self.site_latency = site_latency
+        self.requests: dict[str, int] = {}
+        self.bytes_sent: dict[str, int] = {}
+        self._queries: dict[str, list[Business]] = {}  # crc32 hex -> businesses
+        self._sites: dict[str, Business] = {}
+        self._lock = threading.Lock()
+
+    def businesses(self, query: str) -> list[Business]:
+        key = f"{zlib.crc32(query.encode()):x}"
+        with self._lock:
+            if key not in self._queries:
+                self._queries[key] = [Business(query, i) for i in range(self.listings)]
+                self._sites.update((b.slug, b) for b in self._queries[key] if b.website)
+            return self._queries[key]
+
+    def place(self, feature_hash: str, index: int) -> Business | None:
+        with self._lock:
+            listings = self._queries.get(feature_hash) or []
+        return listings[index - 1] if 0 < index <= len(listings) else None
+
+    def site(self, slug: str) -> Business | None:
+        with self._lock:
+            return self._sites.get(slug)
+
+    def count(self, kind: str, nbytes: int):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            self.bytes_sent[kind] = self.bytes_sent.get(kind, 0) + nbytes
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Routes Maps pages by path and website requests (direct or proxied) by host."""
+
+    server_version = "MapsFixture/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def store(self) -> FixtureStore:
+        return self.server.store
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet
+
+    def _send(self, kind: str, status: int, body: str | bytes, content_type: str = "text/html; charset=utf-8"):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.store.count(kind, len(data))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        host = (url.hostname or self.headers.get("Host", "").split(":")[0]).lower()
+        if host.endswith(SITE_SUFFIX):
+            return self._site(host[: -len(SITE_SUFFIX)], url.path)
+        if self.store.latency:
+            time.sleep(self.store.latency)
+        base_url = f"http://{self.headers.get('Host', '')}"
+        path = url.path
+
+        if path.startswith("/maps/search/"):
+            query = unquote_plus(path[len("/maps/search/"):]).strip("/")
+            listings = self.store.businesses(query)
+            first = listings[: self.store.feed_page]
+            done = len(first) >= len(listings)
+            page = _SEARCH_PAGE.format(
+                query=html.escape(query), query_json=json.dumps(query), total=len(listings),
+                cards="".join(b.card(base_url) for b in first) + (_END if done else ""),
+                done="true" if done else "false", end_json=json.dumps(_END),
+            )
+            return self._send("maps", 200, page)
+
+        if path == "/maps/api/more":
+            params = parse_qs(url.query)
+            listings = self.store.businesses(params.get("q", [""])[0])
+            offset = int(params.get("offset", ["0"])[0])
+            cards = listings[offset: offset + self.store.feed_page]
+            return self._send("maps", 200, "".join(b.card(base_url) for b in cards))
+
+        if path.startswith("/maps/place/"):
+            match = _FEATURE_ID.search(path)
+            business = self.store.place(match.group(1), int(match.group(2), 16)) if match else None
+            if not business:
+                return self._send("maps", 404, "Not found")
+            return self._send("maps", 200, _PLACE_PAGE.format(name=html.escape(business.name), panel=business.panel()))
+
+        if path.startswith("/maps/photo/"):
+            return self._send("maps", 200, b"\xff\xd8\xff" + b"\0" * 20_000, "image/jpeg")
+
+        if path.startswith("/maps/static/"):
+            return self._send("maps", 200, "body { font-family: sans-serif; }\n" * 200, "text/css")
+
+        self._send("maps", 404, "Not found")
+
+    def _site(self, slug: str, path: str):
+        if self.store.site_latency:
+            time.sleep(self.store.site_latency)
+        business = self.store.site(slug)
+        path = path.rstrip("/") or "/"
+        if not business or path not in ("/", "/contact", "/about"):
+            return self._send("sites", 404, "<h1>404 Not Found</h1>")
+
+        e = html.escape
+        email = f'<a href="mailto:{business.email}">{business.email}</a>'
+        footer = f"© {e(business.name)}, {e(business.address)}"
+        body = f"Welcome to {e(business.name)}, serving {e(business.city)} since 2009."
+        if path == "/" and business.email_on == "home":
+            footer += f" · Write to us: {business.email}"
+        if path == "/contact":
+            body = f"Call {e(business.phone or 'us')}" + (f" or email {email}" if business.email_on == "contact" else "")
+        page = _SITE_PAGE.format(title=e(business.name), body=body, filler="Lorem ipsum dolor sit amet. " * 60, footer=footer)
+        self._send("sites", 200, page)
+
+
+class MapsFixtureServer:
+    """Runs the fixture on a background thread (port 0 picks a free port)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **options):
+        self.store = FixtureStore(**options)
+        self._httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.store = self.store
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MapsFixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Google Maps + business website fixture")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--listings", type=int, default=60, help="results per search")
+    args = parser.parse_args()
+
+    server = MapsFixtureServer(args.host, args.port, listings=args.listings).start()
+    print(f"🧪 Maps fixture on {server.url} — try {server.url}/maps/search/{quote('gyms in Pune')}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
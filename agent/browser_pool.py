@@ -0,0 +1,213 @@
+"""
+Browser Pool — launch stealth browsers and keep spare ones warm.
+
+Launching Chromium, creating a context and injecting the stealth script
+takes a few seconds. The pool starts the Playwright driver once and keeps
+BROWSER_STANDBY fully prepared sessions (browser + context + page) ready.
+When a job's browser crashes, GoogleMapsScraper.restart() swaps in a
+standby at once and the pool launches a replacement in the background.
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+import agent_config as config
+from resource_filter import ResourceFilter
+
+logger = logging.getLogger(__name__)
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+]
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Stealth: mask webdriver property
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+    Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+    Object.defineProperty(navigator, 'languages', { get: () => ['en-IN', 'en-US', 'en'] });
+    window.chrome = { runtime: {} };
+"""
+
+
+class BrowserSession:
+    """One launched browser with its stealth context and first page."""
+
+    def __init__(self, browser: Browser, context: BrowserContext, page: Page, launch_seconds: float):
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.launch_seconds = launch_seconds
+
+    @property
+    def alive(self) -> bool:
+        return self.browser.is_connected() and not self.page.is_closed()
+
+    async def close(self):
+        try:
+            await self.browser.close()
+        except Exception:
+            pass  # Browser may already be closed or connection lost
+
+
+class BrowserPool:
+    """
+    Hands out browser sessions, keeping `standby` spare ones launched.
+
+    resource_filter is installed on every context, so its counters cover
+    all the pool's browsers.
+    """
+
+    def __init__(
+        self,
+        headless: bool = False,
+        standby: int | None = None,
+        resource_filter: ResourceFilter | None = None,
+    ):
+        self.headless = headless
+        self.standby = config.BROWSER_STANDBY if standby is None else standby
+        self.resource_filter = resource_filter
+
+        self.launches = 0
+        self.warm_swaps = 0      # sessions handed out from the standby list
+        self.cold_starts = 0     # sessions launched while a caller waited
+        self.launch_seconds = 0.0
+
+        self._playwright = None
+        self._spares: list[BrowserSession] = []
+        self._refill_task: asyncio.Task | None = None
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> int:
+        """Standby sessions that can be handed out right now."""
+        return sum(1 for session in self._spares if session.alive)
+
+    async def start(self):
+        """Start the Playwright driver (once; later calls return at once)."""
+        async with self._start_lock:
+            if self._playwright is None:
+                started = time.monotonic()
+                self._playwright = await async_playwright().start()
+                logger.info("Playwright driver started in %.2fs", time.monotonic() - started)
+
+    async def acquire(self) -> BrowserSession:
+        """A ready session: a warm standby if one is alive, else a freshly launched one."""
+        await self.start()
+        while self._spares:
+            session = self._spares.pop(0)
+            if session.alive:
+                self.warm_swaps += 1
+                self._refill()
+                return session
+            await session.close()
+
+        self.cold_starts += 1
+        try:
+            session = await self._launch()
+        except Exception as e:
+            logger.warning("Browser launch failed, retrying: %s", e)
+            await asyncio.sleep(2)  # Brief cooldown
+            try:
+                session = await self._launch()
+            except Exception as e:
+                # Two failures in a row: the driver itself is likely gone — start a new one
+                logger.warning("Browser launch failed again (%s), restarting the Playwright driver", e)
+                await self._stop_driver()
+                await self.start()
+                session = await self._launch()
+        self._refill()
+        return session
+
+    async def close(self):
+        """Close the standby browsers and the driver (sessions handed out are the caller's)."""
+        if self._refill_task:
+            self._refill_task.cancel()
+            await asyncio.gather(self._refill_task, return_exceptions=True)
+            self._refill_task = None
+        spares, self._spares = self._spares, []
+        await asyncio.gather(*(session.close() for session in spares), return_exceptions=True)
+        await self._stop_driver()
+
+    def stats(self) -> dict:
+        return {
+            "launches": self.launches,
+            "warm_swaps": self.warm_swaps,
+            "cold_starts": self.cold_starts,
+            "avg_launch_seconds": round(self.launch_seconds / self.launches, 2) if self.launches else 0.0,
+            "standby_ready": self.ready,
+        }
+
+    # ── Internals ───────────────────────────────────────────────────────
+
+    async def _launch(self) -> BrowserSession:
+        started = time.monotonic()
+
+        # Randomize viewport for fingerprint variation
+        width = random.randint(1280, 1920)
+        height = random.randint(800, 1080)
+
+        browser = await self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        try:
+            context = await browser.new_context(
+                viewport={"width": width, "height": height},
+                user_agent=USER_AGENT,
+                locale="en-IN",
+                timezone_id="Asia/Kolkata",
+            )
+            await context.add_init_script(STEALTH_SCRIPT)
+
+            # Skip tiles, photos, fonts and analytics (see RESOURCE_FILTER_PRESET)
+            if self.resource_filter:
+                await self.resource_filter.install(context)
+
+            page = await context.new_page()
+        except BaseException:
+            await browser.close()
+            raise
+
+        seconds = time.monotonic() - started
+        self.launches += 1
+        self.launch_seconds += seconds
+        logger.info(
+            "Browser launched in %.2fs (headless=%s, viewport=%dx%d)", seconds, self.headless, width, height
+        )
+        return BrowserSession(browser, context, page, seconds)
+
+    def _refill(self):
+        """Top the standby list up in the background (one refill task at a time)."""
+        if self.standby <= 0 or (self._refill_task and not self._refill_task.done()):
+            return
+        self._refill_task = asyncio.create_task(self._fill())
+
+    async def _fill(self):
+        failures = 0
+        while len(self._spares) < self.standby:
+            try:
+                self._spares.append(await self._launch())
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.warning("Could not launch a standby browser (attempt %d): %s", failures, e)
+                if failures >= 3:
+                    return  # tried again on the next acquire()
+                await asyncio.sleep(2 * failures)
+
+    async def _stop_driver(self):
+        try:
+            if self._playwright:
+                await self._playwright.stop()
+        except Exception:
+            pass
+        self._playwright = None
@@ -0,0 +1,82 @@
+"""
+Bulk Validate — re-clean large lead exports column-at-a-time.
+
+Reads a CSV or Parquet file of leads, normalizes phone, email, rating and
+reviews with validator.bulk_clean (same results as the per-lead
+validators) and writes the result as CSV or Parquet. Needs pandas, plus
+pyarrow for Parquet files; the agent itself doesn't.
+
+Usage:
+    python bulk_validate.py leads.csv leads_clean.csv
+    python bulk_validate.py export.parquet clean.parquet --dedupe
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Fix Windows console encoding for emoji/unicode output
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+from validator import bulk_clean, bulk_deduplicate
+
+
+def _format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext == ".csv":
+        return "csv"
+    raise SystemExit(f"❌ Unsupported file type: {path} (use .csv or .parquet)")
+
+
+def read_leads(path: str):
+    import pandas as pd
+
+    if _format(path) == "parquet":
+        return pd.read_parquet(path)
+    # Keep every cell as text: "0987..." must not turn into a number
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def write_leads(df, path: str):
+    if _format(path) == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and normalize a CSV/Parquet file of leads")
+    parser.add_argument("input", help="CSV or Parquet file to read")
+    parser.add_argument("output", help="CSV or Parquet file to write")
+    parser.add_argument(
+        "--dedupe", action="store_true",
+        help="Also drop rows without a name and repeated (business_name, address) pairs",
+    )
+    args = parser.parse_args()
+
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        raise SystemExit("❌ bulk_validate needs pandas: pip install pandas pyarrow")
+
+    started = time.perf_counter()
+    df = read_leads(args.input)
+    rows = len(df)
+    print(f"📥 Read {rows} leads from {args.input}")
+
+    df = bulk_clean(df)
+    if args.dedupe:
+        df = bulk_deduplicate(df)
+        print(f"   🔄 Removed {rows - len(df)} duplicate/nameless leads")
+
+    write_leads(df, args.output)
+    print(f"   ✅ Wrote {len(df)} leads to {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
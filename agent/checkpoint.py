@@ -0,0 +1,157 @@
+"""
+Job Checkpoints — resume an interrupted job instead of starting over.
+
+While a job runs, a small JSON file in CHECKPOINT_DIR records which Maps
+listings (by place ID) are done, how far through the result list the job
+got and how many leads were uploaded. A listing only counts as done once
+its lead was rejected by validation or handed off for good (uploaded,
+written to the upload spool, or in flight when the agent stopped), so
+nothing is lost if the agent dies between two saves.
+
+When the browser crashes the job is put back to pending with its
+checkpoint (also stored on the server when CHECKPOINT_SYNC is on), and
+whichever agent claims it next skips the listings already processed.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+
+import agent_config as config
+from dedup_index import place_id
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class JobCheckpoint:
+    """Progress of one job: processed place IDs, listing cursor and upload counts."""
+
+    def __init__(self, job_id: str, directory: str | None = None):
+        self.job_id = job_id
+        self.directory = config.CHECKPOINT_DIR if directory is None else directory
+        self.processed: set[str] = set()  # place IDs of listings that need no more work
+        self.cursor = 0                   # listings processed so far, across attempts
+        self.uploaded_before = 0          # leads uploaded by earlier attempts
+        self.attempts = 0                 # attempts that ended in a browser crash
+        self.updated_at = 0.0
+
+        self._uploaded = 0                # leads uploaded by this attempt
+        self._queued: list[str] = []      # place IDs handed to the uploader, in upload order
+        self._delivered = 0               # how many of _queued were handed off for good
+        self._saved_at = 0.0
+
+    @classmethod
+    def load(cls, job: dict, directory: str | None = None) -> "JobCheckpoint":
+        """The checkpoint of `job`: the local file or the copy on the job row, whichever is newer."""
+        checkpoint = cls(job["id"], directory)
+        states = [s for s in (checkpoint._read(), job.get("checkpoint")) if isinstance(s, dict)]
+        if states:
+            checkpoint._restore(max(states, key=lambda s: s.get("updated_at", 0)))
+        return checkpoint
+
+    @property
+    def path(self) -> str:
+        if not self.directory:
+            return ""
+        return os.path.join(self.directory, f"{_UNSAFE.sub('_', self.job_id)}.json")
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.processed or self.uploaded_before)
+
+    @property
+    def uploaded(self) -> int:
+        """Leads uploaded by this job in total, including earlier attempts."""
+        return self.uploaded_before + self._uploaded
+
+    def skip(self) -> set[str]:
+        """Place IDs the scraper doesn't need to open again."""
+        return set(self.processed)
+
+    def mark_rejected(self, lead: dict):
+        """The listing's lead was dropped by validation — done."""
+        pid = place_id(lead.get("google_maps_url", ""))
+        if pid:
+            self.processed.add(pid)
+        self.cursor += 1
+
+    def mark_queued(self, lead: dict):
+        """The listing's lead was handed to the uploader (done once record_uploads covers it)."""
+        self._queued.append(place_id(lead.get("google_maps_url", "")))
+        self.cursor += 1
+
+    def record_uploads(self, uploaded: int, delivered: int):
+        """
+        Take the uploader's counters (LeadUploader.uploaded and .delivered).
+        It hands leads off in the order they were queued, so the first
+        `delivered` queued listings are done.
+        """
+        self._uploaded = uploaded
+        delivered = min(delivered, len(self._queued))
+        self.processed.update(pid for pid in self._queued[self._delivered:delivered] if pid)
+        self._delivered = delivered
+
+    def state(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "cursor": self.cursor - (len(self._queued) - self._delivered),
+            "uploaded": self.uploaded,
+            "attempts": self.attempts,
+            "processed": sorted(self.processed),
+            "updated_at": self.updated_at,
+        }
+
+    def save(self, force: bool = False) -> bool:
+        """Write the checkpoint (at most every CHECKPOINT_INTERVAL seconds unless forced)."""
+        if not self.path:
+            return False
+        if not force and time.monotonic() - self._saved_at < config.CHECKPOINT_INTERVAL:
+            return False
+        self._saved_at = time.monotonic()
+        self.updated_at = time.time()
+
+        # Write a temp file and rename it, so a crash never leaves half a checkpoint
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.state(), f)
+            os.replace(tmp, self.path)
+            return True
+        except OSError as e:
+            logger.warning("Could not save checkpoint of job %s: %s", self.job_id, e)
+            return False
+
+    def delete(self):
+        """Forget the checkpoint (the job finished and won't be resumed)."""
+        if not self.path:
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not delete checkpoint of job %s: %s", self.job_id, e)
+
+    # ── Internals ───────────────────────────────────────────────────────
+
+    def _read(self) -> dict | None:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", self.path, e)
+            return None
+
+    def _restore(self, state: dict):
+        self.processed = set(state.get("processed") or [])
+        self.cursor = int(state.get("cursor") or 0)
+        self.uploaded_before = int(state.get("uploaded") or 0)
+        self.attempts = int(state.get("attempts") or 0)
+        self.updated_at = float(state.get("updated_at") or 0)
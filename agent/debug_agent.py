@@ -9,7 +9,7 @@ from playwright.async_api import async_playwright
 
 import agent_config as config
 from scraper import GoogleMapsScraper
-from validator import process_leads
+from validator import LeadValidator
 
 # Config
 LOG_FILE = "debug_log.txt"
@@ -63,24 +63,16 @@ async def run():
     scraper = GoogleMapsScraper(headless=True)
     await scraper.start()
     
-    seen_keys = set()
+    validator = LeadValidator()
     current_batch = []
     
     try:
         async for raw_lead in scraper.scrape_category_city(target_job["category"], target_job["city"]):
-            clean_leads = process_leads([raw_lead])
-            if not clean_leads: continue
-            
-            lead = clean_leads[0]
-            name = lead.get("business_name", "").lower()
-            addr = lead.get("address", "").lower()
-            key = (name, addr)
-            
-            if key in seen_keys: continue
-            seen_keys.add(key)
+            lead = validator.feed(raw_lead)
+            if not lead: continue
             current_batch.append(lead)
             
-            if len(current_batch) >= 5: # Small batch to trigger faster
+            if len(current_batch) >= config.UPLOAD_BATCH_MIN: # Small batch to trigger faster
                 try:
                     formatted_batch = []
                     for l in current_batch:
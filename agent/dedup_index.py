@@ -0,0 +1,269 @@
+"""
+Dedup Index — persistent, cross-job duplicate detection for leads.
+
+The same business turns up in many jobs ("dentists in Pune", "dental
+clinics in Pune") with slightly different address strings. Every lead that
+is uploaded is recorded in a SQLite index under several keys:
+
+    place   Google Maps place/feature ID (from google_maps_url)
+    phone   validated phone number
+    domain  website domain, per city (social/link-hub domains are ignored)
+    print   fingerprint of the normalized name + address tokens
+
+plus MinHash LSH bands of its name + address, which find near-duplicates
+that no exact key catches. A lead matching a stored one is a duplicate
+unless both have phone numbers and they differ (e.g. two branches of a
+chain sharing a website); a place ID match always wins.
+
+Entries expire DEDUP_MAX_AGE_DAYS after upload, so re-running a job
+later uploads its leads again.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+from urllib.parse import unquote
+
+import agent_config as config
+from email_cache import cache_key, is_shared_host
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+_WORD = re.compile(r"[a-z0-9]+")
+_FEATURE_ID = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)")
+_PLACE_ID = re.compile(r"!19s([A-Za-z0-9_-]{10,})")
+
+# Words that don't tell two businesses apart
+STOPWORDS = {
+    "the", "and", "of", "in", "at", "near", "opp", "pvt", "ltd", "private",
+    "limited", "llp", "co", "company", "india", "road", "rd", "street", "st",
+}
+
+_SHINGLE = 4
+_PERMUTATIONS = config.DEDUP_MINHASH_PERMUTATIONS
+_SIGNATURE = struct.Struct(f"<{_PERMUTATIONS}I")
+
+
+def place_id(url: str) -> str:
+    """Stable ID of a Google Maps place URL (feature ID, place ID, or the URL without query)."""
+    if not url:
+        return ""
+    url = unquote(url)
+    match = _FEATURE_ID.search(url) or _PLACE_ID.search(url)
+    if match:
+        return match.group(1)
+    return url.split("?")[0].rstrip("/")
+
+
+def _tokens(text: str) -> list[str]:
+    """Significant words of `text` in any script (vowel signs and other marks stay in their word)."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    if text.isascii():
+        words = _WORD.findall(text)
+    else:
+        words = "".join(c if c.isalnum() or unicodedata.category(c)[0] == "M" else " " for c in text).split()
+    return [t for t in words if t not in STOPWORDS]
+
+
+def fingerprint(name: str, address: str) -> str:
+    """Order-insensitive hash of the significant name and address words."""
+    key = " ".join(sorted(set(_tokens(name)))) + "|" + " ".join(sorted(set(_tokens(address))))
+    return hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+
+
+def minhash(name: str, address: str) -> tuple[int, ...]:
+    """
+    MinHash signature of the character shingles of the normalized name + address.
+    Spaces are dropped so "Shivaji Nagar"/"Shivajinagar" and "F.C."/"FC" agree.
+    One SHAKE-128 digest per shingle supplies all the 32-bit hash functions at once.
+    """
+    text = ("".join(_tokens(name)) + "|" + "".join(_tokens(address))).encode()
+    shingles = {text[i:i + _SHINGLE] for i in range(max(1, len(text) - _SHINGLE + 1))}
+    rows = [_SIGNATURE.unpack(hashlib.shake_128(s).digest(_SIGNATURE.size)) for s in shingles]
+    return tuple(map(min, zip(*rows)))
+
+
+def _bands(signature: tuple[int, ...], city: str) -> list[int]:
+    """LSH band keys (signed 64-bit ints); leads only collide within the same city."""
+    rows = len(signature) // config.DEDUP_LSH_BANDS
+    keys = []
+    for band in range(config.DEDUP_LSH_BANDS):
+        chunk = struct.pack(f"<{rows}I", *signature[band * rows:(band + 1) * rows])
+        digest = hashlib.blake2b(f"{band}:{city}".encode() + chunk, digest_size=8).digest()
+        keys.append(struct.unpack("<q", digest)[0])
+    return keys
+
+
+class DedupIndex:
+    """SQLite-backed exact-key + MinHash LSH index of every lead already uploaded."""
+
+    def __init__(self, path: str | None = None, threshold: float | None = None, max_age_days: float | None = None):
+        self.path = path or config.DEDUP_INDEX_PATH
+        self.threshold = threshold if threshold is not None else config.DEDUP_SIMILARITY
+        self.max_age = (max_age_days if max_age_days is not None else config.DEDUP_MAX_AGE_DAYS) * DAY
+        self.duplicates: dict[str, int] = {}
+        self.added = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # timeout: supervisor workers share the same file
+        self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS leads (
+                id        INTEGER PRIMARY KEY,
+                job_id    TEXT,
+                phone     TEXT,
+                signature BLOB NOT NULL,
+                added_at  REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lead_keys (
+                key     TEXT PRIMARY KEY,
+                lead_id INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS lead_bands (
+                band    INTEGER NOT NULL,
+                lead_id INTEGER NOT NULL,
+                PRIMARY KEY (band, lead_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS leads_added_at ON leads (added_at);
+            """
+        )
+        self._db.commit()
+        self._prune()
+
+    def check(self, lead: dict) -> str | None:
+        """Return why the lead duplicates a stored one ("place", "phone", ...), or None."""
+        with self._lock:
+            return self._check(self._describe(lead))
+
+    def check_and_add(self, lead: dict, job_id: str = "") -> str | None:
+        """Like check(), but records the lead when it is new (atomic per index)."""
+        desc = self._describe(lead)
+        with self._lock:
+            reason = self._check(desc)
+            if reason:
+                self.duplicates[reason] = self.duplicates.get(reason, 0) + 1
+                return reason
+            self._add(desc, job_id)
+            return None
+
+    def add(self, lead: dict, job_id: str = ""):
+        """Record a lead (unless it matches a stored one already)."""
+        desc = self._describe(lead)
+        with self._lock:
+            if not self._check(desc):
+                self._add(desc, job_id)
+
+    def stats(self) -> dict:
+        return {"added": self.added, "duplicates": dict(self.duplicates)}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ── Internals ───────────────────────────────────────────────────────
+
+    def _describe(self, lead: dict) -> dict:
+        name = lead.get("business_name", "")
+        address = lead.get("address", "")
+        city = lead.get("city", "").lower().strip()
+        phone = lead.get("phone", "")
+        domain = cache_key(lead["website"]) if lead.get("website") else ""
+        keys = {}
+        pid = place_id(lead.get("google_maps_url", ""))
+        if pid:
+            keys["place"] = f"g:{pid}"
+        if phone:
+            keys["phone"] = f"p:{phone}"
+        if domain and not is_shared_host(domain):
+            keys["domain"] = f"d:{city}:{domain}"
+        signature: tuple[int, ...] = ()
+        bands: list[int] = []
+        # Without a name (e.g. only punctuation) the address alone would match every business in the building
+        if _tokens(name):
+            keys["print"] = f"f:{city}:{fingerprint(name, address)}"
+            signature = minhash(name, address)
+            bands = _bands(signature, city)
+        return {"phone": phone, "keys": keys, "signature": signature, "bands": bands}
+
+    def _check(self, desc: dict) -> str | None:
+        db = self._db
+        oldest = time.time() - self.max_age
+        for reason, key in desc["keys"].items():
+            row = db.execute(
+                "SELECT l.phone FROM lead_keys k JOIN leads l ON l.id = k.lead_id WHERE k.key = ? AND l.added_at >= ?",
+                (key, oldest),
+            ).fetchone()
+            if row and (reason in ("place", "phone") or not self._phones_conflict(desc["phone"], row[0])):
+                return reason
+
+        if not desc["bands"]:
+            return None
+        # Leads sharing the most bands are the likeliest matches; check only the top few
+        placeholders = ",".join("?" * len(desc["bands"]))
+        candidates = db.execute(
+            f"SELECT l.phone, l.signature FROM lead_bands b JOIN leads l ON l.id = b.lead_id"
+            f" WHERE b.band IN ({placeholders}) AND l.added_at >= ?"
+            f" GROUP BY l.id ORDER BY COUNT(*) DESC LIMIT ?",
+            (*desc["bands"], oldest, config.DEDUP_MAX_CANDIDATES),
+        ).fetchall()
+        signature = desc["signature"]
+        for phone, blob in candidates:
+            if self._phones_conflict(desc["phone"], phone):
+                continue
+            if len(blob) != _SIGNATURE.size:
+                continue  # stored with a different DEDUP_MINHASH_PERMUTATIONS
+            stored = _SIGNATURE.unpack(blob)
+            same = sum(1 for a, b in zip(signature, stored) if a == b)
+            if same / len(signature) >= self.threshold:
+                return "similar"
+        return None
+
+    @staticmethod
+    def _phones_conflict(a: str, b: str) -> bool:
+        return bool(a and b and a != b)
+
+    def _add(self, desc: dict, job_id: str):
+        db = self._db
+        signature = desc["signature"]
+        now = time.time()
+        cur = db.execute(
+            "INSERT INTO leads (job_id, phone, signature, added_at) VALUES (?, ?, ?, ?)",
+            (job_id, desc["phone"], _SIGNATURE.pack(*signature) if signature else b"", now),
+        )
+        lead_id = cur.lastrowid
+        # A key still pointing at an expired lead moves to the new one
+        db.executemany(
+            "INSERT INTO lead_keys (key, lead_id) VALUES (?, ?) ON CONFLICT (key) DO UPDATE "
+            "SET lead_id = excluded.lead_id WHERE lead_id IN (SELECT id FROM leads WHERE added_at < ?)",
+            [(key, lead_id, now - self.max_age) for key in desc["keys"].values()],
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO lead_bands (band, lead_id) VALUES (?, ?)",
+            [(band, lead_id) for band in desc["bands"]],
+        )
+        db.commit()
+        self.added += 1
+
+    def _prune(self):
+        """Drop expired leads with their keys and bands."""
+        with self._lock:
+            db = self._db
+            cur = db.execute("DELETE FROM leads WHERE added_at < ?", (time.time() - self.max_age,))
+            if cur.rowcount:
+                db.execute("DELETE FROM lead_keys WHERE lead_id NOT IN (SELECT id FROM leads)")
+                db.execute("DELETE FROM lead_bands WHERE lead_id NOT IN (SELECT id FROM leads)")
+                logger.info("Dedup index: dropped %d expired leads", cur.rowcount)
+            db.commit()
@@ -0,0 +1,78 @@
+"""
+DNS Cache — in-process host name lookups for website enrichment.
+
+Thousands of small-business domains are looked up per day and many of
+them no longer exist. Resolving each host once (with a short timeout)
+lets a dead domain fail in milliseconds instead of costing a connection
+attempt per page, and gives the enricher the IP address behind a host so
+sites on the same shared server can be rate-limited together.
+
+The cached addresses are only used for those two decisions: the HTTP
+session still resolves the host itself when it connects (normally served
+from the OS resolver's cache right after this lookup).
+
+Answers are kept for DNS_CACHE_TTL seconds, names that don't resolve for
+DNS_NEGATIVE_TTL seconds.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+
+import agent_config as config
+
+logger = logging.getLogger(__name__)
+
+
+class DnsCache:
+    """Host → IP addresses, with negative entries for names that don't resolve."""
+
+    def __init__(self, ttl: float | None = None, negative_ttl: float | None = None, timeout: float | None = None):
+        self.ttl = ttl if ttl is not None else config.DNS_CACHE_TTL
+        self.negative_ttl = negative_ttl if negative_ttl is not None else config.DNS_NEGATIVE_TTL
+        self.timeout = timeout or config.DNS_TIMEOUT
+        self.max_entries = config.DNS_CACHE_MAX_ENTRIES
+
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self._entries: dict[str, tuple[list[str], float]] = {}  # host -> (addresses, expires at)
+
+    async def resolve(self, host: str, port: int = 443) -> list[str]:
+        """The host's IP addresses; empty if it doesn't resolve (or takes longer than the timeout)."""
+        host = host.lower().rstrip(".")
+        entry = self._entries.get(host)
+        if entry and entry[1] > time.monotonic():
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        addresses = await self._lookup(host, port)
+        ttl = self.ttl if addresses else self.negative_ttl
+        if len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]  # oldest first
+        self._entries.pop(host, None)
+        self._entries[host] = (addresses, time.monotonic() + ttl)
+        return addresses
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "failures": self.failures,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    async def _lookup(self, host: str, port: int) -> list[str]:
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), self.timeout
+            )
+        except (socket.gaierror, UnicodeError, asyncio.TimeoutError) as e:
+            self.failures += 1
+            logger.debug("DNS lookup failed for %s: %s", host, e or "timeout")
+            return []
+        return list(dict.fromkeys(info[4][0] for info in infos))
@@ -0,0 +1,158 @@
+"""
+Email Cache — persistent per-domain results of website email lookups.
+
+The same chains and franchises show up in job after job, so the result of
+looking up a website (including "no email found") is kept in a small
+SQLite database keyed by normalized domain. Entries expire after a TTL
+and the least recently used ones are evicted once the cache is full.
+
+Websites on SHARED_HOSTS or their subdomains (facebook.com/<page>,
+<user>.wixsite.com/<site>, ...) belong to many unrelated businesses, so
+they are never cached. Lookups block on SQLite, so async callers run them
+in a worker thread.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import agent_config as config
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+# Many unrelated businesses "have" these websites (a page or profile on the host)
+SHARED_HOSTS = {
+    "facebook.com", "instagram.com", "linktr.ee", "wa.me", "whatsapp.com",
+    "business.site", "google.com", "youtube.com", "twitter.com", "x.com",
+    "linkedin.com", "justdial.com", "indiamart.com", "wixsite.com",
+}
+
+
+def is_shared_host(domain: str) -> bool:
+    """Whether a cache_key() domain is one of the SHARED_HOSTS or a subdomain of one."""
+    return any(domain == h or domain.endswith("." + h) for h in SHARED_HOSTS)
+
+
+def cache_key(website: str) -> str:
+    """Normalize a website URL to its bare domain, e.g. 'https://www.Foo.in/x' → 'foo.in'."""
+    url = website.strip()
+    if "://" not in url:
+        url = "https://" + url
+    host = (urlsplit(url).hostname or "").lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+class EmailCache:
+    """SQLite-backed domain → email cache with TTL expiry and LRU eviction."""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl_days: float | None = None,
+        negative_ttl_days: float | None = None,
+        max_entries: int | None = None,
+    ):
+        self.path = path or config.EMAIL_CACHE_PATH
+        self.ttl = (ttl_days if ttl_days is not None else config.EMAIL_CACHE_TTL_DAYS) * DAY
+        self.negative_ttl = (
+            negative_ttl_days if negative_ttl_days is not None else config.EMAIL_CACHE_NEGATIVE_TTL_DAYS
+        ) * DAY
+        self.max_entries = max_entries or config.EMAIL_CACHE_MAX_ENTRIES
+
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # timeout: supervisor workers share the same file
+        self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS email_cache (
+                domain     TEXT PRIMARY KEY,
+                email      TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_used  REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_email_cache_last_used ON email_cache(last_used)")
+        self._db.commit()
+        self._evict()
+
+    def get(self, domain: str) -> str | None:
+        """
+        Return the cached email for a domain — "" for a cached negative
+        result — or None on a miss / expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT email, fetched_at FROM email_cache WHERE domain = ?", (domain,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            email, fetched_at = row
+            ttl = self.ttl if email else self.negative_ttl
+            if now - fetched_at > ttl:
+                self._db.execute("DELETE FROM email_cache WHERE domain = ?", (domain,))
+                self._db.commit()
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE email_cache SET last_used = ? WHERE domain = ?", (now, domain))
+            self._db.commit()
+            self.hits += 1
+            return email
+
+    def put(self, domain: str, email: str):
+        """Store a lookup result ("" records that the site has no email)."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO email_cache (domain, email, fetched_at, last_used) VALUES (?, ?, ?, ?)",
+                (domain, email, now, now),
+            )
+            self._db.commit()
+            self._puts += 1
+            evict = self._puts % 100 == 0
+        if evict:
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently used entries beyond max_entries."""
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM email_cache").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM email_cache WHERE domain IN "
+                    "(SELECT domain FROM email_cache ORDER BY last_used ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._db.commit()
+                logger.info("Email cache: evicted %d least recently used entries", excess)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,421 @@
+"""
+Website Enrichment — async email discovery for business websites.
+
+Each website is crawled on a budget: the homepage first, then the site's
+own contact/about links (falling back to the guesses in config.EMAIL_PAGES
+when it has none), stopping as soon as a high-confidence email turns up.
+Responses are streamed and cut off at ENRICH_MAX_PAGE_BYTES, pages are
+scanned with regexes only (no HTML parse), and every site is bounded by
+ENRICH_MAX_PAGES, ENRICH_SITE_BYTE_BUDGET and ENRICH_SITE_TIME_BUDGET.
+
+All fetches go through one shared, pooled HTTP session. Blocking fetches
+run on a bounded thread pool so the event loop — and the browser — keep
+working while slow websites respond; per-host and per-server (IP) limits
+keep one slow host from tying up the pool. Before a site is crawled its
+host is looked up in a DnsCache, so dead domains fail without a connection
+attempt (connections themselves still resolve through the system
+resolver), and sites that time out or can't be crawled are skipped for a
+while. Only definitive results (an email, or a crawl that found none) go
+into the persistent email cache.
+"""
+
+import asyncio
+import html
+import logging
+import re
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urljoin, urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+# Suppress SSL warnings from business website checks (we use verify=False intentionally)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+import agent_config as config
+import metrics
+from dns_cache import DnsCache
+from email_cache import EmailCache, cache_key, is_shared_host
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}")
+MAILTO_PATTERN = re.compile(r"""href\s*=\s*["']?\s*mailto:([^"'?>\s]+)""", re.IGNORECASE)
+LINK_PATTERN = re.compile(
+    r"""<a\s[^>]*?href\s*=\s*["']([^"'#]+)["'][^>]*>(.{0,300}?)</a""", re.IGNORECASE | re.DOTALL
+)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# Links worth following, best first (matched against the link's URL and text)
+CONTACT_LINK_WORDS = [
+    re.compile(r"contact|get[\s_-]?in[\s_-]?touch|reach[\s_-]?us|enquir|inquir", re.IGNORECASE),
+    re.compile(r"about|impressum|imprint", re.IGNORECASE),
+]
+SKIPPED_LINK_SUFFIXES = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".zip", ".mp4", ".doc", ".docx")
+
+# Emails to exclude (generic/system emails)
+EXCLUDED_EMAIL_DOMAINS = {
+    "example.com", "sentry.io", "wixpress.com", "wordpress.com",
+    "w3.org", "schema.org", "google.com", "facebook.com",
+    "cloudflare.com", "googleapis.com",
+}
+
+# Confidence of an email found on a site: in a mailto: link or on the site's own domain...
+HIGH_CONFIDENCE = 2
+# ...or merely mentioned in the page text
+LOW_CONFIDENCE = 1
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def normalize_website(url: str) -> str:
+    """Return the website as an absolute base URL without a trailing slash."""
+    url = url.strip()
+    if not url.startswith("http"):
+        url = "https://" + url
+    return url.rstrip("/")
+
+
+def _excluded(email: str) -> bool:
+    domain = email.split("@")[1].lower()
+    return any(ex in domain for ex in EXCLUDED_EMAIL_DOMAINS)
+
+
+def extract_emails(page: str, site_domain: str = "") -> dict[str, int]:
+    """
+    Find all non-generic email addresses in a page (text and mailto: links),
+    with their confidence (HIGH_CONFIDENCE for mailto: links and addresses
+    on `site_domain`, LOW_CONFIDENCE otherwise).
+    """
+    emails: dict[str, int] = {}
+
+    # Addresses are often written with entities (info&#64;foo.in) to dodge harvesters
+    text = html.unescape(page) if "&#" in page or "&commat;" in page else page
+    for email in EMAIL_PATTERN.findall(text):
+        email = email.lower()
+        if not _excluded(email):
+            domain = email.split("@")[1]
+            own = site_domain and (domain == site_domain or domain.endswith("." + site_domain))
+            emails[email] = HIGH_CONFIDENCE if own else max(emails.get(email, 0), LOW_CONFIDENCE)
+
+    for target in MAILTO_PATTERN.findall(page):
+        email = unquote(html.unescape(target)).strip().lower()
+        if EMAIL_PATTERN.fullmatch(email) and not _excluded(email):
+            emails[email] = HIGH_CONFIDENCE
+
+    return emails
+
+
+def contact_links(page: str, page_url: str) -> list[str]:
+    """Same-site links that look like contact (then about) pages, best first."""
+    site = cache_key(page_url)
+    ranked: dict[str, int] = {}
+    for href, text in LINK_PATTERN.findall(page):
+        href = html.unescape(href).strip()
+        if href.lower().startswith(("mailto:", "tel:", "javascript:")):
+            continue
+        url = urljoin(page_url, href).split("#")[0]
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or cache_key(url) != site:
+            continue
+        if parts.path.lower().endswith(SKIPPED_LINK_SUFFIXES) or parts.path.rstrip("/") in ("", "/"):
+            continue
+        label = f"{parts.path} {TAG_PATTERN.sub(' ', text)}"
+        for rank, words in enumerate(CONTACT_LINK_WORDS):
+            if words.search(label):
+                ranked[url] = min(ranked.get(url, rank), rank)
+                break
+    return sorted(ranked, key=ranked.get)
+
+
+def pick_email(emails: dict[str, int]) -> str:
+    """Return the most confident email (alphabetically first on ties), or empty string."""
+    if emails:
+        return min(emails, key=lambda email: (-emails[email], email))
+    return ""
+
+
+class SiteCost:
+    """What discovering the email of one website cost."""
+
+    def __init__(self):
+        self.pages = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+        self.deadline = self.started + config.ENRICH_SITE_TIME_BUDGET
+        # "found", "exhausted" (nothing left to try), "budget", or why the site was given up on:
+        # "unreachable", "unresolvable", "timeout" or "dead" (failed recently, not tried)
+        self.stop = "exhausted"
+
+    @property
+    def seconds(self) -> float:
+        return time.monotonic() - self.started
+
+    def over_budget(self) -> bool:
+        return (
+            self.pages >= config.ENRICH_MAX_PAGES
+            or self.bytes >= config.ENRICH_SITE_BYTE_BUDGET
+            or self.seconds >= config.ENRICH_SITE_TIME_BUDGET
+        )
+
+
+class EmailEnricher:
+    """
+    Finds email addresses on business websites.
+
+    All fetches share one keep-alive connection pool. At most
+    `max_inflight` fetches run at once across all websites, at most
+    `per_host` of them against the same host and ENRICH_PER_IP_LIMIT
+    against the same server. Results are kept in an
+    EmailCache (unless config.EMAIL_CACHE_PATH is empty), so known domains
+    cost no HTTP traffic at all.
+    """
+
+    def __init__(
+        self,
+        max_inflight: int | None = None,
+        per_host: int | None = None,
+        cache: EmailCache | None = None,
+    ):
+        self.max_inflight = max_inflight or config.ENRICH_MAX_INFLIGHT
+        self.per_host = per_host or config.ENRICH_PER_HOST_LIMIT
+        if cache is None and config.EMAIL_CACHE_PATH:
+            try:
+                cache = EmailCache()
+            except Exception as e:
+                logger.warning("Email cache unavailable, continuing without it: %s", e)
+        self.cache = cache
+
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=self.max_inflight, pool_maxsize=self.per_host)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_inflight, thread_name_prefix="enrich"
+        )
+        self._inflight = asyncio.Semaphore(self.max_inflight)
+        # A semaphore lives only while a fetch holds or waits for it: an idle one has nothing to remember
+        self._host_limits: weakref.WeakValueDictionary[str, asyncio.Semaphore] = weakref.WeakValueDictionary()
+        self._server_limits: weakref.WeakValueDictionary[str, asyncio.Semaphore] = (
+            weakref.WeakValueDictionary()  # per IP: many small sites share a server
+        )
+        self.dns = DnsCache()
+        self._dead_sites: dict[str, float] = {}  # site -> skipped until (monotonic), after a failed lookup
+
+        # Crawl cost across all websites looked up (see crawl_stats)
+        self.crawl = {
+            "sites": 0, "pages": 0, "bytes": 0, "seconds": 0.0,
+            "found": 0, "exhausted": 0, "budget": 0,
+            "unreachable": 0, "unresolvable": 0, "timeout": 0, "dead": 0,
+        }
+
+    async def find_email(self, website: str) -> str:
+        """
+        Visit the business website and try to find an email address: the
+        homepage, then its contact/about links (or the config.EMAIL_PAGES
+        guesses), up to `per_host` pages at a time, until an email on the
+        site's own domain or in a mailto: link is found or the budget runs out.
+        Hosts that don't resolve fail at once; sites that time out, don't
+        answer or run out of budget are skipped for ENRICH_DEAD_SITE_TTL
+        seconds instead of being cached as having no email.
+        """
+        base_url = normalize_website(website)
+        host = (urlsplit(base_url).hostname or "").lower()
+        if not host:
+            return ""
+
+        domain = cache_key(base_url)
+        # A page on a shared host (facebook.com/<page>, ...) says nothing about the host's other pages
+        cache = None if is_shared_host(domain) else self.cache
+        if cache:
+            # SQLite I/O: off the event loop, and not queued behind slow fetches on self._executor
+            cached = await asyncio.to_thread(cache.get, domain)
+            if cached is not None:
+                return cached
+
+        cost = SiteCost()
+        found: dict[str, int] = {}
+        site = domain if cache else base_url
+        if self._dead_sites.get(site, 0) > time.monotonic():
+            cost.stop = "dead"
+        else:
+            server = await self._server(host, base_url)
+            if server is None:
+                cost.stop = "unresolvable"
+            else:
+                await self._crawl(base_url, host, server, cost, found)
+
+        email = pick_email(found)
+        self._record(cost)
+        logger.debug(
+            "Email lookup for %s: %s (%d pages, %d bytes, %.1fs, stopped: %s)",
+            domain, email or "none", cost.pages, cost.bytes, cost.seconds, cost.stop,
+        )
+        if email or cost.stop == "exhausted":
+            if cache:
+                await asyncio.to_thread(cache.put, domain, email)
+        elif cost.stop in ("unreachable", "timeout", "budget"):
+            # Possibly temporary: remembered for a while, not as "no email" in the (long-lived) cache
+            self._mark_dead(site)
+        return email
+
+    async def _crawl(self, base_url: str, host: str, server: str, cost: SiteCost, found: dict[str, int]):
+        """Fetch the site's pages wave by wave, collecting emails into `found` until done or over budget."""
+        domain = cache_key(base_url)
+        links: list[str] = []
+        guesses: list[str] | None = None
+        seen: set[str] = set()
+        wave = [base_url]  # the homepage alone first: it tells us where the contact page is
+
+        while wave:
+            seen.update(url.rstrip("/") for url in wave)
+            pages = await asyncio.gather(*(self._fetch_page(host, server, url, cost) for url in wave))
+            if cost.stop in ("timeout", "budget"):
+                return  # a fetch timed out: the remaining pages would most likely time out too
+            if guesses is None:
+                if pages[0] is None:
+                    cost.stop = "unreachable"  # no point guessing paths on a site that doesn't answer
+                    return
+                # Guess paths on the origin the homepage ended up on (e.g. after a redirect to www.)
+                final = urlsplit(pages[0][0])
+                guesses = [f"{final.scheme}://{final.netloc}{path}" for path in config.EMAIL_PAGES if path != "/"]
+            for page_url, page in filter(None, pages):
+                for email, confidence in extract_emails(page, domain).items():
+                    found[email] = max(found.get(email, 0), confidence)
+                links += [url for url in contact_links(page, page_url) if url.rstrip("/") not in seen]
+            if links:
+                guesses = []  # the site links its contact page, so don't guess paths
+
+            if found and max(found.values()) >= HIGH_CONFIDENCE:
+                cost.stop = "found"
+                return
+            if cost.over_budget():
+                cost.stop = "budget"
+                return
+            # The site's own contact links before guessed paths
+            candidates = links or guesses
+            room = min(self.per_host, config.ENRICH_MAX_PAGES - cost.pages)
+            wave = []
+            while candidates and len(wave) < room:
+                url = candidates.pop(0)
+                if url.rstrip("/") not in seen and url not in wave:
+                    wave.append(url)
+
+    async def _server(self, host: str, url: str) -> str | None:
+        """
+        Key for the per-server limit: the host's first IP address, or None
+        if the host doesn't resolve. Behind an HTTP proxy (which resolves
+        names itself) it is the host name.
+        """
+        if requests.utils.get_environ_proxies(url):
+            return host
+        addresses = await self.dns.resolve(host)
+        return addresses[0] if addresses else None
+
+    def _mark_dead(self, site: str):
+        now = time.monotonic()
+        if len(self._dead_sites) >= 1000:
+            self._dead_sites = {s: until for s, until in self._dead_sites.items() if until > now}
+        self._dead_sites[site] = now + config.ENRICH_DEAD_SITE_TTL
+
+    def stats(self) -> dict:
+        """Cache hit/miss counters (empty without a cache)."""
+        return self.cache.stats() if self.cache else {}
+
+    def crawl_stats(self) -> dict:
+        """Pages, bytes and seconds spent per crawled website, and why crawls stopped."""
+        sites = self.crawl["sites"]
+        return {
+            **self.crawl,
+            "seconds": round(self.crawl["seconds"], 1),
+            "pages_per_site": round(self.crawl["pages"] / sites, 2) if sites else 0.0,
+            "bytes_per_site": self.crawl["bytes"] // sites if sites else 0,
+        }
+
+    def _record(self, cost: SiteCost):
+        self.crawl["sites"] += 1
+        self.crawl["pages"] += cost.pages
+        self.crawl["bytes"] += cost.bytes
+        self.crawl["seconds"] += cost.seconds
+        self.crawl[cost.stop] += 1
+        metrics.count("website_pages", cost.pages)
+        metrics.count("website_bytes", cost.bytes)
+        if cost.stop in ("unreachable", "unresolvable", "timeout", "dead"):
+            metrics.count("website_failures", reason=cost.stop)
+
+    async def _fetch_page(self, host: str, server: str, url: str, cost: SiteCost) -> tuple[str, str] | None:
+        """
+        Fetch one page within the per-host, per-server and global limits,
+        and within what is left of the site's time budget. Returns (final
+        URL, HTML) — empty HTML for error statuses — or None if the request
+        failed outright (a timeout also sets cost.stop).
+        """
+        host_limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+        server_limit = self._server_limits.setdefault(server, asyncio.Semaphore(config.ENRICH_PER_IP_LIMIT))
+        # Wait for the host's own slots first, so a slow host never holds on to global ones
+        async with host_limit, server_limit, self._inflight:
+            limit = min(config.ENRICH_MAX_PAGE_BYTES, max(config.ENRICH_SITE_BYTE_BUDGET - cost.bytes, 0))
+            if not limit or time.monotonic() >= cost.deadline:
+                return url, ""
+            loop = asyncio.get_running_loop()
+            cost.pages += 1
+            # The slot is held until the fetch thread is done, so the limits bound real connections
+            try:
+                final_url, page, nbytes = await loop.run_in_executor(
+                    self._executor, self._get_page, url, limit, cost.deadline
+                )
+            except requests.exceptions.Timeout as e:
+                logger.debug("Email fetch timed out for %s: %s", url, e)
+                # Cut short by the site's time budget, or the site itself didn't answer in time
+                cost.stop = "budget" if time.monotonic() >= cost.deadline else "timeout"
+                return None
+            except Exception as e:
+                logger.debug("Email fetch failed for %s: %s", url, e)
+                return None
+            cost.bytes += nbytes
+            return final_url, page
+
+    def _get_page(self, url: str, limit: int, deadline: float) -> tuple[str, str, int]:
+        """
+        Blocking streamed fetch of at most `limit` bytes, read until the
+        `deadline` (time.monotonic()) at the latest; runs on the enrichment
+        thread pool.
+        """
+        remaining = max(deadline - time.monotonic(), 0.1)
+        with self._session.get(
+            url,
+            timeout=(min(config.ENRICH_CONNECT_TIMEOUT, remaining), min(config.REQUEST_TIMEOUT, remaining)),
+            allow_redirects=True,
+            verify=False,
+            stream=True,
+        ) as resp:
+            content_type = resp.headers.get("Content-Type", "").lower()
+            if resp.status_code != 200 or (content_type and "html" not in content_type and "text" not in content_type):
+                return resp.url, "", 0
+            chunks = []
+            size = 0
+            # read1() returns whatever has arrived, so a site trickling bytes can't outlast the deadline
+            while size < limit and time.monotonic() < deadline:
+                chunk = resp.raw.read1(16 * 1024, decode_content=True)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+            body = b"".join(chunks)[:limit]
+            encoding = resp.encoding if "charset" in content_type else "utf-8"
+            return resp.url, body.decode(encoding or "utf-8", errors="replace"), size
+
+    def close(self):
+        """Release pooled connections and worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+        if self.cache:
+            self.cache.close()
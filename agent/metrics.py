@@ -0,0 +1,349 @@
+"""
+Metrics — phase timings, counters and gauges for the agent.
+
+Instrumented code records into module-level metrics:
+
+    with metrics.timed("validate"):      # histogram of phase durations
+        ...
+    @metrics.timed("scroll")             # ... or time every call of a (sync or async) function
+    metrics.count("listings")            # event counter
+    metrics.QUEUE_DEPTH.track(owner, queue.qsize, queue="enrich")  # gauge, read when scraped
+
+Everything recorded while a job runs is also tallied in that job's
+JobMetrics (found through a context variable, so concurrent jobs and the
+tasks/threads they start keep separate totals), which execute_job logs as
+a per-job "where did the time go" summary.
+
+With METRICS_PORT set, MetricsServer serves all metrics in the Prometheus
+text format on http://127.0.0.1:<port>/metrics.
+"""
+
+import contextvars
+import functools
+import inspect
+import logging
+import math
+import threading
+import time
+from contextlib import ContextDecorator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "leadgen_"
+
+# Phase durations range from a few milliseconds (validation) to minutes (scrolling)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = PREFIX + name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, optionally per label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {} if self.labelnames else {(): 0}
+
+    def inc(self, n: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + n
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(v)}" for key, v in items]
+
+
+class Gauge(_Metric):
+    """
+    Current value, set directly or computed when scraped: every source
+    added with track(owner, fn) contributes fn() (e.g. a queue's qsize)
+    until its owner is untracked.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {} if self.labelnames else {(): 0}
+        self._sources: dict[tuple, dict[object, object]] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def track(self, owner, fn, **labels):
+        with self._lock:
+            self._sources.setdefault(self._key(labels), {})[owner] = fn
+
+    def untrack(self, owner):
+        with self._lock:
+            for sources in self._sources.values():
+                sources.pop(owner, None)
+
+    def value(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            fns = list(self._sources.get(key, {}).values())
+            value = self._values.get(key, 0)
+        for fn in fns:
+            try:
+                value += fn()
+            except Exception:
+                pass  # source already gone
+        return value
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            keys = sorted(set(self._values) | set(self._sources))
+        return [
+            f"{self.name}{_labels(self.labelnames, key)} {_number(self.value(**dict(zip(self.labelnames, key))))}"
+            for key in keys
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (cumulative buckets, sum and count)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple, list] = {}  # key -> [bucket counts, sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(counts), total, n) for key, (counts, total, n) in self._series.items())
+        lines = []
+        for key, counts, total, n in items:
+            cumulative = 0
+            for bound, hits in zip(self.buckets, counts):
+                cumulative += hits
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(round(total, 6))}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+# ─── Agent Metrics ───────────────────────────────────────────────────────────
+
+PHASE_SECONDS = Histogram("phase_seconds", "Time spent in each phase of scraping and uploading", ("phase",))
+EVENTS = {
+    "listings": Counter("listings_total", "Listings extracted from Google Maps"),
+    "leads": Counter("leads_total", "Leads that passed validation"),
+    "duplicates": Counter(
+        "duplicates_total", "Leads dropped as duplicates (job: seen earlier in the job, index: in the dedup index)",
+        ("scope",),
+    ),
+    "unnamed": Counter("unnamed_total", "Leads dropped for having no business name"),
+    "email_hits": Counter("email_hits_total", "Website lookups that found an email"),
+    "email_misses": Counter("email_misses_total", "Website lookups without an email"),
+    "website_pages": Counter("website_pages_total", "Business website pages fetched for email discovery"),
+    "website_bytes": Counter("website_bytes_total", "Bytes read from business websites (after decompression)"),
+    "website_failures": Counter(
+        "website_failures_total", "Website lookups given up on (unreachable, unresolvable, timeout, dead)", ("reason",)
+    ),
+    "uploaded": Counter("uploaded_total", "Leads accepted by the API"),
+    "spooled": Counter("spooled_total", "Leads saved to the upload spool"),
+    "retries": Counter("retries_total", "Retried operations (upload, navigation)", ("op",)),
+    "browser_restarts": Counter("browser_restarts_total", "Browser restarts after a crash"),
+}
+QUEUE_DEPTH = Gauge("queue_depth", "Leads waiting in each queue, across running jobs", ("queue",))
+JOBS_RUNNING = Gauge("jobs_running", "Jobs currently running")
+
+ALL = [PHASE_SECONDS, *EVENTS.values(), QUEUE_DEPTH, JOBS_RUNNING]
+
+
+class JobMetrics:
+    """Phase times and event counts of a single job."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.phases: dict[str, list] = {}  # phase -> [count, total seconds, max seconds]
+        self.events: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_phase(self, phase: str, seconds: float):
+        with self._lock:
+            entry = self.phases.setdefault(phase, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def add_event(self, event: str, n: float):
+        with self._lock:
+            self.events[event] = self.events.get(event, 0) + n
+
+    def phase_seconds(self) -> dict[str, float]:
+        with self._lock:
+            return {phase: round(total, 2) for phase, (_, total, _) in self.phases.items()}
+
+    def summary(self) -> str:
+        """e.g. 'extract 40.1s (52×, max 2.1s) · scroll 12.3s (1×) | leads 48, listings 52'"""
+        with self._lock:
+            phases = sorted(self.phases.items(), key=lambda item: -item[1][1])
+            events = sorted(self.events.items())
+        timing = " · ".join(
+            f"{phase} {total:.1f}s ({count}×" + (f", max {peak:.1f}s)" if count > 1 else ")")
+            for phase, (count, total, peak) in phases
+        )
+        counts = ", ".join(f"{event} {_number(n)}" for event, n in events)
+        return f"{timing or 'no phases'} | {counts or 'no events'}"
+
+
+_current_job: contextvars.ContextVar[JobMetrics | None] = contextvars.ContextVar("job_metrics", default=None)
+
+
+def start_job(job_id: str) -> tuple[JobMetrics, contextvars.Token]:
+    """Start tallying a job in the current context (tasks and threads started from it inherit it)."""
+    job = JobMetrics(job_id)
+    return job, _current_job.set(job)
+
+
+def end_job(token: contextvars.Token):
+    _current_job.reset(token)
+
+
+def observe(phase: str, seconds: float):
+    """Record one duration of `phase`."""
+    PHASE_SECONDS.observe(seconds, phase=phase)
+    job = _current_job.get()
+    if job:
+        job.add_phase(phase, seconds)
+
+
+def count(event: str, n: float = 1, **labels):
+    """Increment one of EVENTS (and the current job's tally)."""
+    EVENTS[event].inc(n, **labels)
+    job = _current_job.get()
+    if job:
+        job.add_event(":".join([event, *map(str, labels.values())]), n)
+
+
+class timed(ContextDecorator):
+    """
+    Time a block as one `phase` observation. Also works as a decorator of
+    sync and async functions (every call is timed separately).
+    """
+
+    def __init__(self, phase: str):
+        self.phase = phase
+        self._started = 0.0
+
+    def _recreate_cm(self):
+        return timed(self.phase)
+
+    def __call__(self, func):
+        if not inspect.iscoroutinefunction(func):
+            return super().__call__(func)
+
+        @functools.wraps(func)
+        async def inner(*args, **kwargs):
+            with self._recreate_cm():
+                return await func(*args, **kwargs)
+
+        return inner
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.phase, time.perf_counter() - self._started)
+        return False
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return "\n".join(line for metric in ALL for line in metric.render()) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """Serves /metrics from a background thread (on localhost only, by default)."""
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        self._httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        threading.Thread(target=self._httpd.serve_forever, daemon=True, name="metrics").start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
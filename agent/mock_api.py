@@ -0,0 +1,256 @@
+"""
+Mock LeadGen API — a local stand-in for the /api/agent/* endpoints.
+
+Keeps jobs and leads in memory so the agent (or a fleet of supervisor
+workers) can be exercised without the SaaS backend or Supabase.
+
+Usage:
+    python mock_api.py --job "gym:delhi" --job "bar:jaipur"
+    set LEADGEN_API_URL=http://127.0.0.1:3000 and run the agent against it
+"""
+
+import argparse
+import gzip
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class MockStore:
+    """In-memory jobs/leads tables with the same semantics as the real routes."""
+
+    def __init__(self, api_key: str = ""):
+        self.api_key = api_key
+        self.jobs: dict[str, dict] = {}
+        self.leads: list[dict] = []
+        self.requests: dict[str, int] = {}
+        self.bytes_received = 0  # request bodies, as sent (i.e. compressed if gzipped)
+        self.claims: dict[str, int] = {}  # job_id -> times handed out by /claim
+        self._lock = threading.Lock()
+
+    def add_job(self, category: str, city: str, platform: str = "google_maps") -> dict:
+        with self._lock:
+            job = {
+                "id": str(uuid.uuid4()),
+                "platform": platform,
+                "city": city,
+                "category": category,
+                "status": "pending",
+                "leads_found": 0,
+                "checkpoint": None,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "completed_at": None,
+            }
+            self.jobs[job["id"]] = job
+            return job
+
+    def active_jobs(self) -> list[dict]:
+        with self._lock:
+            jobs = [dict(j) for j in self.jobs.values() if j["status"] in ("pending", "running")]
+        return sorted(jobs, key=lambda j: j["created_at"])
+
+    def claim(self) -> dict | None:
+        with self._lock:
+            pending = sorted(
+                (j for j in self.jobs.values() if j["status"] == "pending"),
+                key=lambda j: j["created_at"],
+            )
+            if not pending:
+                return None
+            job = pending[0]
+            job["status"] = "running"
+            self.claims[job["id"]] = self.claims.get(job["id"], 0) + 1
+            return dict(job)
+
+    def update(
+        self, job_id: str, status: str, leads_found: int | None = None, checkpoint: dict | None = None
+    ) -> dict | None:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return None
+            job["status"] = status
+            if leads_found is not None:
+                job["leads_found"] = leads_found
+            if checkpoint is not None:
+                job["checkpoint"] = checkpoint
+            if status in ("completed", "stopped"):
+                job["completed_at"] = datetime.now(timezone.utc).isoformat()
+            return dict(job)
+
+    def insert_leads(self, job_id: str, leads: list[dict]) -> int:
+        with self._lock:
+            for lead in leads:
+                self.leads.append({**lead, "job_id": job_id})
+            if job_id in self.jobs:
+                self.jobs[job_id]["leads_found"] += len(leads)
+            return len(leads)
+
+    def count_request(self, key: str):
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def count_bytes(self, n: int):
+        with self._lock:
+            self.bytes_received += n
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    """Routes /api/agent/* requests to the server's MockStore."""
+
+    server_version = "MockLeadGen/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real backend
+
+    @property
+    def store(self) -> MockStore:
+        return self.server.store
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet
+
+    # ── Helpers ──────────────────────────────────────────────────────────
+
+    def _send(self, status: int, data: dict):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        self.store.count_bytes(len(raw))
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return json.loads(raw or b"{}")
+
+    def _authorized(self) -> bool:
+        auth = self.headers.get("Authorization", "")
+        if not auth.startswith("Bearer "):
+            self._send(401, {"error": "Missing or invalid Authorization header"})
+            return False
+        if self.store.api_key and auth[7:] != self.store.api_key:
+            self._send(401, {"error": "Invalid API key"})
+            return False
+        return True
+
+    def _route(self, method: str):
+        path = urlsplit(self.path).path.rstrip("/")
+        self.store.count_request(f"{method} {path}")
+        if not self._authorized():
+            return
+
+        if path == "/api/agent/verify" and method == "GET":
+            self._send(200, {"user": {"name": "Mock Agent", "plan": "pro", "leads_count": len(self.store.leads)}})
+
+        elif path == "/api/agent/jobs" and method == "GET":
+            job_id = parse_qs(urlsplit(self.path).query).get("id", [""])[0]
+            if job_id:
+                job = self.store.jobs.get(job_id)
+                if not job:
+                    return self._send(404, {"error": "Job not found"})
+                return self._send(200, {"job": {k: job[k] for k in ("id", "status", "leads_found")}})
+            self._send(200, {"jobs": self.store.active_jobs()})
+
+        elif path == "/api/agent/jobs" and method == "POST":
+            body = self._read_json()
+            if not all(body.get(k) for k in ("platform", "city", "category")):
+                return self._send(400, {"error": "Missing required fields: platform, city, category"})
+            self._send(201, {"job": self.store.add_job(body["category"], body["city"], body["platform"])})
+
+        elif path == "/api/agent/jobs" and method == "PATCH":
+            body = self._read_json()
+            if not body.get("job_id") or not body.get("status"):
+                return self._send(400, {"error": "Missing required fields: job_id, status"})
+            job = self.store.update(body["job_id"], body["status"], body.get("leads_found"), body.get("checkpoint"))
+            if not job:
+                return self._send(500, {"error": "Job not found"})
+            self._send(200, {"job": job})
+
+        elif path == "/api/agent/jobs/claim" and method == "POST":
+            self._send(200, {"job": self.store.claim()})
+
+        elif path == "/api/agent/leads" and method == "POST":
+            body = self._read_json()
+            leads = body.get("leads")
+            if not body.get("job_id") or not isinstance(leads, list) or not leads:
+                return self._send(400, {"error": "Missing required fields: job_id, leads (array)"})
+            inserted = self.store.insert_leads(body["job_id"], leads)
+            self._send(201, {"inserted": inserted, "message": f"{inserted} leads uploaded successfully"})
+
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PATCH(self):
+        self._route("PATCH")
+
+
+class MockLeadGenServer:
+    """Runs the mock API on a background thread (port 0 picks a free port)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, api_key: str = ""):
+        self.store = MockStore(api_key)
+        self._httpd = ThreadingHTTPServer((host, port), MockAPIHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.store = self.store
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLeadGenServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the LeadGen /api/agent/* endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--api-key", default="", help="Only accept this API key (default: any)")
+    parser.add_argument(
+        "--job", action="append", default=[], metavar="CATEGORY:CITY",
+        help="Create a pending job on startup (repeatable)",
+    )
+    args = parser.parse_args()
+
+    server = MockLeadGenServer(args.host, args.port, args.api_key).start()
+    for spec in args.job:
+        category, _, city = spec.partition(":")
+        server.store.add_job(category.strip(), city.strip())
+
+    print(f"🧪 Mock LeadGen API on {server.url} ({len(args.job)} pending jobs) — Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print("\n📋 Jobs:")
+        for job in server.store.jobs.values():
+            claims = server.store.claims.get(job["id"], 0)
+            print(f"   {job['category']} in {job['city']}: {job['status']}, {job['leads_found']} leads, claimed {claims}x")
+
+
+if __name__ == "__main__":
+    main()
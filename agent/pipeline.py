@@ -0,0 +1,162 @@
+"""
+Lead Pipeline — concurrent stages for a single scraping job.
+
+    Maps extraction → website/email enrichment → validation/dedup → upload
+
+Stages are connected by bounded asyncio queues. Each stage has its own
+worker count; a full queue makes the upstream stage wait (backpressure),
+so the browser only pauses when downstream stages are saturated — never
+because an upload or a website fetch is in progress.
+"""
+
+import asyncio
+import logging
+import time
+
+import agent_config as config
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Sentinel pushed through the queues when an upstream stage has finished
+_DONE = object()
+
+
+class JobStopped(Exception):
+    """Raised when the user stops a job while its pipeline is running."""
+
+
+class StageStats:
+    """Queue depth and throughput counters for one pipeline stage."""
+
+    def __init__(self, name: str, workers: int, queue: asyncio.Queue | None):
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.processed = 0
+        self.emitted = 0
+        self.started_at = time.monotonic()
+        self.finished_at: float | None = None
+
+    def snapshot(self) -> dict:
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "queue_size": self.queue.maxsize if self.queue else 0,
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "per_sec": round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+class LeadPipeline:
+    """
+    Runs one job's leads through the scrape → enrich → validate → upload stages.
+
+    source:   async iterator of raw leads (the Maps extraction stage)
+    enrich:   async fn(lead) -> lead, e.g. GoogleMapsScraper.enrich_lead
+    validate: fn(lead) -> clean lead, or None to drop it
+    upload:   async fn(lead) that takes each validated lead, e.g.
+              LeadUploader.add (which batches and uploads in the background)
+    """
+
+    def __init__(
+        self,
+        source,
+        enrich,
+        validate,
+        upload,
+        queue_size: int | None = None,
+        enrich_workers: int | None = None,
+        validate_workers: int | None = None,
+        upload_workers: int | None = None,
+    ):
+        self._source = source
+        self._enrich = enrich
+        self._validate = validate
+        self._upload = upload
+
+        queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+        self.stages = {
+            "scrape": StageStats("scrape", 1, None),
+            "enrich": StageStats(
+                "enrich", enrich_workers or config.PIPELINE_ENRICH_WORKERS, asyncio.Queue(queue_size)
+            ),
+            "validate": StageStats(
+                "validate", validate_workers or config.PIPELINE_VALIDATE_WORKERS, asyncio.Queue(queue_size)
+            ),
+            "upload": StageStats(
+                "upload", upload_workers or config.PIPELINE_UPLOAD_WORKERS, asyncio.Queue(queue_size)
+            ),
+        }
+        self._tasks: list[asyncio.Task] = []
+
+    async def run(self) -> None:
+        """Run all stages until the source is exhausted and every lead is uploaded."""
+        enrich_q = self.stages["enrich"].queue
+        validate_q = self.stages["validate"].queue
+        upload_q = self.stages["upload"].queue
+
+        async def validate_one(lead):
+            return self._validate(lead)
+
+        for name in ("enrich", "validate", "upload"):
+            metrics.QUEUE_DEPTH.track(self, self.stages[name].queue.qsize, queue=name)
+
+        self._tasks = [
+            asyncio.create_task(self._run_source(enrich_q)),
+            asyncio.create_task(self._run_stage(self.stages["enrich"], self._enrich, validate_q)),
+            asyncio.create_task(self._run_stage(self.stages["validate"], validate_one, upload_q)),
+            asyncio.create_task(self._run_stage(self.stages["upload"], self._upload, None)),
+        ]
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            # On error or cancellation, don't leave sibling stages running
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            metrics.QUEUE_DEPTH.untrack(self)
+
+    def stats(self) -> dict:
+        """Per-stage queue depth and throughput counters."""
+        return {name: stage.snapshot() for name, stage in self.stages.items()}
+
+    def summary(self) -> str:
+        """One-line human readable view of stats()."""
+        return " | ".join(
+            f"{name}: {s['processed']} ({s['per_sec']}/s, q={s['queue_depth']}/{s['queue_size']})"
+            for name, s in self.stats().items()
+        )
+
+    # ── Stages ──────────────────────────────────────────────────────────
+
+    async def _run_source(self, out: asyncio.Queue):
+        stage = self.stages["scrape"]
+        async for lead in self._source:
+            stage.processed += 1
+            await out.put(lead)
+            stage.emitted += 1
+        stage.finished_at = time.monotonic()
+        await out.put(_DONE)
+
+    async def _run_stage(self, stage: StageStats, handle, out: asyncio.Queue | None):
+        async def worker():
+            while True:
+                item = await stage.queue.get()
+                if item is _DONE:
+                    await stage.queue.put(_DONE)  # let sibling workers see it too
+                    return
+                result = await handle(item)
+                stage.processed += 1
+                if out is None:  # last stage: handle() consumed the lead
+                    stage.emitted += 1
+                elif result is not None:
+                    await out.put(result)
+                    stage.emitted += 1
+
+        await asyncio.gather(*(worker() for _ in range(stage.workers)))
+        stage.finished_at = time.monotonic()
+        if out is not None:
+            await out.put(_DONE)
@@ -0,0 +1,119 @@
+"""
+Place Index — remember which Google Maps listings were already extracted.
+
+Recurring jobs ("gyms in Pune" every week) see mostly the same listings.
+Every lead a job is done with (uploaded, spooled, or rejected by
+validation; see execute_job) is stored in a small SQLite database keyed
+by its Maps place ID, with the time it was recorded. Listings recorded
+less than PLACE_INDEX_MAX_AGE_DAYS ago are not opened again: they are
+skipped (or emitted from the index), so a repeat job only spends browser
+time on new and stale listings. Leads still in flight when a job crashes
+or is stopped are not recorded, so a resumed job opens them again.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import agent_config as config
+from dedup_index import place_id
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+
+class PlaceIndex:
+    """SQLite-backed place ID → last extracted lead, with a freshness window."""
+
+    def __init__(self, path: str | None = None, max_age_days: float | None = None):
+        self.path = path or config.PLACE_INDEX_PATH
+        self.max_age = (max_age_days if max_age_days is not None else config.PLACE_INDEX_MAX_AGE_DAYS) * DAY
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # timeout: supervisor workers share the same file
+        self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS places (
+                place_id     TEXT PRIMARY KEY,
+                lead         TEXT NOT NULL,
+                extracted_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_config(cls) -> "PlaceIndex | None":
+        """The index at config.PLACE_INDEX_PATH (None when disabled or unusable)."""
+        if not config.PLACE_INDEX_PATH:
+            return None
+        try:
+            return cls()
+        except Exception as e:
+            logger.warning("Place index unavailable, continuing without it: %s", e)
+            return None
+
+    def get_fresh(self, urls: list[str]) -> dict[str, dict]:
+        """Map each of `urls` extracted within the freshness window to its stored lead."""
+        ids = {url: place_id(url) for url in urls if url}
+        wanted = {pid for pid in ids.values() if pid}
+        if not wanted:
+            return {}
+
+        oldest = time.time() - self.max_age
+        stored: dict[str, dict] = {}
+        with self._lock:
+            wanted_list = list(wanted)
+            for start in range(0, len(wanted_list), 500):  # stay under SQLite's variable limit
+                chunk = wanted_list[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT place_id, lead FROM places WHERE extracted_at >= ? "
+                    f"AND place_id IN ({','.join('?' * len(chunk))})",
+                    (oldest, *chunk),
+                ).fetchall()
+                stored.update((pid, json.loads(lead)) for pid, lead in rows)
+
+        fresh = {url: stored[pid] for url, pid in ids.items() if pid in stored}
+        self.hits += len(fresh)
+        self.misses += len(ids) - len(fresh)
+        return fresh
+
+    def put(self, lead: dict):
+        """Record a lead under its place ID."""
+        self.put_many([lead])
+
+    def put_many(self, leads: list[dict]):
+        """Record several leads in one transaction."""
+        now = time.time()
+        rows = [(place_id(lead.get("google_maps_url", "")), json.dumps(lead), now) for lead in leads]
+        rows = [row for row in rows if row[0]]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO places (place_id, lead, extracted_at) VALUES (?, ?, ?)", rows
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
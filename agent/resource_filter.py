@@ -0,0 +1,179 @@
+"""
+Resource Filter — keep heavy, useless requests out of the scraping browser.
+
+Map tiles, photos, fonts and analytics make up most of the bytes a Google
+Maps search downloads, yet none of them are needed to read the results
+feed or a place's detail panel. ResourceFilter installs a Playwright route
+on the BrowserContext and aborts requests by resource type and URL pattern.
+
+Only URLs that may be blocked are routed (the URL patterns, plus file
+extensions standing in for the blocked resource types): a routed request
+bypasses the browser's HTTP cache, so everything else is left alone.
+Resources of a blocked type whose URL has no telltale extension get
+through.
+
+Presets (config.RESOURCE_FILTER_PRESET):
+    off      no filtering
+    lean     block images, media, fonts, map tiles and analytics
+    minimal  lean, plus stylesheets; like lean, only requests whose URL
+             gives them away (pattern or file extension) are blocked
+"""
+
+import logging
+import re
+
+import agent_config as config
+
+logger = logging.getLogger(__name__)
+
+# Map tiles, satellite/street view imagery and photo CDNs
+TILE_AND_PHOTO_URLS = [
+    r"google\.[a-z.]+/maps/vt",
+    r"googleapis\.com/maps/vt",
+    r"khms\d*\.google",
+    r"streetviewpixels-pa\.googleapis\.com",
+    r"googleusercontent\.com",
+    r"maps\.gstatic\.com/tactile",
+]
+
+# Analytics, logging and ad beacons
+TRACKING_URLS = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"/gen_204",
+    r"play\.google\.com/log",
+    r"/log\?format=json",
+]
+
+PRESETS = {
+    "off": None,
+    "lean": {
+        "allow_types": None,
+        "block_types": {"image", "media", "font"},
+        "block_urls": TILE_AND_PHOTO_URLS + TRACKING_URLS,
+    },
+    "minimal": {
+        "allow_types": {"document", "script", "xhr", "fetch"},
+        "block_types": set(),
+        "block_urls": TILE_AND_PHOTO_URLS + TRACKING_URLS,
+    },
+}
+
+# File extensions of resource types, so that only requests that may be blocked are routed
+TYPE_URLS = {
+    "image": r"\.(?:png|jpe?g|gif|webp|avif|svg|ico)(?:[?#]|$)",
+    "media": r"\.(?:mp4|webm|ogg|mp3|m4a)(?:[?#]|$)",
+    "font": r"\.(?:woff2?|ttf|otf|eot)(?:[?#]|$)",
+    "stylesheet": r"\.css(?:[?#]|$)",
+}
+
+# Rough average size per blocked request, used to estimate bytes saved
+# (a blocked request is never downloaded, so its real size is unknown)
+AVG_BYTES = {
+    "image": 25_000,
+    "media": 200_000,
+    "font": 40_000,
+    "stylesheet": 15_000,
+    "script": 60_000,
+    "xhr": 10_000,
+    "fetch": 10_000,
+}
+DEFAULT_AVG_BYTES = 5_000
+
+
+class ResourceFilter:
+    """
+    Allow/deny rules for browser requests, with counters.
+
+    A request is allowed if its URL matches `allow_urls`. Otherwise it is
+    blocked if its URL matches `block_urls`, if `allow_types` is set and
+    its resource type isn't listed, or if its type is in `block_types`.
+    """
+
+    def __init__(
+        self,
+        allow_types: set[str] | None = None,
+        block_types: set[str] | None = None,
+        block_urls: list[str] | None = None,
+        allow_urls: list[str] | None = None,
+    ):
+        self.allow_types = set(allow_types) if allow_types else None
+        self.block_types = set(block_types or ())
+        self._block_urls = re.compile("|".join(block_urls)) if block_urls else None
+        self._allow_urls = re.compile("|".join(allow_urls)) if allow_urls else None
+
+        blocked_types = [
+            t for t in TYPE_URLS
+            if t in self.block_types or (self.allow_types is not None and t not in self.allow_types)
+        ]
+        routed = list(block_urls or ()) + [TYPE_URLS[t] for t in blocked_types]
+        self.route_pattern = re.compile("|".join(routed)) if routed else None
+
+        self.requests_allowed = 0   # routed requests that were let through
+        self.requests_blocked = 0
+        self.bytes_saved_est = 0    # estimate from AVG_BYTES, not measured
+        self.blocked_by_type: dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls) -> "ResourceFilter | None":
+        """Build the filter selected in agent_config (None when it is 'off')."""
+        preset_name = config.RESOURCE_FILTER_PRESET
+        if preset_name not in PRESETS:
+            logger.warning("Unknown RESOURCE_FILTER_PRESET %r, filtering disabled", preset_name)
+            return None
+        preset = PRESETS[preset_name]
+        if preset is None:
+            return None
+        return cls(
+            allow_types=preset["allow_types"],
+            block_types=preset["block_types"],
+            block_urls=preset["block_urls"] + list(config.RESOURCE_FILTER_BLOCK_URLS),
+            allow_urls=list(config.RESOURCE_FILTER_ALLOW_URLS),
+        )
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if self._allow_urls and self._allow_urls.search(url):
+            return False
+        if self._block_urls and self._block_urls.search(url):
+            return True
+        if self.allow_types is not None and resource_type not in self.allow_types:
+            return True
+        return resource_type in self.block_types
+
+    async def install(self, context):
+        """Route the requests of a BrowserContext that may be blocked through this filter."""
+        if self.route_pattern is not None:
+            await context.route(self.route_pattern, self._handle)
+
+    async def _handle(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        if self.should_block(resource_type, request.url):
+            self.requests_blocked += 1
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            self.bytes_saved_est += AVG_BYTES.get(resource_type, DEFAULT_AVG_BYTES)
+            try:
+                await route.abort("blockedbyclient")
+            except Exception:
+                pass  # page/context already gone
+        else:
+            self.requests_allowed += 1
+            try:
+                await route.continue_()
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "requests_allowed": self.requests_allowed,
+            "requests_blocked": self.requests_blocked,
+            "bytes_saved_est": self.bytes_saved_est,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests_blocked} requests blocked, {self.requests_allowed} routed but allowed, "
+            f"an estimated ~{self.bytes_saved_est / 1_000_000:.1f} MB saved"
+        )
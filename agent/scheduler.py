@@ -0,0 +1,167 @@
+"""
+Job Scheduler — run several scraping jobs concurrently.
+
+Each concurrency slot owns its own GoogleMapsScraper, i.e. its own browser
+process and context, so a crash in one job only restarts that job's
+browser while the other jobs keep running. Browsers come from one
+BrowserPool, which keeps a standby browser warm for such restarts. Jobs are dispatched
+oldest-first and a job is never dispatched twice while it is queued or
+running.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+from playwright._impl._errors import TargetClosedError
+
+import agent_config as config
+from browser_pool import BrowserPool
+from enrichment import EmailEnricher
+from place_index import PlaceIndex
+from resource_filter import ResourceFilter
+from scraper import GoogleMapsScraper
+
+logger = logging.getLogger(__name__)
+
+
+class JobScheduler:
+    """
+    Runs up to `max_jobs` jobs at once.
+
+    run_job:    async fn(job, scraper) that executes one job
+    is_stopped: optional async fn(job_id) -> bool, re-checked right before
+                a queued job starts (it may have been stopped meanwhile)
+    on_done:    optional fn(summary) called after every job with the
+                summary dict returned by run_job (or a "crashed" one)
+    """
+
+    def __init__(
+        self,
+        run_job,
+        max_jobs: int | None = None,
+        headless: bool = False,
+        is_stopped=None,
+        on_done=None,
+    ):
+        self._run_job = run_job
+        self._is_stopped = is_stopped
+        self._on_done = on_done
+        self.max_jobs = max(1, max_jobs or config.MAX_CONCURRENT_JOBS)
+        self.headless = headless
+
+        # One website fetch pool for all slots, so its limits stay global
+        self.enricher = EmailEnricher()
+        # ...and one record of already extracted listings
+        self.place_index = PlaceIndex.from_config()
+        # ...and one set of browsers, with spares for crashed slots
+        self.pool = BrowserPool(headless=headless, resource_filter=ResourceFilter.from_config())
+        self._slots: list[GoogleMapsScraper] = []
+        self._idle: list[GoogleMapsScraper] = []
+        self._queue: deque[dict] = deque()
+        self._known: set[str] = set()
+        self._running: dict[str, asyncio.Task] = {}
+        self.start_seconds = 0.0  # time start() took to get every slot a ready page
+
+    @property
+    def alive(self) -> bool:
+        """False once every slot's browser failed to restart."""
+        return bool(self._slots)
+
+    @property
+    def busy(self) -> int:
+        return len(self._running)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @property
+    def free_slots(self) -> int:
+        """Idle slots not already spoken for by a queued job."""
+        return max(0, len(self._idle) - len(self._queue))
+
+    async def start(self):
+        """Launch one browser per slot."""
+        started = time.perf_counter()
+        self._slots = [
+            GoogleMapsScraper(
+                headless=self.headless, enricher=self.enricher, place_index=self.place_index, pool=self.pool
+            )
+            for _ in range(self.max_jobs)
+        ]
+        await asyncio.gather(*(scraper.start() for scraper in self._slots))
+        self._idle = list(self._slots)
+        self.start_seconds = time.perf_counter() - started
+        logger.info("Scheduler started with %d job slot(s)", self.max_jobs)
+
+    async def stop(self):
+        """Cancel running jobs and close every browser."""
+        self._queue.clear()
+        for task in self._running.values():
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+        await asyncio.gather(*(scraper.stop() for scraper in self._slots), return_exceptions=True)
+        await self.pool.close()
+        logger.info("Browser pool: %s", self.pool.stats())
+        self.enricher.close()
+        if self.place_index:
+            self.place_index.close()
+
+    def submit(self, jobs: list[dict]):
+        """Queue pending jobs (oldest first) and start as many as slots allow."""
+        for job in sorted(jobs, key=lambda j: j.get("created_at") or ""):
+            if job["id"] in self._known:
+                continue
+            self._known.add(job["id"])
+            self._queue.append(job)
+        self._dispatch()
+
+    async def drain(self):
+        """Wait until nothing is queued or running."""
+        while self._running:
+            await asyncio.gather(*list(self._running.values()), return_exceptions=True)
+
+    def _dispatch(self):
+        while self._queue and self._idle:
+            job = self._queue.popleft()
+            scraper = self._idle.pop()
+            self._running[job["id"]] = asyncio.create_task(self._run(job, scraper))
+
+    async def _run(self, job: dict, scraper: GoogleMapsScraper):
+        job_id = job["id"]
+        summary = {"job_id": job_id, "status": "crashed", "leads_uploaded": 0}
+        try:
+            # Re-check job status before starting (might have been stopped)
+            if self._is_stopped and await self._is_stopped(job_id):
+                print(f"   ⏩ Skipping stopped job: {job['category']} in {job['city']}")
+                summary["status"] = "skipped"
+                return
+
+            summary = await self._run_job(job, scraper) or summary
+
+        except TargetClosedError:
+            # Browser crashed — restart only this slot, other jobs keep running
+            try:
+                await scraper.restart()
+            except Exception as e:
+                logger.error("Failed to restart browser after job %s: %s", job_id, e)
+                print("   ❌ Could not restart browser. Retiring this job slot.")
+                self._slots.remove(scraper)
+                scraper = None
+
+        except Exception as e:
+            logger.error("Job %s crashed: %s", job_id, e)
+
+        finally:
+            self._running.pop(job_id, None)
+            self._known.discard(job_id)
+            if scraper is not None:
+                self._idle.append(scraper)
+            if self._on_done:
+                try:
+                    self._on_done(summary)
+                except Exception as e:
+                    logger.debug("on_done callback failed: %s", e)
+            self._dispatch()
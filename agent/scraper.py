@@ -12,101 +12,181 @@ import re
 import sys
 import time
 import logging
+from collections import deque
 
 # Fix Windows console encoding for emoji/unicode output
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
-import requests
-import urllib3
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from playwright.async_api import Page, Browser, BrowserContext
 from playwright._impl._errors import TargetClosedError
 
-# Suppress SSL warnings from business website checks (we use verify=False intentionally)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
 import agent_config as config
+import agent_logging
+import metrics
+from browser_pool import BrowserPool, BrowserSession
+from enrichment import EmailEnricher
+from dedup_index import place_id
+from place_index import PlaceIndex
+from resource_filter import ResourceFilter
 
 logger = logging.getLogger(__name__)
 
+# ─── Detail Panel Extraction ─────────────────────────────────────────────────
+# Every field of the place panel is read in a single page.evaluate() call.
+# field -> (CSS selector, what to read: "text" for innerText, else an attribute)
+DETAIL_FIELDS = {
+    "business_name": ('h1.DUwDvf', "text"),
+    "rating": ('div.F7nice span[aria-hidden="true"]', "text"),
+    "reviews": ('div.F7nice span[aria-label*="review"]', "aria-label"),
+    "category": ('button.DkEaL', "text"),
+}
+
+# Info rows (address, phone, website) are recognised by their data-item-id
+INFO_ITEMS_SELECTOR = 'button[data-item-id], a[data-item-id]'
+INFO_FIELDS = [
+    # (lead field, text contained in data-item-id, aria-label prefix to strip)
+    ("address", "address", "Address: "),
+    ("phone", "phone", "Phone: "),
+    ("website", "authority", "Website: "),
+]
+
+# Result cards in the feed, read all at once in fast mode (same table format)
+CARD_SELECTOR = 'div[role="feed"] div[role="article"]'
+CARD_FIELDS = {
+    "business_name": ('a.hfpxzc', "aria-label"),
+    "google_maps_url": ('a.hfpxzc', "href"),
+    "rating": ('span.MW4etd', "text"),
+    "reviews": ('span.UY7F9', "text"),
+    "phone": ('span.UsdlK', "text"),
+    "website": ('a[data-value="Website"]', "href"),
+    # "Category · Address" line; split apart in _lead_from_card
+    "details_line": ('div.W4Efsd div.W4Efsd', "text"),
+}
+
+_READ_FIELDS_JS = """
+(root, fields) => {
+    const out = {};
+    for (const [name, [selector, source]] of Object.entries(fields)) {
+        const el = root.querySelector(selector);
+        if (!el) out[name] = "";
+        else if (source === "text") out[name] = el.innerText || "";
+        else out[name] = el.getAttribute(source) || "";
+    }
+    return out;
+}
+"""
+
+_READ_PANEL_JS = """
+([fields, infoSelector]) => {
+    const out = (READ_FIELDS)(document, fields);
+    out.info = Array.from(document.querySelectorAll(infoSelector)).map(el => [
+        el.getAttribute("data-item-id") || "",
+        el.getAttribute("aria-label") || "",
+    ]);
+    out.url = location.href;
+    return out;
+}
+""".replace("READ_FIELDS", _READ_FIELDS_JS)
+
+_READ_CARDS_JS = """
+([cardSelector, fields]) => Array.from(document.querySelectorAll(cardSelector))
+    .map(card => (READ_FIELDS)(card, fields))
+""".replace("READ_FIELDS", _READ_FIELDS_JS)
+
+# Scroll the feed once, then resolve as soon as the number of listings
+# changes or the end-of-list marker shows up (or after timeoutMs).
+_SCROLL_AND_WAIT_JS = """
+([feedSelector, timeoutMs]) => new Promise(resolve => {
+    const feed = document.querySelector(feedSelector);
+    const count = () =>
+        document.querySelectorAll('div[role="feed"] > div > div > a').length ||
+        document.querySelectorAll('a[href*="/maps/place/"]').length;
+    const atEnd = () => !!document.querySelector("span.HlvSq") ||
+        /end of the list/i.test((feed && feed.lastElementChild && feed.lastElementChild.textContent) || "");
+
+    const before = count();
+    if (!feed || atEnd()) return resolve({ count: before, end: true });
+
+    let observer = null;
+    const finish = () => {
+        clearTimeout(timer);
+        if (observer) observer.disconnect();
+        resolve({ count: count(), end: atEnd() });
+    };
+    const timer = setTimeout(finish, timeoutMs);
+    observer = new MutationObserver(() => {
+        if (count() !== before || atEnd()) finish();
+    });
+    observer.observe(feed, { childList: true, subtree: true });
+    feed.scrollTop = feed.scrollHeight;
+})
+"""
+
+# Trailing "·" parts of a card's details line that are opening hours, not an address
+_HOURS_PREFIXES = ("open", "closed", "closes", "opens")
+
 
 class GoogleMapsScraper:
     """Scrapes business listings from Google Maps."""
 
-    def __init__(self, headless: bool = False):
+    def __init__(
+        self,
+        headless: bool = False,
+        enricher: EmailEnricher | None = None,
+        place_index: PlaceIndex | None = None,
+        pool: BrowserPool | None = None,
+    ):
         self.headless = headless
         self.browser: Browser | None = None
         self.context: BrowserContext | None = None
         self.page: Page | None = None
-        self._playwright = None
+        self._session: BrowserSession | None = None
+        # Seconds spent in each phase of the latest search (e.g. "scroll")
+        self.timings: dict[str, float] = {}
+        # Browsers come from a pool that keeps standby ones warm (see
+        # scheduler.JobScheduler); on its own, a scraper launches its own
+        self._owns_pool = pool is None
+        self.pool = pool or BrowserPool(headless=headless, standby=0, resource_filter=ResourceFilter.from_config())
+        # Request blocking rules; counters survive browser restarts
+        self.resource_filter = self.pool.resource_filter
+        # Website/email lookups outlive browser restarts (and may be shared
+        # between several scrapers, see scheduler.JobScheduler)
+        self.enricher = enricher or EmailEnricher()
+        # Listings extracted recently are not opened again
+        self.place_index = place_index or PlaceIndex.from_config()
 
     async def start(self):
-        """Launch the browser with stealth settings."""
-        self._playwright = await async_playwright().start()
-
-        # Randomize viewport for fingerprint variation
-        width = random.randint(1280, 1920)
-        height = random.randint(800, 1080)
-
-        self.browser = await self._playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-            ],
-        )
-
-        self.context = await self.browser.new_context(
-            viewport={"width": width, "height": height},
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            locale="en-IN",
-            timezone_id="Asia/Kolkata",
-        )
-
-        # Stealth: mask webdriver property
-        await self.context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-            Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-            Object.defineProperty(navigator, 'languages', { get: () => ['en-IN', 'en-US', 'en'] });
-            window.chrome = { runtime: {} };
-        """)
-
-        self.page = await self.context.new_page()
-        logger.info("Browser launched (headless=%s, viewport=%dx%d)", self.headless, width, height)
+        """Take a stealth browser session from the pool (launching one if no standby is ready)."""
+        self._session = await self.pool.acquire()
+        self.browser = self._session.browser
+        self.context = self._session.context
+        self.page = self._session.page
 
     async def stop(self):
-        """Close the browser gracefully."""
-        try:
-            if self.browser:
-                await self.browser.close()
-        except Exception:
-            pass  # Browser may already be closed or connection lost
-        try:
-            if self._playwright:
-                await self._playwright.stop()
-        except Exception:
-            pass
+        """Close the browser gracefully (and the pool, if this scraper owns it)."""
+        if self._session:
+            await self._session.close()
+        if self._owns_pool:
+            await self.pool.close()
+        self._session = None
         self.browser = None
         self.context = None
         self.page = None
-        self._playwright = None
         logger.info("Browser closed.")
 
     async def restart(self):
-        """Fully tear down and relaunch the browser."""
+        """Replace the browser, with a warm standby from the pool when one is ready."""
         logger.info("🔄 Restarting browser...")
         print("   🔄 Browser crashed — restarting...")
-        await self.stop()
-        await asyncio.sleep(2)  # Brief cooldown
+        metrics.count("browser_restarts")
+        dead = self._session
+        started = time.monotonic()
         await self.start()
-        logger.info("✅ Browser restarted successfully.")
+        if dead:
+            await dead.close()
+        logger.info("✅ Browser restarted successfully in %.2fs.", time.monotonic() - started)
         print("   ✅ Browser back online!")
 
     async def _ensure_browser_alive(self):
@@ -119,14 +199,37 @@ class GoogleMapsScraper:
         except Exception:
             await self.restart()
 
-    async def scrape_category_city(self, category: str, city: str):
+    async def scrape_category_city(
+        self,
+        category: str,
+        city: str,
+        enrich: bool = True,
+        fast: bool | None = None,
+        skip: set[str] | None = None,
+    ):
         """
         Main entry point: search Google Maps for `<category> in <city>`,
         scroll through all results, and extract details from each listing.
         Yields dictionaries as they are extracted.
+
+        With enrich=False leads are yielded without an email lookup; the
+        caller is expected to run enrich_lead() itself.
+
+        fast (default: config.FAST_MODE) harvests the result cards in one
+        pass and only opens listings whose cards lack one of
+        config.FAST_MODE_REQUIRED_FIELDS.
+
+        Listings found in the place index (extracted within
+        PLACE_INDEX_MAX_AGE_DAYS) are not opened; they are skipped, or
+        their stored lead is yielded with PLACE_INDEX_EMIT_CACHED on.
+
+        skip: place IDs already processed by an earlier attempt of the same
+        job (from its checkpoint); those listings are left out entirely.
         """
+        fast = config.FAST_MODE if fast is None else fast
+        started = time.perf_counter()
         search_query = f"{category} in {city}"
-        search_url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
+        search_url = f"{config.MAPS_BASE_URL}/search/{search_query.replace(' ', '+')}"
 
         logger.info("🔍 Searching: %s", search_query)
         print(f"\n🔍 Searching: {search_query}")
@@ -141,12 +244,14 @@ class GoogleMapsScraper:
                 break
             except TargetClosedError:
                 logger.warning("Browser died during navigation (attempt %d), restarting...", attempt + 1)
+                metrics.count("retries", op="navigation")
                 await self.restart()
                 if attempt == 2:
                     raise
             except Exception as e:
                 if attempt < 2:
                     logger.warning("Navigation attempt %d failed, retrying: %s", attempt + 1, str(e))
+                    metrics.count("retries", op="navigation")
                     await self._random_delay(2, 4)
                 else:
                     raise
@@ -167,29 +272,73 @@ class GoogleMapsScraper:
                 await self._random_delay(1, 2)
         except Exception:
             pass
+        metrics.observe("search", time.perf_counter() - started)
 
         # Scroll to load all results
         await self._scroll_results()
 
-        # Get all listing links
-        listings = await self._get_listing_elements()
-        print(f"   Found {len(listings)} listings")
-        logger.info("Found %d listings for '%s'", len(listings), search_query)
-
-        for i, listing in enumerate(listings):
-            try:
-                lead = await self._extract_listing_details(listing, city, category, i + 1, len(listings))
-                if lead and lead.get("business_name"):
+        if fast:
+            extracted = self._extract_fast(city, category, skip)
+        else:
+            if config.TAB_POOL_SIZE > 1:
+                # Open place URLs directly in a pool of tabs instead of clicking
+                place_urls = await self._get_listing_urls()
+                print(f"   Found {len(place_urls)} listings")
+                logger.info("Found %d listings for '%s'", len(place_urls), search_query)
+                place_urls = self._drop_processed(place_urls, place_urls, skip)
+                known = self._known_places(place_urls)
+                place_urls = [url for url in place_urls if url not in known]
+                extracted = self._extract_with_tab_pool(place_urls, city, category)
+            else:
+                listings = await self._get_listing_elements()
+                print(f"   Found {len(listings)} listings")
+                logger.info("Found %d listings for '%s'", len(listings), search_query)
+                known = {}
+                if self.place_index or skip:
+                    hrefs = await asyncio.gather(*(listing.get_attribute("href") for listing in listings))
+                    pairs = self._drop_processed(list(zip(listings, hrefs)), hrefs, skip)
+                    known = self._known_places([href for _, href in pairs])
+                    listings = [listing for listing, href in pairs if href not in known]
+                extracted = self._extract_by_clicking(listings, city, category)
+            extracted = self._with_place_index(known, extracted, city, category)
+
+        # Email enrichment of listing N runs in the background while listing
+        # N+1 is extracted. Leads are still yielded in extraction order.
+        pending: deque[asyncio.Task] = deque()
+        try:
+            async for lead in extracted:
+                metrics.count("listings")
+                if enrich:
+                    pending.append(asyncio.create_task(self.enrich_lead(lead)))
+                else:
                     yield lead
-            except Exception as e:
-                logger.warning("Failed to extract listing %d: %s", i + 1, str(e))
-                continue
+
+                while pending and (pending[0].done() or len(pending) > config.ENRICH_MAX_PENDING):
+                    yield await pending.popleft()
+
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wall time of the whole search, including waits on downstream stages
+            metrics.observe("scrape", time.perf_counter() - started)
 
         print(f"   ✅ Extraction finished for {search_query}")
 
 
+    @metrics.timed("scroll")
     async def _scroll_results(self):
-        """Scroll the results panel until no new listings load."""
+        """
+        Scroll the results panel until no new listings load.
+
+        Each step scrolls and then waits inside the page until the feed grows
+        (or SCROLL_WAIT_TIMEOUT passes), instead of sleeping a fixed time.
+        The time spent is recorded in self.timings["scroll"].
+        """
+        started = time.monotonic()
+        self.timings["scroll"] = 0.0
+
         # Find the scrollable results container
         feed_selector = 'div[role="feed"]'
 
@@ -208,25 +357,17 @@ class GoogleMapsScraper:
         prev_count = 0
 
         while retries < config.MAX_SCROLL_RETRIES:
-            # Scroll down
-            await self.page.evaluate(f"""
-                const feed = document.querySelector('{feed_selector}');
-                if (feed) feed.scrollTop = feed.scrollHeight;
-            """)
-
-            await self._random_delay(config.SCROLL_PAUSE_MIN, config.SCROLL_PAUSE_MAX)
-
-            # Check for "end of list" indicator
-            end_of_list = await self.page.locator("span.HlvSq").count()
-            if end_of_list > 0:
+            # Scroll down and wait for new results (or the end of the list)
+            state = await self.page.evaluate(
+                _SCROLL_AND_WAIT_JS, [feed_selector, int(config.SCROLL_WAIT_TIMEOUT * 1000)]
+            )
+            current_count = state["count"]
+
+            if state["end"]:
+                prev_count = current_count
                 logger.info("Reached end of results list.")
                 break
 
-            # Count current listings
-            current_count = await self.page.locator('div[role="feed"] > div > div > a').count()
-            if current_count == 0:
-                current_count = await self.page.locator('a[href*="/maps/place/"]').count()
-
             if current_count == prev_count:
                 retries += 1
                 logger.debug("No new results (retry %d/%d)", retries, config.MAX_SCROLL_RETRIES)
@@ -236,7 +377,11 @@ class GoogleMapsScraper:
 
             prev_count = current_count
 
-        print(f"   📜 Scrolling complete — {prev_count} listings loaded")
+            # Small human-like jitter between scrolls
+            await self._random_delay(config.SCROLL_JITTER_MIN, config.SCROLL_JITTER_MAX)
+
+        self.timings["scroll"] = time.monotonic() - started
+        print(f"   📜 Scrolling complete — {prev_count} listings loaded ({self.timings['scroll']:.1f}s)")
 
     async def _get_listing_elements(self):
         """Get all listing link elements from the results."""
@@ -246,6 +391,208 @@ class GoogleMapsScraper:
             links = await self.page.locator('a[href*="/maps/place/"]').all()
         return links
 
+    async def _get_listing_urls(self) -> list[str]:
+        """Collect the unique /maps/place/ URLs of the listing links, in feed order."""
+        hrefs = await self.page.locator('div[role="feed"] > div > div > a').evaluate_all(
+            "els => els.map(e => e.href)"
+        )
+        if not hrefs:
+            hrefs = await self.page.locator('a[href*="/maps/place/"]').evaluate_all(
+                "els => els.map(e => e.href)"
+            )
+        return [url for url in dict.fromkeys(hrefs) if url and "/maps/place/" in url]
+
+    def _drop_processed(self, items: list, urls: list[str], skip: set[str] | None) -> list:
+        """The items whose listing URL (same position in `urls`) isn't one of the `skip` place IDs."""
+        if not skip:
+            return items
+        kept = [item for item, url in zip(items, urls) if place_id(url or "") not in skip]
+        if len(kept) < len(items):
+            print(f"   ⏩ Resuming: {len(items) - len(kept)} listings were already processed")
+        return kept
+
+    def _known_places(self, urls: list[str]) -> dict[str, dict]:
+        """Listings (by URL) extracted recently enough to skip, with their stored leads."""
+        if not self.place_index:
+            return {}
+        known = self.place_index.get_fresh(urls)
+        if known:
+            print(
+                f"   ⏭️  {len(known)} listings already extracted in the last "
+                f"{config.PLACE_INDEX_MAX_AGE_DAYS} days — not opening them again"
+            )
+        return known
+
+    async def _with_place_index(self, known: dict[str, dict], extracted, city: str, category: str):
+        """Yield the stored leads of known listings, then the freshly extracted ones."""
+        if config.PLACE_INDEX_EMIT_CACHED:
+            for lead in known.values():
+                yield {**lead, "email": "", "city": city, "search_category": category}
+        async for lead in extracted:
+            yield lead
+
+    async def _extract_fast(self, city: str, category: str, skip: set[str] | None = None):
+        """
+        Fast mode: harvest every result card in one DOM pass. Cards that
+        already have all config.FAST_MODE_REQUIRED_FIELDS are yielded right
+        away; only the rest are opened (through the tab pool) to fill the gaps.
+        """
+        try:
+            cards = await self.page.evaluate(_READ_CARDS_JS, [CARD_SELECTOR, CARD_FIELDS])
+        except TargetClosedError:
+            raise
+        except Exception as e:
+            logger.warning("Could not read result cards: %s", str(e))
+            cards = []
+
+        leads = [self._lead_from_card(card, city, category) for card in cards]
+        leads = [lead for lead in leads if lead["business_name"]]
+        print(f"   Found {len(leads)} listings (fast mode)")
+        leads = self._drop_processed(leads, [lead["google_maps_url"] for lead in leads], skip)
+
+        incomplete: dict[str, dict] = {}
+        for lead in leads:
+            missing = [f for f in config.FAST_MODE_REQUIRED_FIELDS if not lead.get(f)]
+            if missing and lead["google_maps_url"]:
+                incomplete[lead["google_maps_url"]] = lead
+            else:
+                yield lead
+
+        # Recently extracted listings get their details from the place index
+        for url, details in self._known_places(list(incomplete)).items():
+            lead = incomplete.pop(url)
+            lead.update({k: v for k, v in details.items() if v and k not in ("email", "city", "search_category")})
+            yield lead
+
+        if incomplete:
+            logger.info("Fast mode: opening %d of %d listings for missing fields", len(incomplete), len(leads))
+            async for url, details in self._open_places(list(incomplete), city, category):
+                lead = incomplete[url]
+                if details:
+                    # Card values stay unless the detail panel has something better
+                    lead.update({k: v for k, v in details.items() if v})
+                yield lead
+
+    def _lead_from_card(self, card: dict, city: str, category: str) -> dict:
+        """Turn the raw fields of one result card into a (partial) lead."""
+        lead = {
+            "business_name": card.get("business_name", "").strip(),
+            "rating": card.get("rating", "").strip(),
+            "reviews": "",
+            "category": "",
+            "address": "",
+            "phone": card.get("phone", "").strip(),
+            "website": card.get("website", "").strip(),
+            "email": "",
+            "google_maps_url": card.get("google_maps_url", ""),
+            "city": city,
+            "search_category": category,
+        }
+
+        # Extract number from "(1,234)"
+        match = re.search(r"([\d,]+)", card.get("reviews", ""))
+        if match:
+            lead["reviews"] = match.group(1).replace(",", "")
+
+        parts = [p.strip() for p in card.get("details_line", "").split("·") if p.strip()]
+        if parts:
+            lead["category"] = parts[0]
+        if len(parts) > 1 and not parts[-1].lower().startswith(_HOURS_PREFIXES):
+            lead["address"] = parts[-1]
+
+        return lead
+
+    async def _extract_by_clicking(self, listings, city: str, category: str):
+        """Click each listing in the shared results page, one at a time."""
+        for i, listing in enumerate(listings):
+            try:
+                lead = await self._extract_listing_details(listing, city, category, i + 1, len(listings))
+            except TargetClosedError:
+                raise
+            except Exception as e:
+                logger.warning("Failed to extract listing %d: %s", i + 1, str(e))
+                continue
+            if lead and lead.get("business_name"):
+                yield lead
+
+    async def _extract_with_tab_pool(self, place_urls: list[str], city: str, category: str):
+        """Extract every place URL through the tab pool, yielding valid leads."""
+        async for _, lead in self._open_places(place_urls, city, category):
+            if lead and lead.get("business_name"):
+                yield lead
+
+    async def _open_places(self, place_urls: list[str], city: str, category: str):
+        """
+        Fan place URLs out to config.TAB_POOL_SIZE tabs in the same browser
+        context. Each tab navigates straight to a place and extracts it.
+        Yields (url, lead or None) as soon as any tab finishes.
+        """
+        total = len(place_urls)
+        if not total:
+            return
+
+        todo: asyncio.Queue = asyncio.Queue()
+        for i, url in enumerate(place_urls):
+            todo.put_nowait((i + 1, url))
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def tab_worker(page: Page):
+            while True:
+                try:
+                    index, url = todo.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await done.put((url, await self._extract_place(page, url, city, category, index, total)))
+                except TargetClosedError as e:
+                    await done.put((url, e))  # surfaced by the consumer below
+                    return
+                except Exception as e:
+                    logger.warning("Failed to extract listing %d: %s", index, str(e))
+                    await done.put((url, None))
+
+        pool_size = max(1, min(config.TAB_POOL_SIZE, total))
+        pages: list[Page] = []
+        workers: list[asyncio.Task] = []
+        try:
+            # One at a time, so the finally below closes whatever opened if a new_page() fails
+            for _ in range(pool_size):
+                pages.append(await self.context.new_page())
+                workers.append(asyncio.create_task(tab_worker(pages[-1])))
+            logger.info("Extracting %d listings with %d tabs", total, len(pages))
+            for _ in range(total):
+                url, result = await done.get()
+                if isinstance(result, TargetClosedError):
+                    raise result
+                yield url, result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for page in pages:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    @metrics.timed("extract")
+    async def _extract_place(
+        self, page: Page, url: str, city: str, category: str, index: int, total: int
+    ) -> dict | None:
+        """Navigate a pool tab directly to a place URL and extract its details."""
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            await page.wait_for_selector('h1.DUwDvf', timeout=8000)
+            await self._random_delay(0.5, 1.5)
+        except TargetClosedError:
+            raise
+        except Exception as e:
+            logger.warning("Could not open listing %d: %s", index, str(e))
+            return None
+
+        return await self._read_listing_details(page, city, category, index, total)
+
+    @metrics.timed("extract")
     async def _extract_listing_details(
         self, element, city: str, category: str, index: int, total: int
     ) -> dict | None:
@@ -258,10 +605,18 @@ class GoogleMapsScraper:
             await self.page.wait_for_selector('div[role="main"]', timeout=8000)
             await self._random_delay(0.5, 1.5)
 
+        except TargetClosedError:
+            raise
         except Exception as e:
             logger.warning("Could not click listing %d: %s", index, str(e))
             return None
 
+        return await self._read_listing_details(self.page, city, category, index, total)
+
+    async def _read_listing_details(
+        self, page: Page, city: str, category: str, index: int, total: int
+    ) -> dict:
+        """Extract all available details from the place panel shown in `page`."""
         lead = {
             "business_name": "",
             "rating": "",
@@ -276,140 +631,61 @@ class GoogleMapsScraper:
             "search_category": category,
         }
 
-        # ── Business Name ────────────────────────────────────────────
+        # ── All panel fields in one round-trip ───────────────────────
         try:
-            name_el = self.page.locator('h1.DUwDvf')
-            if await name_el.count() > 0:
-                lead["business_name"] = (await name_el.first.inner_text()).strip()
-        except Exception:
-            pass
+            panel = await page.evaluate(_READ_PANEL_JS, [DETAIL_FIELDS, INFO_ITEMS_SELECTOR])
+        except TargetClosedError:
+            raise
+        except Exception as e:
+            logger.warning("Could not read details of listing %d: %s", index, str(e))
+            panel = {}
 
-        # ── Rating & Reviews ─────────────────────────────────────────
-        try:
-            rating_el = self.page.locator('div.F7nice span[aria-hidden="true"]')
-            if await rating_el.count() > 0:
-                lead["rating"] = (await rating_el.first.inner_text()).strip()
-
-            reviews_el = self.page.locator('div.F7nice span[aria-label*="review"]')
-            if await reviews_el.count() > 0:
-                reviews_text = (await reviews_el.first.get_attribute("aria-label")) or ""
-                # Extract number from "123 reviews"
-                match = re.search(r"([\d,]+)", reviews_text)
-                if match:
-                    lead["reviews"] = match.group(1).replace(",", "")
-        except Exception:
-            pass
+        lead["business_name"] = panel.get("business_name", "").strip()
+        lead["rating"] = panel.get("rating", "").strip()
+        lead["category"] = panel.get("category", "").strip()
+        lead["google_maps_url"] = panel.get("url", "")
 
-        # ── Category ─────────────────────────────────────────────────
-        try:
-            cat_el = self.page.locator('button.DkEaL')
-            if await cat_el.count() > 0:
-                lead["category"] = (await cat_el.first.inner_text()).strip()
-        except Exception:
-            pass
+        # Extract number from "123 reviews"
+        match = re.search(r"([\d,]+)", panel.get("reviews", ""))
+        if match:
+            lead["reviews"] = match.group(1).replace(",", "")
 
         # ── Info items (address, phone, website) ─────────────────────
-        try:
-            info_buttons = await self.page.locator(
-                'button[data-item-id], a[data-item-id]'
-            ).all()
-
-            for btn in info_buttons:
-                try:
-                    data_id = (await btn.get_attribute("data-item-id")) or ""
-                    aria_label = (await btn.get_attribute("aria-label")) or ""
-
-                    if data_id.startswith("address") or "address" in data_id.lower():
-                        lead["address"] = aria_label.replace("Address: ", "").strip()
-                    elif data_id.startswith("phone") or "phone" in data_id.lower():
-                        lead["phone"] = aria_label.replace("Phone: ", "").strip()
-                    elif data_id.startswith("authority"):
-                        lead["website"] = aria_label.replace("Website: ", "").strip()
-                except Exception:
-                    continue
-        except Exception:
-            pass
+        for data_id, aria_label in panel.get("info", []):
+            for field, item_id, prefix in INFO_FIELDS:
+                if item_id in data_id.lower():
+                    lead[field] = aria_label.replace(prefix, "").strip()
+                    break
+
+        # Email is looked up afterwards by enrich_lead, off the browser's path
+        progress = f"   [{index}/{total}] {lead['business_name']}"
+        if lead["website"]:
+            progress += " — 🌐 checking website for email..."
+        agent_logging.lead(progress, business=lead["business_name"], listing=index)
 
-        # ── Google Maps URL ──────────────────────────────────────────
-        try:
-            lead["google_maps_url"] = self.page.url
-        except Exception:
-            pass
+        return lead
 
-        # ── Extract email from business website ──────────────────────
+    async def enrich_lead(self, lead: dict) -> dict:
+        """Fill in the lead's email from its website, if it has one."""
         if lead["website"]:
-            print(f"   [{index}/{total}] {lead['business_name']} — 🌐 checking website for email...")
-            lead["email"] = self._extract_email_from_website(lead["website"])
-        else:
-            print(f"   [{index}/{total}] {lead['business_name']}")
-
+            lead["email"] = await self._extract_email_from_website(lead["website"])
         return lead
 
-    def _extract_email_from_website(self, url: str) -> str:
+    @metrics.timed("email")
+    async def _extract_email_from_website(self, url: str) -> str:
         """
         Visit the business website and try to find an email address.
         Checks the homepage and common pages like /contact, /about.
         """
-        if not url.startswith("http"):
-            url = "https://" + url
-
-        # Normalize base URL
-        base_url = url.rstrip("/")
-
-        emails_found: set[str] = set()
-        email_pattern = re.compile(
-            r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}",
-        )
-
-        # Emails to exclude (generic/system emails)
-        exclude_patterns = {
-            "example.com", "sentry.io", "wixpress.com", "wordpress.com",
-            "w3.org", "schema.org", "google.com", "facebook.com",
-            "cloudflare.com", "googleapis.com",
-        }
-
-        for page_path in config.EMAIL_PAGES:
-            try:
-                page_url = base_url + page_path if page_path != "/" else base_url
-                resp = requests.get(
-                    page_url,
-                    timeout=config.REQUEST_TIMEOUT,
-                    headers={
-                        "User-Agent": (
-                            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                            "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
-                        ),
-                    },
-                    allow_redirects=True,
-                    verify=False,
-                )
-                if resp.status_code == 200:
-                    found = email_pattern.findall(resp.text)
-                    for email in found:
-                        domain = email.split("@")[1].lower()
-                        if not any(ex in domain for ex in exclude_patterns):
-                            emails_found.add(email.lower())
-
-                    # Also check mailto: links via BeautifulSoup
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    for a_tag in soup.find_all("a", href=True):
-                        href = a_tag["href"]
-                        if href.startswith("mailto:"):
-                            email = href.replace("mailto:", "").split("?")[0].strip()
-                            if email_pattern.match(email):
-                                domain = email.split("@")[1].lower()
-                                if not any(ex in domain for ex in exclude_patterns):
-                                    emails_found.add(email.lower())
-
-            except Exception:
-                continue
-
-        # Return the first valid email (prefer non-generic ones)
-        if emails_found:
-            return sorted(emails_found)[0]
-        return ""
+        try:
+            email = await self.enricher.find_email(url)
+        except Exception as e:
+            logger.debug("Email lookup failed for %s: %s", url, e)
+            email = ""
+        metrics.count("email_hits" if email else "email_misses")
+        return email
 
     async def _random_delay(self, min_sec: float = 1.0, max_sec: float = 3.0):
         """Human-like random delay."""
-        delay = random.uniform(min_sec, max_sec)
+        delay = random.uniform(min_sec, max_sec) * config.HUMAN_DELAY_SCALE
         await asyncio.sleep(delay)
@@ -0,0 +1,180 @@
+"""
+Agent Supervisor — run a fleet of agent worker processes.
+
+Each worker is a separate process running the normal polling agent with
+its own Playwright instance. Workers get jobs through the API's atomic
+claim endpoint (LeadGenAPI.claim_job), so no two workers ever pick up the
+same pending job. The supervisor spreads workers across CPU cores,
+restarts workers that crash and aggregates the per-job stats they report.
+
+Usage:
+    python agent.py --workers 4 --headless
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import time
+import logging
+
+import agent_config as config
+
+logger = logging.getLogger(__name__)
+
+
+def _cpu_groups(workers: int) -> list[set[int]]:
+    """Split the CPUs this process may use into one group per worker."""
+    if not hasattr(os, "sched_getaffinity"):
+        return [set() for _ in range(workers)]  # no affinity control (Windows/macOS)
+    cpus = sorted(os.sched_getaffinity(0))
+    return [set(cpus[i::workers]) or {cpus[i % len(cpus)]} for i in range(workers)]
+
+
+def _worker_main(worker_id: int, args, stats_queue, cpus: set[int]):
+    """Entry point of a worker process: the regular agent loop on its own cores."""
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError:
+            pass
+
+    import agent
+
+    # Each worker rotates its own log file (error_log.worker-<id>.txt)
+    root, ext = os.path.splitext(config.ERROR_LOG)
+    config.ERROR_LOG = f"{root}.worker-{worker_id}{ext}"
+
+    # Each worker serves its own /metrics, on the ports after the configured one
+    port = config.METRICS_PORT if getattr(args, "metrics_port", None) is None else args.metrics_port
+    args.metrics_port = port + 1 + worker_id if port else 0
+
+    def report(summary: dict):
+        stats_queue.put({**summary, "worker": worker_id})
+
+    try:
+        asyncio.run(agent.run_agent(args, on_job_done=report))
+    except KeyboardInterrupt:
+        pass
+
+
+class Supervisor:
+    """Starts, watches and restarts `workers` agent processes."""
+
+    def __init__(self, args, workers: int):
+        self.args = args
+        self.workers = workers
+        # spawn: every worker gets a clean interpreter and its own Playwright driver
+        self._ctx = mp.get_context("spawn")
+        self._stats_queue = self._ctx.Queue()
+        self._cpu_groups = _cpu_groups(workers)
+        self._procs: dict[int, mp.Process] = {}
+        self._started_at: dict[int, float] = {}
+        self._restart_at: dict[int, float] = {}
+        self._restart_delay = {i: config.SUPERVISOR_RESTART_DELAY for i in range(workers)}
+
+        self.restarts = 0
+        self.totals = {
+            "jobs": 0, "completed": 0, "failed": 0, "stopped": 0,
+            "crashed": 0, "skipped": 0, "leads_uploaded": 0,
+        }
+        self.per_worker = {i: {"jobs": 0, "leads_uploaded": 0, "restarts": 0} for i in range(workers)}
+
+    def run(self):
+        print(f"\n🧑‍✈️ Supervisor starting {self.workers} worker processes...")
+        for worker_id in range(self.workers):
+            self._start_worker(worker_id)
+
+        last_report = time.time()
+        try:
+            while True:
+                self._collect_stats(timeout=1.0)
+                self._check_workers()
+                if time.time() - last_report >= config.SUPERVISOR_REPORT_INTERVAL:
+                    print(f"   📊 {self.summary()}")
+                    last_report = time.time()
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Supervisor stopped by user.")
+        finally:
+            self._shutdown()
+            self._collect_stats(timeout=0)
+            print(f"   📊 {self.summary()}")
+
+    def summary(self) -> str:
+        t = self.totals
+        alive = sum(1 for p in self._procs.values() if p.is_alive())
+        return (
+            f"workers {alive}/{self.workers} | jobs {t['jobs']} "
+            f"(✅ {t['completed']} ❌ {t['failed'] + t['crashed']} ⏹ {t['stopped']}) | "
+            f"leads {t['leads_uploaded']} | restarts {self.restarts}"
+        )
+
+    def _start_worker(self, worker_id: int):
+        cpus = self._cpu_groups[worker_id]
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.args, self._stats_queue, cpus),
+            name=f"leadgen-worker-{worker_id}",
+        )
+        proc.start()
+        self._procs[worker_id] = proc
+        self._started_at[worker_id] = time.time()
+        logger.info("Worker %d started (pid=%s, cpus=%s)", worker_id, proc.pid, sorted(cpus) or "any")
+
+    def _check_workers(self):
+        now = time.time()
+        for worker_id, proc in list(self._procs.items()):
+            if proc.is_alive():
+                continue
+
+            if worker_id not in self._restart_at:
+                # A worker that ran for a while gets the short delay again
+                if now - self._started_at[worker_id] > config.SUPERVISOR_MAX_RESTART_DELAY:
+                    self._restart_delay[worker_id] = config.SUPERVISOR_RESTART_DELAY
+                delay = self._restart_delay[worker_id]
+                self._restart_at[worker_id] = now + delay
+                self._restart_delay[worker_id] = min(delay * 2, config.SUPERVISOR_MAX_RESTART_DELAY)
+                logger.warning("Worker %d exited (code %s), restarting in %ds", worker_id, proc.exitcode, delay)
+                print(f"   🔄 Worker {worker_id} exited (code {proc.exitcode}) — restarting in {delay}s")
+
+            elif now >= self._restart_at[worker_id]:
+                del self._restart_at[worker_id]
+                self.restarts += 1
+                self.per_worker[worker_id]["restarts"] += 1
+                self._start_worker(worker_id)
+
+    def _collect_stats(self, timeout: float):
+        """Fold job summaries reported by workers into the totals."""
+        while True:
+            try:
+                summary = self._stats_queue.get(timeout=timeout) if timeout else self._stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            timeout = 0  # drain whatever else is already queued without waiting
+
+            status = summary.get("status", "failed")
+            leads = summary.get("leads_uploaded", 0)
+            self.totals["jobs"] += 1
+            self.totals[status] = self.totals.get(status, 0) + 1
+            self.totals["leads_uploaded"] += leads
+            worker = self.per_worker.setdefault(summary.get("worker"), {"jobs": 0, "leads_uploaded": 0, "restarts": 0})
+            worker["jobs"] += 1
+            worker["leads_uploaded"] += leads
+
+    def _shutdown(self):
+        for proc in self._procs.values():
+            proc.join(timeout=10)
+        for proc in self._procs.values():
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(timeout=5)
+
+
+def run_supervisor(args):
+    """Run `args.workers` agent processes until interrupted."""
+    if not config.API_KEY:
+        print("\n⚠️  Configuration not found.")
+        print("   Run `python agent.py` once (without --workers) to set up your API key.")
+        return
+
+    Supervisor(args, args.workers).run()
@@ -0,0 +1,350 @@
+"""
+Lead Uploader — background, retrying lead uploads with a durable spool.
+
+Validated leads are handed to a LeadUploader, which returns immediately.
+A background task coalesces them into batches (flushed when a batch is
+full, too large in bytes, or its oldest lead has waited UPLOAD_MAX_WAIT
+seconds) and uploads them with exponential-backoff retries, so scraping
+never waits on the network. A BatchSizer adapts the batch size to how
+quickly the leads endpoint answers. Batches that still fail are appended
+to a local spool file and replayed the next time the agent starts, so no
+lead is lost.
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+import agent_config as config
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Leads queued for the uploader task before add() starts to wait
+_MAX_QUEUED = 1000
+
+
+def _lead_bytes(lead: dict) -> int:
+    return len(json.dumps(lead))
+
+
+def is_retryable(error: Exception) -> bool:
+    """Network errors, timeouts, 408/429 and 5xx are worth retrying; other 4xx are not."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status in (408, 429) or status >= 500
+    return False
+
+
+def _status(error: Exception) -> int | None:
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code
+    return None
+
+
+class BatchSizer:
+    """
+    Adaptive upload batch size.
+
+    Grows the size by half while uploads answer within UPLOAD_FAST_SECONDS
+    and halves it on uploads slower than UPLOAD_SLOW_SECONDS, on 413
+    (payload too large) and on 5xx responses. A 413 also lowers the ceiling
+    below the rejected batch. Shared by all jobs of an agent, since it
+    measures the API rather than a job.
+    """
+
+    def __init__(self, size: int | None = None, min_size: int | None = None, max_size: int | None = None):
+        self.min_size = min_size or config.UPLOAD_BATCH_MIN
+        self.max_size = max_size or config.UPLOAD_BATCH_MAX
+        self.size = max(self.min_size, min(size or config.BATCH_SIZE, self.max_size))
+
+    def record(self, batch_len: int, seconds: float, error: Exception | None = None):
+        """Adjust the size after uploading `batch_len` leads in `seconds` (and maybe failing)."""
+        status = _status(error) if error else None
+        if status == 413:
+            self.max_size = max(self.min_size, min(self.max_size, batch_len - 1))
+        if error is not None:
+            if status == 413 or status is None or status >= 500:
+                self._shrink()
+        elif seconds > config.UPLOAD_SLOW_SECONDS:
+            self._shrink()
+        elif seconds < config.UPLOAD_FAST_SECONDS:
+            self.size = min(self.max_size, max(self.size + 1, int(self.size * 1.5)))
+
+    def _shrink(self):
+        self.size = max(self.min_size, self.size // 2)
+
+
+class UploadSpool:
+    """
+    Append-only JSON-lines file of batches that could not be uploaded.
+
+    Each line is {"job_id", "leads", "spooled_at"}. Replay first renames the
+    file to a per-process name, so supervisor workers sharing DATA_DIR never
+    replay the same batch twice.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or config.UPLOAD_SPOOL_PATH
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def append(self, job_id: str, leads: list[dict]):
+        line = json.dumps({"job_id": job_id, "leads": leads, "spooled_at": time.time()})
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def pending(self) -> int:
+        """Number of spooled batches waiting for replay."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return sum(1 for line in f if line.strip())
+        except FileNotFoundError:
+            return 0
+
+    def _claim(self) -> list[str]:
+        """Take ownership of the spool (and of replays abandoned by a crashed agent)."""
+        claimed = []
+        mine = f"{self.path}.{os.getpid()}.replay"
+        try:
+            os.replace(self.path, mine)
+            claimed.append(mine)
+        except FileNotFoundError:
+            pass
+
+        stale_before = time.time() - config.UPLOAD_SPOOL_STALE_SECONDS
+        for path in glob.glob(f"{glob.escape(self.path)}.*.replay"):
+            if path == mine:
+                continue
+            try:
+                if os.path.getmtime(path) > stale_before:
+                    continue  # another worker is replaying it right now
+                taken = f"{path}.{os.getpid()}.replay"
+                os.replace(path, taken)
+                claimed.append(taken)
+            except FileNotFoundError:
+                pass  # another worker claimed it first
+        return claimed
+
+    async def replay(self, api) -> tuple[int, int]:
+        """
+        Upload every spooled batch through `api` (an AsyncLeadGenAPI).
+        Batches that fail with a retryable error go back to the spool.
+        Returns (leads uploaded, leads still spooled).
+        """
+        uploaded = respooled = 0
+        for path in self._claim():
+            with open(path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+
+            for entry in entries:
+                job_id, leads = entry["job_id"], entry["leads"]
+                try:
+                    await api.upload_leads(job_id, leads)
+                    uploaded += len(leads)
+                except Exception as e:
+                    if is_retryable(e):
+                        self.append(job_id, leads)
+                        respooled += len(leads)
+                    else:
+                        logger.error("Dropping %d spooled leads for job %s: %s", len(leads), job_id, e)
+            os.remove(path)
+        return uploaded, respooled
+
+
+class LeadUploader:
+    """
+    Uploads one job's leads in the background.
+
+    api:         AsyncLeadGenAPI
+    on_uploaded: optional async fn(batch_len, total_uploaded) called after
+                 every successful upload (e.g. to update job progress)
+    """
+
+    def __init__(
+        self,
+        api,
+        job_id: str,
+        spool: UploadSpool | None = None,
+        on_uploaded=None,
+        sizer: BatchSizer | None = None,
+        max_wait: float | None = None,
+        max_bytes: int | None = None,
+    ):
+        self.api = api
+        self.job_id = job_id
+        self.spool = spool
+        self.on_uploaded = on_uploaded
+        self.sizer = sizer or BatchSizer()
+        self.max_wait = max_wait if max_wait is not None else config.UPLOAD_MAX_WAIT
+        self.max_bytes = max_bytes or config.UPLOAD_MAX_BATCH_BYTES
+
+        self.uploaded = 0    # leads the server accepted
+        self.spooled = 0     # leads written to the spool for a later replay
+        self.unconfirmed = 0  # leads whose upload was in flight when aborted (the request may still succeed)
+        self.retries = 0
+        self.requests = 0    # upload round-trips, including retries
+
+        self._queue: asyncio.Queue = asyncio.Queue(_MAX_QUEUED)
+        self._batch: list[dict] = []  # leads taken off the queue, not yet uploaded or spooled
+        self._sending = 0             # how many leads at the start of _batch are being uploaded right now
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> "LeadUploader":
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(lambda _: metrics.QUEUE_DEPTH.untrack(self))
+        metrics.QUEUE_DEPTH.track(self, lambda: self._queue.qsize() + len(self._batch), queue="uploader")
+        return self
+
+    @property
+    def delivered(self) -> int:
+        """Leads handed off for good (uploaded, spooled or unconfirmed), counted in the order they were added."""
+        return self.uploaded + self.spooled + self.unconfirmed
+
+    async def add(self, lead: dict):
+        """Queue a lead for upload (only waits if the uploader is far behind)."""
+        await self._queue.put(lead)
+
+    async def close(self):
+        """Upload everything queued, then stop the background task."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            self.abort()
+            raise
+        self._task = None
+
+    def abort(self):
+        """
+        Stop at once, spooling whatever has not been uploaded yet. A batch
+        whose request is in flight is not spooled: it may still reach the
+        server, and replaying it would upload it twice.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        sending, leads = self._batch[:self._sending], self._batch[self._sending:]
+        while not self._queue.empty():
+            lead = self._queue.get_nowait()
+            if lead is not None:
+                leads.append(lead)
+        self._batch = []
+        self._sending = 0
+        if sending:
+            self.unconfirmed += len(sending)
+            logger.warning("Stopped while uploading %d leads; not spooling them", len(sending))
+        if leads:
+            self._spool(leads)
+
+    def summary(self) -> str:
+        return (
+            f"{self.uploaded} uploaded in {self.requests} requests, {self.spooled} spooled, "
+            f"{self.retries} retries, batch size now {self.sizer.size}"
+        )
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lead = await self._queue.get()
+            if lead is None:
+                break
+            self._batch.append(lead)
+            batch_bytes = _lead_bytes(lead)
+
+            # Coalesce until the batch is full (by count or bytes) or its oldest lead waited max_wait
+            deadline = loop.time() + self.max_wait
+            done = False
+            while len(self._batch) < self.sizer.size and batch_bytes < self.max_bytes:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    lead = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if lead is None:
+                    done = True
+                    break
+                self._batch.append(lead)
+                batch_bytes += _lead_bytes(lead)
+
+            await self._flush()
+            if done:
+                break
+
+        if self._batch:
+            await self._flush()
+
+    async def _flush(self):
+        """Upload the current batch, timed as one "upload" however often a 413 splits it."""
+        with metrics.timed("upload"):
+            await self._upload(list(self._batch))
+
+    async def _upload(self, batch: list[dict]):
+        """Upload `batch` (the first leads of _batch), or spool it; either way it leaves _batch."""
+        delay = config.UPLOAD_RETRY_DELAY
+        for attempt in range(config.UPLOAD_RETRIES + 1):
+            started = time.monotonic()
+            self.requests += 1
+            self._sending = len(batch)
+            try:
+                await self.api.upload_leads(self.job_id, batch)
+                self.sizer.record(len(batch), time.monotonic() - started)
+                break
+            except Exception as e:
+                self._sending = 0
+                self.sizer.record(len(batch), time.monotonic() - started, e)
+                if _status(e) == 413 and len(batch) > 1:
+                    # Too large for the server — send it in halves
+                    half = len(batch) // 2
+                    await self._upload(batch[:half])
+                    await self._upload(batch[half:])
+                    return
+                if attempt == config.UPLOAD_RETRIES or not is_retryable(e):
+                    logger.error("Upload of %d leads failed: %s", len(batch), e)
+                    print(f"   ❌ Failed to upload batch: {e}")
+                    del self._batch[:len(batch)]
+                    self._spool(batch)
+                    return
+                self.retries += 1
+                metrics.count("retries", op="upload")
+                logger.warning("Upload failed (%s), retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, config.UPLOAD_MAX_RETRY_DELAY)
+
+        self._sending = 0
+        del self._batch[:len(batch)]
+        self.uploaded += len(batch)
+        metrics.count("uploaded", len(batch))
+        print(f"   📤 Uploaded batch: {len(batch)} leads (Total: {self.uploaded})")
+        if self.on_uploaded:
+            try:
+                await self.on_uploaded(len(batch), self.uploaded)
+            except Exception as e:
+                logger.debug("on_uploaded callback failed: %s", e)
+
+    def _spool(self, batch: list[dict]):
+        if self.spool is None:
+            logger.error("No upload spool configured, %d leads lost", len(batch))
+            return
+        try:
+            self.spool.append(self.job_id, batch)
+            self.spooled += len(batch)
+            metrics.count("spooled", len(batch))
+            print(f"   💾 Saved {len(batch)} leads to the upload spool (will retry on next start)")
+        except OSError as e:
+            logger.error("Could not spool %d leads: %s", len(batch), e)
@@ -11,6 +11,14 @@ if sys.platform == "win32":
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
 import agent_config as config
+from dedup_index import DedupIndex
+
+_PHONE_STRIP = re.compile(r"[^\d+]")
+_MOBILE_PATTERN = re.compile(r"[6-9]\d{9}")
+_LANDLINE_PATTERN = re.compile(r"\d{10,11}")
+_EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}")
+_RATING_PATTERN = re.compile(r"[0-9]+(?:[.,][0-9]+)?")
+_REVIEWS_PATTERN = re.compile(r"[0-9][0-9,]*")
 
 
 def validate_phone(phone: str) -> str:
@@ -22,7 +30,7 @@ def validate_phone(phone: str) -> str:
         return ""
 
     # Remove all non-digit characters except +
-    cleaned = re.sub(r"[^\d+]", "", phone)
+    cleaned = _PHONE_STRIP.sub("", phone)
 
     # Remove country code prefix
     if cleaned.startswith("+91"):
@@ -34,9 +42,9 @@ def validate_phone(phone: str) -> str:
 
     # Indian mobile: 10 digits starting with 6-9
     # Indian landline: 10-11 digits
-    if re.match(r"^[6-9]\d{9}$", cleaned):
+    if _MOBILE_PATTERN.fullmatch(cleaned):
         return f"+91{cleaned}"
-    elif re.match(r"^\d{10,11}$", cleaned):
+    elif _LANDLINE_PATTERN.fullmatch(cleaned):
         return f"+91{cleaned}"
 
     # Return original if we can't validate but it has digits
@@ -50,12 +58,29 @@ def validate_email(email: str) -> str:
     """Basic regex email validation. Returns the email if valid, else empty string."""
     if not email:
         return ""
-    pattern = r"^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$"
-    if re.match(pattern, email.strip()):
-        return email.strip().lower()
+    email = email.strip()
+    if _EMAIL_PATTERN.fullmatch(email):
+        return email.lower()
     return ""
 
 
+def normalize_rating(rating) -> str:
+    """Return a 0–5 star rating as "4.5" (commas accepted as decimal point), else empty string."""
+    match = _RATING_PATTERN.search("" if rating is None else str(rating))
+    if not match:
+        return ""
+    value = float(match.group().replace(",", "."))
+    return f"{value:.1f}" if value <= 5 else ""
+
+
+def normalize_reviews(reviews) -> str:
+    """Return the review count as plain digits ("(1,234)" → "1234"), else empty string."""
+    match = _REVIEWS_PATTERN.search("" if reviews is None else str(reviews))
+    if not match:
+        return ""
+    return str(int(match.group().replace(",", "")))
+
+
 def deduplicate(leads: list[dict]) -> list[dict]:
     """
     Remove duplicate leads based on (business_name, address).
@@ -99,3 +124,222 @@ def process_leads(leads: list[dict]) -> list[dict]:
     leads = deduplicate(leads)
 
     return leads
+
+
+class LeadValidator:
+    """
+    Streaming validate → deduplicate for one job.
+
+    Keeps a single (business_name, address) index across every lead it is
+    fed, so callers don't need their own seen-set, and counts why leads
+    were rejected or had a field cleared. With a DedupIndex, leads already
+    seen in earlier jobs (same place, phone, domain or a near-identical
+    name + address) are rejected too. Accepted leads only go into the index
+    once they were delivered (see record_delivered), so a lead lost in a
+    crash is accepted again when the job resumes; until then a per-job
+    in-memory index catches duplicates within the job.
+    """
+
+    def __init__(self, index=None, job_id: str = ""):
+        self.index = index
+        self.job_id = job_id
+        self._job_index = DedupIndex(":memory:", index.threshold) if index is not None else None
+        self._queued: list[dict] = []  # accepted leads handed to the uploader, not yet delivered
+        self._delivered = 0
+        self._seen: set[tuple[str, str]] = set()
+        self.accepted = 0
+        self.rejected = {"no_name": 0, "duplicate": 0, "known": 0}
+        self.cleared = {"phone": 0, "email": 0}  # invalid values dropped from accepted leads
+
+    def feed(self, lead: dict) -> dict | None:
+        """Clean one lead in place; returns it, or None if it has no name or was seen before."""
+        name = lead.get("business_name", "").lower().strip()
+        if not name:
+            self.rejected["no_name"] += 1
+            return None
+        key = (name, lead.get("address", "").lower().strip())
+        if key in self._seen:
+            self.rejected["duplicate"] += 1
+            return None
+        self._seen.add(key)
+
+        phone = lead.get("phone", "")
+        lead["phone"] = validate_phone(phone)
+        if phone and not lead["phone"]:
+            self.cleared["phone"] += 1
+        email = lead.get("email", "")
+        lead["email"] = validate_email(email)
+        if email and not lead["email"]:
+            self.cleared["email"] += 1
+
+        if self.index is not None:
+            if self.index.check(lead):
+                self.rejected["known"] += 1
+                return None
+            if self._job_index.check_and_add(lead, self.job_id):
+                self.rejected["duplicate"] += 1
+                return None
+
+        self.accepted += 1
+        return lead
+
+    def feed_many(self, leads) -> list[dict]:
+        """Feed an iterable of leads; returns the accepted ones in order."""
+        feed = self.feed
+        return [lead for lead in map(feed, leads) if lead is not None]
+
+    def mark_queued(self, lead: dict):
+        """An accepted lead was handed to the uploader (which delivers leads in this order)."""
+        self._queued.append(lead)
+
+    def record_delivered(self, delivered: int) -> list[dict]:
+        """
+        The first `delivered` queued leads were uploaded or spooled: record
+        them in the index. Returns the leads delivered since the last call.
+        """
+        if delivered <= self._delivered:
+            return []
+        done = delivered - self._delivered
+        leads, self._queued = self._queued[:done], self._queued[done:]
+        self._delivered = delivered
+        if self.index is not None:
+            for lead in leads:
+                self.index.add(lead, self.job_id)
+        return leads
+
+    def stats(self) -> dict:
+        return {"accepted": self.accepted, "rejected": dict(self.rejected), "cleared": dict(self.cleared)}
+
+
+# ─── Bulk (columnar) validation ─────────────────────────────────────────────
+
+# What str.strip() removes from ASCII text (used by the Arrow kernels)
+_ASCII_WHITESPACE = " \t\n\x0b\x0c\r\x1c\x1d\x1e\x1f"
+
+
+def bulk_clean(df):
+    """
+    Vectorized clean_lead for a pandas DataFrame of leads (needs pandas).
+
+    Normalizes the phone, email, rating and reviews columns that are
+    present with results identical to validate_phone, validate_email,
+    normalize_rating and normalize_reviews, and returns a new DataFrame.
+    With pyarrow installed, phone and email run as Arrow compute kernels
+    and rating/reviews are dictionary-encoded so each distinct value is
+    normalized once; without it every value goes through the row-wise
+    function.
+    """
+    try:
+        import pyarrow  # noqa: F401
+        arrow = True
+    except ImportError:
+        arrow = False
+
+    df = df.copy()
+    for column, scalar, kernel in (
+        ("phone", validate_phone, _arrow_phone),
+        ("email", validate_email, _arrow_email),
+        ("rating", normalize_rating, None),
+        ("reviews", normalize_reviews, None),
+    ):
+        if column not in df:
+            continue
+        if not arrow:
+            df[column] = [scalar(v) for v in _as_text(df[column])]
+            continue
+        values = _arrow_text(df[column])
+        if kernel is None:
+            cleaned = _arrow_by_value(values, scalar)
+        else:
+            cleaned = _arrow_ascii_kernel(values, kernel, scalar)
+        df[column] = cleaned.to_pandas().set_axis(df.index)
+    return df
+
+
+def bulk_deduplicate(df):
+    """Vectorized deduplicate: drop rows without a name and repeated (name, address) pairs."""
+    import pandas as pd
+
+    keys = pd.DataFrame(index=df.index)
+    for column in ("business_name", "address"):
+        text = pd.Series(_as_text(df[column]) if column in df else "", index=df.index, dtype=object)
+        keys[column] = text.str.lower().str.strip()
+    keep = ~keys.duplicated(keep="first") & (keys["business_name"] != "")
+    return df[keep.to_numpy()]
+
+
+def _as_text(column) -> list[str]:
+    """Column values as Python strings ("" for missing)."""
+    return ["" if v is None or v != v else str(v) for v in column.tolist()]  # v != v: NaN
+
+
+def _arrow_text(column):
+    """Column as an Arrow string array without nulls (zero-copy for string columns)."""
+    import pyarrow as pa
+
+    try:
+        array = pa.array(column, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Numbers etc.: format them exactly like str() does in the row-wise path
+        array = pa.array(_as_text(column), type=pa.string())
+    return array.fill_null("")
+
+
+def _arrow_by_value(values, scalar):
+    """Apply a row-wise normalizer once per distinct value (ratings/reviews repeat a lot)."""
+    import pyarrow as pa
+
+    encoded = values.dictionary_encode()
+    mapped = pa.array([scalar(v) for v in encoded.dictionary.to_pylist()], type=pa.string())
+    return mapped.take(encoded.indices)
+
+
+def _arrow_ascii_kernel(values, kernel, scalar):
+    """
+    Run an Arrow kernel over the column. Arrow regexes (RE2) only agree with
+    `re` on ASCII text, so the rare non-ASCII values use the row-wise function.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    cleaned = kernel(values)
+    non_ascii = pc.invert(pc.string_is_ascii(values))
+    if pc.any(non_ascii).as_py():
+        fixed = [scalar(v) for v in pc.filter(values, non_ascii).to_pylist()]
+        cleaned = pc.replace_with_mask(cleaned, non_ascii, pa.array(fixed, type=pa.string()))
+    return cleaned
+
+
+def _arrow_phone(raw):
+    """validate_phone over an ASCII Arrow string array."""
+    import pyarrow.compute as pc
+
+    cleaned = pc.replace_substring_regex(raw, _PHONE_STRIP.pattern, "")
+    length = pc.utf8_length(cleaned)
+    plus91 = pc.starts_with(cleaned, "+91")
+    bare91 = pc.and_(pc.invert(plus91), pc.and_(pc.starts_with(cleaned, "91"), pc.greater(length, 10)))
+    zero = pc.and_(pc.invert(pc.or_(plus91, bare91)), pc.starts_with(cleaned, "0"))
+    cleaned = pc.if_else(
+        plus91, pc.utf8_slice_codeunits(cleaned, 3),
+        pc.if_else(bare91, pc.utf8_slice_codeunits(cleaned, 2),
+                   pc.if_else(zero, pc.utf8_slice_codeunits(cleaned, 1), cleaned)),
+    )
+
+    valid = pc.or_(
+        pc.match_substring_regex(cleaned, f"^{_MOBILE_PATTERN.pattern}$"),
+        pc.match_substring_regex(cleaned, f"^{_LANDLINE_PATTERN.pattern}$"),
+    )
+    fallback = pc.if_else(
+        pc.greater_equal(pc.utf8_length(cleaned), 7), pc.utf8_trim(raw, _ASCII_WHITESPACE), ""
+    )
+    result = pc.if_else(valid, pc.binary_join_element_wise("+91", cleaned, ""), fallback)
+    return pc.if_else(pc.equal(raw, ""), "", result)
+
+
+def _arrow_email(raw):
+    """validate_email over an ASCII Arrow string array."""
+    import pyarrow.compute as pc
+
+    email = pc.utf8_trim(raw, _ASCII_WHITESPACE)
+    valid = pc.match_substring_regex(email, f"^{_EMAIL_PATTERN.pattern}$")
+    return pc.if_else(valid, pc.utf8_lower(email), "")
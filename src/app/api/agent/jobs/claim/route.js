@@ -0,0 +1,38 @@
+import { authenticateAgent, errorResponse, successResponse } from "@/app/api/helpers";
+
+// POST /api/agent/jobs/claim — Atomically claim the oldest pending job
+// The update only matches while the job is still pending, so when several
+// agents race for the same job exactly one of them gets it back.
+export async function POST(request) {
+    const auth = await authenticateAgent(request);
+    if (auth.error) return errorResponse(auth.error, auth.status);
+
+    const { supabase, profile } = auth;
+
+    const { data: pending, error } = await supabase
+        .from("jobs")
+        .select("id")
+        .eq("user_id", profile.id)
+        .eq("status", "pending")
+        .order("created_at", { ascending: true })
+        .limit(5);
+
+    if (error) return errorResponse(error.message, 500);
+
+    for (const { id } of pending) {
+        const { data: job, error: claimError } = await supabase
+            .from("jobs")
+            .update({ status: "running" })
+            .eq("id", id)
+            .eq("user_id", profile.id)
+            .eq("status", "pending")
+            .select()
+            .maybeSingle();
+
+        if (claimError) return errorResponse(claimError.message, 500);
+        if (job) return successResponse({ job });
+        // Another agent claimed it first — try the next one
+    }
+
+    return successResponse({ job: null });
+}
@@ -1,12 +1,27 @@
 import { authenticateAgent, errorResponse, successResponse } from "@/app/api/helpers";
 
 // GET /api/agent/jobs — Get pending jobs for the agent
+// GET /api/agent/jobs?id=<job_id> — Get a single job's status (cheap stop-signal check)
 export async function GET(request) {
     const auth = await authenticateAgent(request);
     if (auth.error) return errorResponse(auth.error, auth.status);
 
     const { supabase, profile } = auth;
 
+    const jobId = new URL(request.url).searchParams.get("id");
+    if (jobId) {
+        const { data: job, error } = await supabase
+            .from("jobs")
+            .select("id, status, leads_found")
+            .eq("id", jobId)
+            .eq("user_id", profile.id)
+            .maybeSingle();
+
+        if (error) return errorResponse(error.message, 500);
+        if (!job) return errorResponse("Job not found", 404);
+        return successResponse({ job });
+    }
+
     const { data: jobs, error } = await supabase
         .from("jobs")
         .select("*")
@@ -49,13 +64,15 @@ export async function PATCH(request) {
     const { supabase, profile } = auth;
     const body = await request.json();
 
-    const { job_id, status, leads_found } = body;
+    const { job_id, status, leads_found, checkpoint } = body;
     if (!job_id || !status) {
         return errorResponse("Missing required fields: job_id, status");
     }
 
     const updates = { status };
     if (leads_found !== undefined) updates.leads_found = leads_found;
+    // Resume state of a job requeued after an agent crash (processed place IDs, counts)
+    if (checkpoint !== undefined) updates.checkpoint = checkpoint;
     if (status === "completed" || status === "stopped") updates.completed_at = new Date().toISOString();
 
     const { data: job, error } = await supabase
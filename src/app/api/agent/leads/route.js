@@ -1,4 +1,4 @@
-import { authenticateAgent, errorResponse, successResponse } from "@/app/api/helpers";
+import { authenticateAgent, errorResponse, readJsonBody, successResponse } from "@/app/api/helpers";
 
 // POST /api/agent/leads — Upload scraped leads (batch)
 export async function POST(request) {
@@ -6,9 +6,10 @@ export async function POST(request) {
     if (auth.error) return errorResponse(auth.error, auth.status);
 
     const { supabase, profile } = auth;
-    const body = await request.json();
+    const parsed = await readJsonBody(request);
+    if (parsed.error) return errorResponse(parsed.error, parsed.status);
 
-    const { job_id, leads } = body;
+    const { job_id, leads } = parsed.body ?? {};
     if (!job_id || !leads || !Array.isArray(leads) || leads.length === 0) {
         return errorResponse("Missing required fields: job_id, leads (array)");
     }
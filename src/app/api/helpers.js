@@ -32,6 +32,26 @@ export async function authenticateAgent(request) {
     return { profile, supabase };
 }
 
+// Parse a JSON request body, accepting gzip-compressed bodies from the agent → { body } or { error, status }.
+// A gzip body that can't be decompressed gets 415 (the agent resends it uncompressed); invalid JSON gets 400
+export async function readJsonBody(request) {
+    let text;
+    if (request.headers.get("content-encoding") === "gzip") {
+        try {
+            const stream = request.body.pipeThrough(new DecompressionStream("gzip"));
+            text = await new Response(stream).text();
+        } catch {
+            return { error: "Cannot decode request body", status: 415 };
+        }
+    }
+
+    try {
+        return { body: text === undefined ? await request.json() : JSON.parse(text) };
+    } catch {
+        return { error: "Invalid JSON body", status: 400 };
+    }
+}
+
 export function errorResponse(message, status = 400) {
     return NextResponse.json({ error: message }, { status });
 }
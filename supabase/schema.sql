@@ -24,6 +24,7 @@ CREATE TABLE jobs (
   category TEXT NOT NULL,
   status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'completed', 'failed', 'stopped')),
   leads_found INTEGER DEFAULT 0,
+  checkpoint JSONB,  -- agent resume state after a crash (processed place IDs, counts)
   created_at TIMESTAMPTZ DEFAULT now(),
   completed_at TIMESTAMPTZ
 );